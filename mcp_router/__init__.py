@@ -6,12 +6,25 @@ Extends Dolphin-MCP with OpenRouter API capabilities and replicates key HyperCha
 __version__ = "0.1.0"
 
 from .main import MCPRouter
-from .core.openrouter import OpenRouterClient
 from .core.server_manager import MCPServerManager
 from .server_management.config import MCPServerConfig
 from .server_management.installer import MCPServerInstaller
 from .server_management.lifecycle import MCPServerLifecycle
-from .utils.playwright_utils import PlaywrightMCP
+
+# Exports with heavy import chains, loaded on first attribute access
+_LAZY_EXPORTS = {
+    "OpenRouterClient": ".core.openrouter",
+    "PlaywrightMCP": ".utils.playwright_utils",
+    "PlaywrightContextPool": ".utils.playwright_utils",
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "MCPRouter",
@@ -21,4 +34,5 @@ __all__ = [
     "MCPServerInstaller",
     "MCPServerLifecycle",
     "PlaywrightMCP",
+    "PlaywrightContextPool",
 ]
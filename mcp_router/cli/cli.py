@@ -28,13 +28,23 @@ logger = logging.getLogger("mcp_router_cli")
 # Load environment variables
 load_dotenv()
 
+async def _none() -> None:
+    """Placeholder for a list that was not requested."""
+    return None
+
 async def list_servers(args: argparse.Namespace) -> None:
     """List available and configured servers."""
     router = MCPRouter(config_path=args.config, registry_path=args.registry)
     
+    # Fetch the requested lists concurrently
+    available_servers, configured_servers, running_servers = await asyncio.gather(
+        router.list_available_servers() if args.available else _none(),
+        router.list_configured_servers() if args.configured else _none(),
+        router.list_running_servers() if args.running else _none()
+    )
+    
     if args.available:
         print("\nAvailable servers in registry:")
-        available_servers = await router.list_available_servers()
         
         if not available_servers:
             print("  No servers found in registry.")
@@ -46,7 +56,6 @@ async def list_servers(args: argparse.Namespace) -> None:
     
     if args.configured:
         print("\nConfigured servers:")
-        configured_servers = await router.list_configured_servers()
         
         if not configured_servers:
             print("  No servers configured.")
@@ -58,7 +67,6 @@ async def list_servers(args: argparse.Namespace) -> None:
     
     if args.running:
         print("\nRunning servers:")
-        running_servers = await router.list_running_servers()
         
         if not running_servers:
             print("  No servers running.")
@@ -167,7 +175,7 @@ async def query(args: argparse.Namespace) -> None:
         if role == "user":
             print(f"\nUser: {message['content']}")
         elif role == "assistant":
-            print(f"\nAssistant: {message['content']}")
+            print(f"\nAssistant: {message.get('content')}")
         elif role == "tool":
             print(f"\nTool result: {message['content']}")
     
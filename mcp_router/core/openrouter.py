@@ -4,6 +4,7 @@ Uses the OpenAI client library to interact with OpenRouter's API.
 """
 
 import os
+import time
 from typing import Dict, List, Any, Optional, Union
 import openai
 from dotenv import load_dotenv
@@ -14,6 +15,9 @@ load_dotenv()
 class OpenRouterClient:
     """Client for interacting with OpenRouter API using OpenAI's SDK."""
     
+    # How long the model list is reused before fetching it again (seconds)
+    MODELS_TTL = 300.0
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the OpenRouter client.
@@ -30,6 +34,20 @@ class OpenRouterClient:
             api_key=self.api_key,
             base_url="https://openrouter.ai/api/v1",
         )
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+        
+        # Model list as (timestamp, models); the client is bound to one API key
+        self._models_cache: Optional[tuple] = None
+    
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """Async OpenAI client for OpenRouter, created on first use."""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url="https://openrouter.ai/api/v1",
+            )
+        return self._async_client
     
     def list_models(self) -> List[Dict[str, Any]]:
         """
@@ -38,9 +56,40 @@ class OpenRouterClient:
         Returns:
             List of model information dictionaries.
         """
+        if self._models_cache and time.monotonic() - self._models_cache[0] < self.MODELS_TTL:
+            return self._models_cache[1]
+        
         response = self.client.models.list()
+        self._models_cache = (time.monotonic(), response.data)
         return response.data
     
+    async def alist_models(self) -> List[Dict[str, Any]]:
+        """
+        List available models on OpenRouter without blocking the event loop.
+        
+        Shares the model list cache with list_models(), and opens the async
+        client's connection that achat_completion() then reuses.
+        
+        Returns:
+            List of model information dictionaries.
+        """
+        if self._models_cache and time.monotonic() - self._models_cache[0] < self.MODELS_TTL:
+            return self._models_cache[1]
+        
+        response = await self.async_client.models.list()
+        self._models_cache = (time.monotonic(), response.data)
+        return response.data
+    
+    def refresh_models(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the model list again, bypassing the cache.
+        
+        Returns:
+            List of model information dictionaries.
+        """
+        self._models_cache = None
+        return self.list_models()
+    
     def chat_completion(
         self, 
         messages: List[Dict[str, str]], 
@@ -64,6 +113,54 @@ class OpenRouterClient:
         Returns:
             Completion response object.
         """
+        params = self._completion_params(messages, model, tools, temperature, max_tokens)
+        
+        # Make the API call
+        if stream:
+            return self.client.chat.completions.create(**params, stream=True)
+        else:
+            return self.client.chat.completions.create(**params)
+    
+    async def achat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: str = "anthropic/claude-3-5-sonnet",
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+    ) -> Union[Dict[str, Any], Any]:
+        """
+        Generate a chat completion using OpenRouter without blocking the event loop.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            model: Model identifier (e.g., 'anthropic/claude-3-5-sonnet').
+            tools: Optional list of tool definitions for function calling.
+            temperature: Sampling temperature (0-1).
+            max_tokens: Maximum tokens to generate.
+            stream: Whether to stream the response.
+            
+        Returns:
+            Completion response object, or an async stream of chunks if stream is True.
+        """
+        params = self._completion_params(messages, model, tools, temperature, max_tokens)
+        
+        # Make the API call
+        if stream:
+            return await self.async_client.chat.completions.create(**params, stream=True)
+        else:
+            return await self.async_client.chat.completions.create(**params)
+    
+    def _completion_params(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> Dict[str, Any]:
+        """Build the request parameters for a chat completion."""
         # Format model name for OpenRouter if not already formatted
         if '/' not in model:
             model = f"openrouter/{model}"
@@ -81,11 +178,7 @@ class OpenRouterClient:
         if tools:
             params["tools"] = tools
         
-        # Make the API call
-        if stream:
-            return self.client.chat.completions.create(**params, stream=True)
-        else:
-            return self.client.chat.completions.create(**params)
+        return params
     
     def execute_tool_call(
         self,
@@ -3,22 +3,285 @@ MCP server manager.
 Handles the management of MCP servers, including configuration, installation, and lifecycle.
 """
 
+import io
 import os
 import json
 import logging
 import asyncio
+import functools
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional, Tuple, Union, Set
 import mcp
 from mcp import ClientSession
 
-from ..server_management.config import MCPServerConfig
+from ..server_management.config import MCPServerConfig, _validate_id
 from ..server_management.installer import MCPServerInstaller
 from ..server_management.lifecycle import MCPServerLifecycle
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import inotify_simple
+except ImportError:  # Linux-only; without it every status check takes the slow path
+    inotify_simple = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Worker threads for blocking lifecycle/config calls; sized so a default
+# start_servers() batch can spawn all of its servers at once
+IO_POOL_WORKERS = 8
+
+# Write-behind configuration saves: up to this many queued server additions,
+# gathered for at most this long, are written with a single save
+CONFIG_WRITE_BATCH = 32
+CONFIG_WRITE_DELAY = 0.01
+
+def _json_bytes(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop (a libuv-based event loop) for asyncio, if it is installed.
+    
+    All coroutine APIs behave identically; only the event loop implementation
+    changes, which reduces dispatch overhead for pipe-heavy MCP traffic.
+    Loops created afterwards (e.g. by asyncio.run) use uvloop.
+    
+    Returns:
+        True if uvloop was installed, False if it is not available.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop is not installed, using the default asyncio event loop")
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+if os.environ.get("MCP_USE_UVLOOP") == "1":
+    install_uvloop()
+
+class _ClientPool:
+    """
+    Process-wide pool of MCP client sessions, shared by managers with the same key.
+    
+    Sessions are reference counted. When the last manager releases a session it is
+    kept warm for IDLE_TTL seconds so that a manager created shortly afterwards
+    (e.g. the next CLI command or test) reuses the pipes and connection state.
+    Sessions are tied to the event loop that created them and never cross loops.
+    """
+    
+    IDLE_TTL = 30.0
+    
+    _sessions: Dict[tuple, ClientSession] = {}
+    _refcounts: Dict[tuple, int] = {}
+    _locks: Dict[tuple, asyncio.Lock] = {}
+    _idle_handles: Dict[tuple, asyncio.TimerHandle] = {}
+    
+    @classmethod
+    def _prune_closed_loops(cls) -> None:
+        """Drop sessions belonging to event loops that have been closed."""
+        for pool_key in [k for k in cls._sessions if k[0].is_closed()]:
+            cls._sessions.pop(pool_key, None)
+            cls._refcounts.pop(pool_key, None)
+            cls._locks.pop(pool_key, None)
+            cls._idle_handles.pop(pool_key, None)
+    
+    @classmethod
+    async def acquire(cls, key: tuple, factory) -> ClientSession:
+        """
+        Get the session for a key, creating it with the factory if needed.
+        
+        Args:
+            key: Pool key identifying the session.
+            factory: Coroutine function returning a new, connected session.
+            
+        Returns:
+            The shared client session.
+        """
+        cls._prune_closed_loops()
+        pool_key = (asyncio.get_running_loop(), key)
+        lock = cls._locks.setdefault(pool_key, asyncio.Lock())
+        
+        async with lock:
+            handle = cls._idle_handles.pop(pool_key, None)
+            if handle is not None:
+                handle.cancel()
+            
+            session = cls._sessions.get(pool_key)
+            if session is None:
+                session = await factory()
+                cls._sessions[pool_key] = session
+                cls._refcounts[pool_key] = 0
+            
+            cls._refcounts[pool_key] += 1
+            return session
+    
+    @classmethod
+    async def release(cls, key: tuple) -> None:
+        """
+        Release a session, closing it after IDLE_TTL seconds if nobody reacquires it.
+        
+        Args:
+            key: Pool key identifying the session.
+        """
+        loop = asyncio.get_running_loop()
+        pool_key = (loop, key)
+        if not cls._refcounts.get(pool_key):
+            return
+        
+        cls._refcounts[pool_key] -= 1
+        if cls._refcounts[pool_key] == 0:
+            cls._idle_handles[pool_key] = loop.call_later(
+                cls.IDLE_TTL, lambda: loop.create_task(cls._close_idle(pool_key))
+            )
+    
+    @classmethod
+    async def _close_idle(cls, pool_key: tuple) -> None:
+        """Close a session whose idle timeout expired without being reacquired."""
+        cls._idle_handles.pop(pool_key, None)
+        if cls._refcounts.get(pool_key):
+            return
+        
+        session = cls._sessions.pop(pool_key, None)
+        cls._refcounts.pop(pool_key, None)
+        cls._locks.pop(pool_key, None)
+        if session is not None:
+            await session.close()
+
+
+class _SigchldDispatcher:
+    """
+    Process-wide SIGCHLD handler per event loop, fanned out to every watching manager.
+    
+    A loop holds a single handler per signal, so managers sharing a loop must
+    not each install their own: the last one would replace the others, and the
+    first to stop would remove it for all of them. The dispatcher is installed
+    by the first manager to watch a loop and removed when the last one stops.
+    """
+    
+    _watchers: Dict[asyncio.AbstractEventLoop, Set["MCPServerManager"]] = {}
+    
+    @classmethod
+    def watch(cls, loop: asyncio.AbstractEventLoop, manager: "MCPServerManager") -> None:
+        """
+        Deliver SIGCHLD on a loop to a manager's _on_sigchld().
+        
+        Args:
+            loop: Running event loop.
+            manager: Manager to notify.
+            
+        Raises:
+            NotImplementedError, RuntimeError, ValueError: If the loop cannot
+                handle signals (e.g. not on the main thread).
+        """
+        for closed in [other for other in cls._watchers if other.is_closed()]:
+            del cls._watchers[closed]
+        
+        watchers = cls._watchers.get(loop)
+        if watchers is None:
+            loop.add_signal_handler(signal.SIGCHLD, cls._dispatch, loop)
+            watchers = cls._watchers[loop] = set()
+        watchers.add(manager)
+    
+    @classmethod
+    def unwatch(cls, loop: asyncio.AbstractEventLoop, manager: "MCPServerManager") -> None:
+        """
+        Stop delivering SIGCHLD to a manager, removing the handler after the last one.
+        
+        Args:
+            loop: Event loop the manager watched.
+            manager: Manager to forget.
+        """
+        watchers = cls._watchers.get(loop)
+        if watchers is None:
+            return
+        
+        watchers.discard(manager)
+        if not watchers:
+            del cls._watchers[loop]
+            if not loop.is_closed():
+                try:
+                    loop.remove_signal_handler(signal.SIGCHLD)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+    
+    @classmethod
+    def _dispatch(cls, loop: asyncio.AbstractEventLoop) -> None:
+        """Forward one SIGCHLD to every manager watching the loop."""
+        for manager in list(cls._watchers.get(loop, ())):
+            manager._on_sigchld()
+
+
+@dataclass
+class _ServerTable:
+    """
+    Per-server state stored as parallel arrays (struct-of-arrays).
+    
+    Every server a manager has seen gets a small integer index into the arrays;
+    the same index is used as the server's bit in the connection bitmap.
+    A row whose command is None has no configuration.
+    """
+    
+    ids: List[str] = field(default_factory=list)
+    commands: List[Optional[str]] = field(default_factory=list)
+    args: List[List[str]] = field(default_factory=list)
+    envs: List[Dict[str, str]] = field(default_factory=list)
+    running: bytearray = field(default_factory=bytearray)
+    index: Dict[str, int] = field(default_factory=dict)
+    
+    def index_of(self, server_id: str) -> int:
+        """Get the index of a server, appending an empty row for unseen servers."""
+        idx = self.index.get(server_id)
+        if idx is None:
+            idx = self.index[server_id] = len(self.ids)
+            self.ids.append(server_id)
+            self.commands.append(None)
+            self.args.append([])
+            self.envs.append({})
+            self.running.append(0)
+        return idx
+    
+    def set_config(self, server_id: str, server_config: Optional[Dict[str, Any]]) -> None:
+        """Store a server's configuration, or clear it when server_config is None."""
+        idx = self.index_of(server_id)
+        if server_config:
+            self.commands[idx] = server_config["command"]
+            self.args[idx] = server_config.get("args", [])
+            self.envs[idx] = server_config.get("env", {})
+        else:
+            self.commands[idx] = None
+            self.args[idx] = []
+            self.envs[idx] = {}
+    
+    def get_config(self, server_id: str) -> Optional[Dict[str, Any]]:
+        """Get a server's configuration, or None if it has none."""
+        idx = self.index.get(server_id)
+        if idx is None or self.commands[idx] is None:
+            return None
+        return {"command": self.commands[idx], "args": self.args[idx], "env": self.envs[idx]}
+    
+    def set_running(self, server_id: str, running: bool) -> None:
+        """Record whether a server is running."""
+        self.running[self.index_of(server_id)] = 1 if running else 0
+    
+    def running_ids(self) -> List[str]:
+        """List the servers recorded as running."""
+        return [server_id for server_id, running in zip(self.ids, self.running) if running]
+
+
 class MCPServerManager:
     """Manages MCP servers, providing a unified interface for interacting with them."""
     
@@ -39,23 +302,437 @@ class MCPServerManager:
         self.installer = MCPServerInstaller(install_dir=install_dir, registry_path=registry_path)
         self.lifecycle = MCPServerLifecycle(pid_dir=pid_dir)
         self.client: Optional[ClientSession] = None
-        self.connected_servers: Set[str] = set()
+        
+        # Per-server state, loaded from the configuration on first access
+        self._table = _ServerTable()
+        self._table_loaded = False
+        
+        # Connected servers as a bitmap over the table's server indices, so
+        # membership tests and batch diffs are single integer operations
+        self._connected_mask = 0
+        
+        # Servers waiting to be connected by the next batched connect_to_servers() call
+        self._pending_connects: Dict[str, asyncio.Future] = {}
+        self._connect_event: Optional[asyncio.Event] = None
+        self._connect_task: Optional[asyncio.Task] = None
+        
+        # Write-behind queue of (server_id, server_config, future) configuration additions
+        self._cfg_writes: Optional[asyncio.Queue] = None
+        self._cfg_flush_task: Optional[asyncio.Task] = None
+        
+        # Serializes client creation so concurrent first callers share one ClientSession
+        self._client_lock: Optional[asyncio.Lock] = None
+        
+        # Managers for the same PID directory and config share a pooled client session
+        self._pool_key = (self.lifecycle.pid_dir, self.config.config_path)
+        
+        # Long-lived pool for blocking registry/config/lifecycle calls, reused across calls
+        self._io_pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="mcp-io")
+        
+        # Short-lived cache of registry lookups as (epoch, timestamp, value),
+        # invalidated explicitly whenever a server is installed, uninstalled or created
+        self._cache_ttl = 5.0
+        self._cache_epoch = 0
+        self._info_cache: Dict[str, Tuple[int, float, Optional[Dict[str, Any]]]] = {}
+        
+        # Pre-encoded list_* responses as (version, timestamp, payload); a list's
+        # version is bumped whenever this manager changes what it would return
+        self._list_cache_versions = {"available": 0, "configured": 0, "running": 0}
+        self._list_cache_bytes: Dict[str, Tuple[int, float, bytes]] = {}
+        
+        # Mirror of which servers are running, kept current by an inotify watch on
+        # the PID directory and by SIGCHLD. It is only trusted while the watch is
+        # active, since PID files written by other processes are otherwise missed.
+        self._status: Dict[str, bool] = {}
+        self._inotify = None
+        self._watch_loop: Optional[asyncio.AbstractEventLoop] = None
+        if inotify_simple is not None:
+            try:
+                self._inotify = inotify_simple.INotify()
+                flags = inotify_simple.flags
+                self._inotify.add_watch(self.lifecycle.pid_dir, flags.CREATE | flags.DELETE | flags.MOVED_TO | flags.MOVED_FROM)
+            except OSError as e:
+                logger.warning(f"Could not watch PID directory {self.lifecycle.pid_dir}: {str(e)}")
+                self._inotify = None
+    
+    async def _run_io(self, func, *args, **kwargs) -> Any:
+        """
+        Run a blocking function in the I/O thread pool without blocking the event loop.
+        
+        Args:
+            func: Function to call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+            
+        Returns:
+            Result of the function call.
+        """
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="mcp-io")
+        
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, functools.partial(func, *args, **kwargs)
+        )
+    
+    def _idx(self, server_id: str) -> int:
+        """
+        Get the table index of a server, which is also its bit in the connection bitmap.
+        
+        Args:
+            server_id: Identifier of the server.
+            
+        Returns:
+            Index of the server.
+        """
+        return self._table.index_of(server_id)
+    
+    def _mask_of(self, server_ids) -> int:
+        """Build a bitmap with the bits of the given servers set."""
+        mask = 0
+        for server_id in server_ids:
+            mask |= 1 << self._idx(server_id)
+        return mask
+    
+    def _is_connected(self, server_id: str) -> bool:
+        """Check whether a server is connected."""
+        return bool((self._connected_mask >> self._idx(server_id)) & 1)
+    
+    @property
+    def connected_servers(self) -> Set[str]:
+        """Set of connected server IDs."""
+        mask = self._connected_mask
+        return {server_id for idx, server_id in enumerate(self._table.ids) if (mask >> idx) & 1}
+    
+    def _cached_lookup(self, cache: Dict[str, Tuple[int, float, Optional[Dict[str, Any]]]],
+                       server_id: str, loader) -> Optional[Dict[str, Any]]:
+        """
+        Look up a server in a TTL cache, filling it from the loader on a miss.
+        
+        Args:
+            cache: Cache to consult.
+            server_id: Identifier of the server.
+            loader: Function returning the value for a server id.
+            
+        Returns:
+            The cached or freshly loaded value.
+        """
+        now = time.monotonic()
+        entry = cache.get(server_id)
+        if entry is not None and entry[0] == self._cache_epoch and now - entry[1] < self._cache_ttl:
+            return entry[2]
+        
+        value = loader(server_id)
+        cache[server_id] = (self._cache_epoch, now, value)
+        return value
+    
+    def _load_table(self) -> None:
+        """Populate the server table from the configuration, once."""
+        if not self._table_loaded:
+            for server_id, server_config in self.config.get_all_servers().items():
+                self._table.set_config(server_id, server_config)
+            self._table_loaded = True
+    
+    def _get_server_config(self, server_id: str) -> Optional[Dict[str, Any]]:
+        """Get a server's configuration from the server table."""
+        self._load_table()
+        return self._table.get_config(server_id)
+    
+    def _get_registry_info(self, server_id: str) -> Optional[Dict[str, Any]]:
+        """Get a server's registry entry through the lookup cache."""
+        return self._cached_lookup(self._info_cache, server_id, self.installer.get_server_info)
+    
+    def _invalidate_server_cache(self, server_id: Optional[str] = None) -> None:
+        """
+        Invalidate cached registry lookups and resync the server table with the configuration.
+        
+        Args:
+            server_id: Server to invalidate. If None, invalidates every entry.
+        """
+        self._bump_list_version("configured")
+        if server_id is None:
+            self._cache_epoch += 1
+            self._bump_list_version("available")
+            self._info_cache.clear()
+            for known_id in self._table.ids:
+                self._table.set_config(known_id, None)
+            self._table_loaded = False
+        else:
+            self._info_cache.pop(server_id, None)
+            if self._table_loaded:
+                self._table.set_config(server_id, self.config.get_server_config(server_id))
+    
+    def _set_running(self, server_id: str, running: bool) -> None:
+        """Record a server's running state and invalidate the running list."""
+        self._table.set_running(server_id, running)
+        self._status[server_id] = running
+        self._bump_list_version("running")
+    
+    def _start_status_watch(self) -> None:
+        """Start feeding the status mirror from inotify and SIGCHLD on the running loop."""
+        if self._inotify is None or self._watch_loop is not None:
+            return
+        
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self._inotify.fd, self._drain_inotify)
+        try:
+            _SigchldDispatcher.watch(loop, self)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Not on the main thread or not supported by this loop; PID file
+            # removal still keeps the mirror current, only later
+            pass
+        self._watch_loop = loop
+    
+    def _stop_status_watch(self) -> None:
+        """Stop the inotify watch and forget the status mirror."""
+        if self._watch_loop is not None:
+            if not self._watch_loop.is_closed():
+                self._watch_loop.remove_reader(self._inotify.fd)
+            _SigchldDispatcher.unwatch(self._watch_loop, self)
+        self._watch_loop = None
+        
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._status.clear()
+    
+    def _drain_inotify(self) -> None:
+        """Update the status mirror from PID file creations and deletions."""
+        created = inotify_simple.flags.CREATE | inotify_simple.flags.MOVED_TO
+        for event in self._inotify.read(timeout=0):
+            if event.name.endswith(".pid"):
+                self._status[event.name[:-4]] = bool(event.mask & created)
+                self._bump_list_version("running")
+    
+    def _on_sigchld(self) -> None:
+        """Mark exited child servers as stopped."""
+        # Poll only our own children: waitpid(-1) would steal exit statuses from
+        # subprocess.Popen objects owned by lifecycle
+        for server_id, process in list(self.lifecycle.active_processes.items()):
+            if process.poll() is not None:
+                self._set_running(server_id, False)
+    
+    def _mirror_running(self, server_id: str) -> Optional[bool]:
+        """
+        Look up a server in the status mirror.
+        
+        Args:
+            server_id: Identifier of the server.
+            
+        Returns:
+            Whether the server is running, or None if the mirror cannot tell.
+        """
+        if self._watch_loop is None:
+            return None
+        return self._status.get(server_id)
+    
+    def _is_running(self, server_id: str) -> bool:
+        """Check whether a server is running, consulting the status mirror first."""
+        running = self._mirror_running(server_id)
+        if running is None:
+            running = self.lifecycle.get_server_status(server_id)["running"]
+            if self._watch_loop is not None:
+                self._status[server_id] = running
+        return running
+    
+    def _bump_list_version(self, name: str) -> None:
+        """Mark a cached list_* response as stale."""
+        self._list_cache_versions[name] += 1
+    
+    async def _list_bytes(self, name: str, loader, ttl: Optional[float] = None) -> bytes:
+        """
+        Get a list_* response as JSON bytes, re-encoding it only when stale.
+        
+        Args:
+            name: Name of the list ("available", "configured" or "running").
+            loader: Blocking function returning the list.
+            ttl: Optional maximum age in seconds, for lists that also change
+                outside this manager.
+            
+        Returns:
+            The encoded list.
+        """
+        version = self._list_cache_versions[name]
+        entry = self._list_cache_bytes.get(name)
+        now = time.monotonic()
+        if entry is not None and entry[0] == version and (ttl is None or now - entry[1] < ttl):
+            return entry[2]
+        
+        payload = await self._run_io(lambda: _json_bytes(loader()))
+        self._list_cache_bytes[name] = (version, now, payload)
+        return payload
     
     async def initialize_client(self) -> None:
-        """Initialize the MCP client for interacting with servers."""
-        if self.client is None:
-            # Create pipes for client communication
-            read_pipe_r, read_pipe_w = os.pipe()
-            write_pipe_r, write_pipe_w = os.pipe()
+        """Initialize the MCP client for interacting with servers. Safe to call concurrently."""
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+        
+        async with self._client_lock:
+            if self.client is None:
+                self.client = await _ClientPool.acquire(self._pool_key, self._open_client)
+            self._start_status_watch()
+            self._start_config_flusher()
             
-            # Create file objects from the pipes
-            read_stream = os.fdopen(read_pipe_r, "rb")
-            write_stream = os.fdopen(write_pipe_w, "wb")
+            self._start_connect_worker()
+    
+    async def _open_client(self) -> ClientSession:
+        """
+        Create and connect a new MCP client session.
+        
+        Returns:
+            The connected client session.
+        """
+        # Create pipes for client communication
+        read_pipe_r, read_pipe_w = os.pipe()
+        write_pipe_r, write_pipe_w = os.pipe()
+        
+        # Wrap the pipes in raw, unbuffered file objects: a BufferedReader would split
+        # reads into 8 KiB chunks and take its lock on every call
+        read_stream = io.FileIO(read_pipe_r, "r", closefd=True)
+        write_stream = io.FileIO(write_pipe_w, "w", closefd=True)
+        
+        # Initialize the ClientSession with the streams
+        client = ClientSession(read_stream, write_stream)
+        await client.connect()
+        return client
+    
+    def _start_connect_worker(self) -> None:
+        """Start the background task that batches server connections, if not already running."""
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_event = asyncio.Event()
+            self._connect_task = asyncio.create_task(self._connect_worker())
+    
+    async def _connect_worker(self) -> None:
+        """Drain pending connection requests into a single connect_to_servers() call per batch."""
+        while True:
+            await self._connect_event.wait()
+            
+            # Yield once so that requests issued during the same event-loop tick join this batch
+            await asyncio.sleep(0)
+            
+            batch = self._pending_connects
+            self._pending_connects = {}
+            self._connect_event.clear()
+            if not batch:
+                continue
+            
+            try:
+                await self.client.connect_to_servers()
+            except Exception as e:
+                for future in batch.values():
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            self._connected_mask |= self._mask_of(batch)
+            for future in batch.values():
+                if not future.done():
+                    future.set_result(None)
+    
+    def _start_config_flusher(self) -> None:
+        """Start the background task that batches configuration writes, if not already running."""
+        if self._cfg_flush_task is None or self._cfg_flush_task.done():
+            if self._cfg_writes is None:
+                self._cfg_writes = asyncio.Queue()
+            self._cfg_flush_task = asyncio.create_task(self._config_flusher())
+    
+    async def _config_flusher(self) -> None:
+        """
+        Drain queued server additions into one configuration save per burst.
+        
+        A None in the queue, put there by close(), makes the flusher save the
+        batch it has gathered so far and exit.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._cfg_writes.get()
+            if item is None:
+                return
+            items = [item]
+            
+            # Gather whatever else arrives shortly after, up to the batch size
+            deadline = loop.time() + CONFIG_WRITE_DELAY
+            while len(items) < CONFIG_WRITE_BATCH:
+                try:
+                    item = self._cfg_writes.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._cfg_writes.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                items.append(item)
+            
+            try:
+                await self._run_io(self._write_servers, [(server_id, server_config) for server_id, server_config, _ in items])
+            except Exception as e:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
             
-            # Initialize the ClientSession with the streams
-            self.client = ClientSession(read_stream, write_stream)
-            await self.client.connect()
+            for server_id, _, future in items:
+                self._invalidate_server_cache(server_id)
+                if not future.done():
+                    future.set_result(None)
+    
+    def _write_servers(self, servers: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add several servers to the configuration with a single save.
+        
+        Args:
+            servers: List of (server_id, server_config) pairs.
+        """
+        with self.config.batch():
+            for server_id, server_config in servers:
+                self.config.add_server(
+                    server_id=server_id,
+                    command=server_config["command"],
+                    args=server_config["args"],
+                    env=server_config["env"]
+                )
+    
+    async def _queue_config_write(self, server_id: str, server_config: Dict[str, Any]) -> None:
+        """
+        Queue a server addition for the configuration and wait until it has been saved.
+        
+        Args:
+            server_id: Identifier of the server.
+            server_config: Server configuration with command, args and env.
             
+        Raises:
+            ValueError: If the server id is invalid.
+        """
+        # Checked here so one bad id cannot fail the whole batch it would be saved with
+        _validate_id(server_id)
+        
+        self._start_config_flusher()
+        future = asyncio.get_running_loop().create_future()
+        await self._cfg_writes.put((server_id, server_config, future))
+        await future
+    
+    async def _connect_server(self, server_id: str) -> None:
+        """
+        Queue a server for connection and wait until its batch has been connected.
+        
+        Args:
+            server_id: Identifier of the server to connect to.
+        """
+        self._start_connect_worker()
+        
+        future = self._pending_connects.get(server_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_connects[server_id] = future
+        
+        self._connect_event.set()
+        await future
+    
     async def list_available_servers(self) -> Dict[str, Any]:
         """
         List all available servers in the registry.
@@ -63,7 +740,7 @@ class MCPServerManager:
         Returns:
             Dictionary of available servers.
         """
-        return self.installer.get_available_servers()
+        return await self._run_io(self.installer.get_available_servers)
     
     async def list_configured_servers(self) -> Dict[str, Any]:
         """
@@ -72,7 +749,7 @@ class MCPServerManager:
         Returns:
             Dictionary of configured servers.
         """
-        return self.config.get_all_servers()
+        return await self._run_io(self.config.get_all_servers)
     
     async def list_running_servers(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -81,7 +758,37 @@ class MCPServerManager:
         Returns:
             Dictionary of running server statuses.
         """
-        return self.lifecycle.get_all_servers_status()
+        return await self._run_io(self.lifecycle.get_all_servers_status)
+    
+    async def list_available_servers_bytes(self) -> bytes:
+        """
+        List all available servers in the registry as encoded JSON.
+        
+        Returns:
+            JSON bytes of the available servers, cached until the registry changes.
+        """
+        return await self._list_bytes("available", self.installer.get_available_servers)
+    
+    async def list_configured_servers_bytes(self) -> bytes:
+        """
+        List all configured servers as encoded JSON.
+        
+        Returns:
+            JSON bytes of the configured servers, cached until the configuration changes.
+        """
+        return await self._list_bytes("configured", self.config.get_all_servers)
+    
+    async def list_running_servers_bytes(self) -> bytes:
+        """
+        List all running servers as encoded JSON.
+        
+        Statuses include uptime and memory usage and servers may exit on their
+        own, so the cached response also expires after the lookup cache TTL.
+        
+        Returns:
+            JSON bytes of the running server statuses.
+        """
+        return await self._list_bytes("running", self.lifecycle.get_all_servers_status, ttl=self._cache_ttl)
     
     async def install_server(self, server_id: str, config_overrides: Optional[Dict[str, Any]] = None) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
         """
@@ -97,16 +804,58 @@ class MCPServerManager:
         success, output, server_config = self.installer.install_server(server_id, config_overrides)
         
         if success and server_config:
-            # Add the server to the configuration
-            self.config.add_server(
-                server_id=server_id,
-                command=server_config["command"],
-                args=server_config["args"],
-                env=server_config["env"]
-            )
+            # Add the server to the configuration; concurrent installs share one save
+            try:
+                await self._queue_config_write(server_id, server_config)
+            except ValueError as e:
+                return False, str(e), server_config
+        else:
+            self._invalidate_server_cache(server_id)
         
         return success, output, server_config
     
+    async def install_servers(self, server_ids: List[str], concurrency: int = 4) -> Dict[str, Tuple[bool, str, Optional[Dict[str, Any]]]]:
+        """
+        Install several servers concurrently, writing the configuration once.
+        
+        Args:
+            server_ids: Identifiers of the servers to install.
+            concurrency: Maximum number of installations running at once.
+            
+        Returns:
+            Dictionary mapping server IDs to (success, output, server_config) tuples.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _install(server_id: str) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return await self._run_io(self.installer.install_server, server_id)
+        
+        results = await asyncio.gather(*(_install(server_id) for server_id in server_ids), return_exceptions=True)
+        
+        installed: Dict[str, Tuple[bool, str, Optional[Dict[str, Any]]]] = {}
+        with self.config.batch():
+            for server_id, result in zip(server_ids, results):
+                if isinstance(result, Exception):
+                    result = (False, f"Installation failed: {str(result)}", None)
+                installed[server_id] = result
+                
+                success, _, server_config = result
+                if success and server_config:
+                    try:
+                        self.config.add_server(
+                            server_id=server_id,
+                            command=server_config["command"],
+                            args=server_config["args"],
+                            env=server_config["env"]
+                        )
+                    except ValueError as e:
+                        installed[server_id] = (False, str(e), server_config)
+                
+                self._invalidate_server_cache(server_id)
+        
+        return installed
+    
     async def uninstall_server(self, server_id: str) -> Tuple[bool, str]:
         """
         Uninstall a server.
@@ -118,9 +867,8 @@ class MCPServerManager:
             Tuple of (success, output).
         """
         # First, stop the server if it's running
-        status = self.lifecycle.get_server_status(server_id)
-        if status["running"]:
-            self.lifecycle.stop_server(server_id, force=True)
+        if await self.lifecycle.aensure_stopped(server_id, force=True):
+            self._set_running(server_id, False)
         
         # Remove the server from the configuration
         try:
@@ -129,7 +877,9 @@ class MCPServerManager:
             pass  # Server not in config, that's okay
         
         # Uninstall the server
-        return self.installer.uninstall_server(server_id)
+        result = await self._run_io(self.installer.uninstall_server, server_id)
+        self._invalidate_server_cache(server_id)
+        return result
     
     async def start_server(self, server_id: str) -> Tuple[bool, Optional[str]]:
         """
@@ -141,28 +891,100 @@ class MCPServerManager:
         Returns:
             Tuple of (success, error_message).
         """
-        server_config = self.config.get_server_config(server_id)
+        server_config = self._get_server_config(server_id)
         if not server_config:
             return False, f"Server '{server_id}' not found in configuration"
         
-        success, error = self.lifecycle.start_server(
+        success, error = await self.lifecycle.astart_server(
             server_id=server_id,
             command=server_config["command"],
             args=server_config.get("args", []),
             env=server_config.get("env", {})
         )
+        self._set_running(server_id, success)
         
         # If the server started successfully, connect to it
         if success and self.client:
             try:
-                await self.client.connect_to_servers()
-                self.connected_servers.add(server_id)
+                await self._connect_server(server_id)
             except Exception as e:
                 logger.warning(f"Failed to connect to server '{server_id}': {e}")
                 # But we still consider the server started
         
         return success, error
     
+    async def _ensure_running(self, server_id: str) -> Tuple[bool, Optional[str]]:
+        """
+        Start a server unless it is already running, without blocking the event loop.
+        
+        Args:
+            server_id: Identifier of the server.
+            
+        Returns:
+            Tuple of (success, error_message).
+        """
+        server_config = self._get_server_config(server_id)
+        if not server_config:
+            return False, f"Server '{server_id}' not found in configuration"
+        
+        success, error = await self.lifecycle.aensure_running(
+            server_id=server_id,
+            command=server_config["command"],
+            args=server_config.get("args", []),
+            env=server_config.get("env", {})
+        )
+        self._set_running(server_id, success)
+        return success, error
+    
+    async def start_servers(self, server_ids: List[str], concurrency: int = 8) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """
+        Start several servers concurrently.
+        
+        Args:
+            server_ids: Identifiers of the servers to start.
+            concurrency: Maximum number of servers being spawned at once.
+            
+        Returns:
+            Dictionary mapping server IDs to (success, error_message) tuples.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _start(server_id: str) -> Tuple[bool, Optional[str]]:
+            server_config = self._get_server_config(server_id)
+            if not server_config:
+                return False, f"Server '{server_id}' not found in configuration"
+            
+            async with semaphore:
+                return await self.lifecycle.astart_server(
+                    server_id=server_id,
+                    command=server_config["command"],
+                    args=server_config.get("args", []),
+                    env=server_config.get("env", {})
+                )
+        
+        results = await asyncio.gather(*(_start(server_id) for server_id in server_ids), return_exceptions=True)
+        
+        statuses: Dict[str, Tuple[bool, Optional[str]]] = {}
+        for server_id, result in zip(server_ids, results):
+            if isinstance(result, Exception):
+                result = (False, f"Error starting server: {str(result)}")
+            statuses[server_id] = result
+            self._set_running(server_id, result[0])
+        
+        # Connect to every started server that isn't connected yet with a single batched connect
+        started = [server_id for server_id, (success, _) in statuses.items() if success]
+        unconnected = self._mask_of(started) & ~self._connected_mask
+        started = [server_id for server_id in started if (unconnected >> self._idx(server_id)) & 1]
+        if started and self.client:
+            connect_results = await asyncio.gather(
+                *(self._connect_server(server_id) for server_id in started), return_exceptions=True
+            )
+            for server_id, result in zip(started, connect_results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to connect to server '{server_id}': {result}")
+        
+        return statuses
+    
     async def stop_server(self, server_id: str, force: bool = False) -> Tuple[bool, Optional[str]]:
         """
         Stop a server.
@@ -174,11 +996,12 @@ class MCPServerManager:
         Returns:
             Tuple of (success, error_message).
         """
-        success, error = self.lifecycle.stop_server(server_id, force=force)
+        success, error = await self.lifecycle.astop_server(server_id, force=force)
         
         # Update connected servers
-        if success and server_id in self.connected_servers:
-            self.connected_servers.remove(server_id)
+        if success:
+            self._set_running(server_id, False)
+            self._connected_mask &= ~(1 << self._idx(server_id))
         
         return success, error
     
@@ -195,8 +1018,8 @@ class MCPServerManager:
         # Stop the server
         stop_success, stop_error = await self.stop_server(server_id)
         
-        # Wait a bit for the server to fully stop
-        await asyncio.sleep(1)
+        # Wait for the server to fully stop
+        await self._wait_stopped(server_id)
         
         # Start the server
         start_success, start_error = await self.start_server(server_id)
@@ -210,6 +1033,42 @@ class MCPServerManager:
         
         return True, None
     
+    async def _wait_stopped(self, server_id: str, timeout: float = 5.0) -> bool:
+        """
+        Wait until a server is no longer running, polling with exponential backoff.
+        
+        Args:
+            server_id: Identifier of the server.
+            timeout: Maximum time to wait (seconds).
+            
+        Returns:
+            True if the server stopped within the timeout, False otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.005
+        
+        while loop.time() < deadline:
+            if not self._is_running(server_id):
+                return True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        
+        return False
+    
+    def running_server_ids(self) -> List[str]:
+        """
+        List the servers this manager has started and not stopped since.
+        
+        Unlike list_running_servers(), this reads the in-memory server table
+        without touching PID files or /proc, so it does not notice servers that
+        exited on their own or were started by another process.
+        
+        Returns:
+            List of server IDs.
+        """
+        return self._table.running_ids()
+    
     async def get_server_status(self, server_id: str) -> Dict[str, Any]:
         """
         Get the status of a server.
@@ -220,7 +1079,11 @@ class MCPServerManager:
         Returns:
             Dictionary with status information.
         """
-        return self.lifecycle.get_server_status(server_id)
+        # A server the mirror knows to be stopped needs no PID file or /proc lookups
+        if self._mirror_running(server_id) is False:
+            return {"server_id": server_id, "running": False, "pid": None, "uptime": None, "memory_usage": None}
+        
+        return await self._run_io(self.lifecycle.get_server_status, server_id)
     
     async def get_server_tools(self, server_id: str) -> List[Dict[str, Any]]:
         """
@@ -261,14 +1124,14 @@ class MCPServerManager:
             await self.initialize_client()
             
         # Make sure the server is in the connected servers list
-        if server_id not in self.connected_servers:
-            # Try to connect to the server
-            server_status = self.lifecycle.get_server_status(server_id)
-            if not server_status["running"]:
-                await self.start_server(server_id)
+        if not self._is_connected(server_id):
+            # Make sure the server is running, then connect to it
+            if not self._mirror_running(server_id):
+                success, error = await self._ensure_running(server_id)
+                if not success:
+                    logger.warning(f"Failed to start server '{server_id}': {error}")
             
-            await self.client.connect_to_servers()
-            self.connected_servers.add(server_id)
+            await self._connect_server(server_id)
         
         try:
             return await self.client.call_tool(server_id, tool_name, arguments)
@@ -292,12 +1155,15 @@ class MCPServerManager:
             Tuple of (success, message).
         """
         # Add the server to the configuration
-        self.config.add_server(
-            server_id=server_id,
-            command=command,
-            args=args or [],
-            env=env or {}
-        )
+        try:
+            self.config.add_server(
+                server_id=server_id,
+                command=command,
+                args=args or [],
+                env=env or {}
+            )
+        except ValueError as e:
+            return False, str(e)
         
         # Optionally save to the custom registry
         if save_to_registry:
@@ -314,6 +1180,11 @@ class MCPServerManager:
             if not success:
                 logger.warning(f"Failed to save custom server to registry: {message}")
                 # But we still consider the server created since it's in the config
+            
+            # Saving to the registry reloads every registry source
+            self._invalidate_server_cache()
+        else:
+            self._invalidate_server_cache(server_id)
         
         return True, f"Created custom server '{server_id}'"
     
@@ -328,11 +1199,11 @@ class MCPServerManager:
             Server information dictionary, or None if not found.
         """
         # Check the registry first
-        server_info = self.installer.get_server_info(server_id)
+        server_info = self._get_registry_info(server_id)
         
         # If not in registry, check the configuration
         if not server_info:
-            server_config = self.config.get_server_config(server_id)
+            server_config = self._get_server_config(server_id)
             if server_config:
                 server_info = {
                     "name": server_id,
@@ -357,11 +1228,62 @@ class MCPServerManager:
         
         return self.client
     
+    async def acquire_client(self) -> ClientSession:
+        """
+        Take a reference on the pooled MCP client session, for use outside the manager.
+        
+        The session is shared with other managers; give it back with
+        release_client() instead of closing it.
+        
+        Returns:
+            The shared client session.
+        """
+        return await _ClientPool.acquire(self._pool_key, self._open_client)
+    
+    async def release_client(self) -> None:
+        """Give back a session reference taken with acquire_client()."""
+        await _ClientPool.release(self._pool_key)
+    
     async def close(self) -> None:
         """Close the server manager and clean up resources."""
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            self._connect_task = None
+        
+        for future in self._pending_connects.values():
+            future.cancel()
+        self._pending_connects = {}
+        
+        if self._cfg_flush_task is not None:
+            # Rather than cancelling the flusher, which would drop the batch it is
+            # gathering or saving, let it finish everything queued before the stop
+            if not self._cfg_flush_task.done():
+                await self._cfg_writes.put(None)
+                await self._cfg_flush_task
+            self._cfg_flush_task = None
+        
+        # Save any configuration writes queued after the flusher stopped
+        if self._cfg_writes is not None and not self._cfg_writes.empty():
+            pending = []
+            while not self._cfg_writes.empty():
+                pending.append(self._cfg_writes.get_nowait())
+            self._write_servers([(server_id, server_config) for server_id, server_config, _ in pending])
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_result(None)
+        
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+        self.lifecycle.close()
+        
+        self._stop_status_watch()
+        
         if self.client:
-            await self.client.close()
+            # Return the session to the pool; it is closed once it has been idle for a while
+            await _ClientPool.release(self._pool_key)
             self.client = None
+            self._connected_mask = 0
 
 
 # Example usage (async context required)
@@ -6,18 +6,75 @@ Provides the main interface for interacting with MCP servers and OpenRouter.
 import os
 import json
 import logging
+import sys
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple, Union, Set
+import time
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, Union, Set, TYPE_CHECKING
 import mcp
 from dotenv import load_dotenv
 
-from .core.openrouter import OpenRouterClient
 from .core.server_manager import MCPServerManager
-from .utils.playwright_utils import PlaywrightMCP
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib parser
+    orjson = None
+
+# OpenRouterClient (openai/httpx) and PlaywrightMCP are imported on first use so
+# that server-management commands do not pay for them
+if TYPE_CHECKING:
+    from .core.openrouter import OpenRouterClient
+    from .utils.playwright_utils import PlaywrightMCP
 
 # Load environment variables
 load_dotenv()
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _tool_result_content(result: Any) -> str:
+    """
+    Render a tool result as message content.
+    
+    Strings are passed through; other values become compact JSON rather than
+    their Python repr, falling back to str() for objects JSON cannot encode.
+    """
+    if isinstance(result, str):
+        return result
+    try:
+        # orjson.JSONEncodeError subclasses TypeError
+        if orjson is not None:
+            return orjson.dumps(result).decode("utf-8")
+        return json.dumps(result, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return str(result)
+
+def _windowed_messages(messages: List[Dict[str, Any]], window: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Trim a conversation to its first message plus the most recent messages.
+    
+    Tool results at the start of the kept tail are dropped as well, since the
+    assistant message that issued their tool calls has been cut.
+    
+    Args:
+        messages: Full conversation.
+        window: Maximum number of recent messages to keep, or None to keep all.
+        
+    Returns:
+        The messages to send.
+    """
+    if window is None or len(messages) <= window + 1:
+        return messages
+    
+    start = len(messages) - window
+    while start < len(messages) and messages[start].get("role") == "tool":
+        start += 1
+    return messages[:1] + messages[start:]
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -28,9 +85,14 @@ class MCPRouter:
     Provides methods for installing and managing MCP servers, and using OpenRouter for LLM-based interactions.
     """
     
+    # How long discovered server tools are reused before asking the server again (seconds)
+    _TOOLS_TTL = 60.0
+    
     def __init__(self, config_path: Optional[str] = None,
                  registry_path: Optional[str] = None,
-                 openrouter_api_key: Optional[str] = None):
+                 openrouter_api_key: Optional[str] = None,
+                 tool_concurrency: int = 4,
+                 idle_timeout: Optional[float] = None):
         """
         Initialize the MCP Router.
         
@@ -38,32 +100,112 @@ class MCPRouter:
             config_path: Path to the MCP server config file.
             registry_path: Path to the MCP server registry file.
             openrouter_api_key: OpenRouter API key.
+            tool_concurrency: Maximum number of tool calls in flight per server.
+            idle_timeout: If set, servers started or used by queries are stopped after
+                this many seconds without a tool call, and restarted on next use.
         """
         self.server_manager = MCPServerManager(config_path=config_path, registry_path=registry_path)
-        self.openrouter_client = OpenRouterClient(api_key=openrouter_api_key)
+        self._openrouter_api_key = openrouter_api_key
+        self._openrouter_client: Optional["OpenRouterClient"] = None
         self.playwright_mcp = None
         self.mcp_client_initialized = False
+        
+        # How far initialize() has got: 0 nothing, 1 without the MCP client, 2 with it
+        self._initialized_level = 0
+        
+        # Whether a query has already warmed the OpenRouter connection
+        self._openrouter_warmed = False
+        
+        # Per-server limits on concurrent tool calls, created on first use
+        self.tool_concurrency = tool_concurrency
+        self._server_sems: Dict[str, asyncio.Semaphore] = {}
+        
+        # Last query use of each server, for stopping idle ones
+        self.idle_timeout = idle_timeout
+        self._last_used: Dict[str, float] = {}
+        self._idle_task: Optional[asyncio.Task] = None
+        
+        # Tools per server as (timestamp, tools), dropped whenever the server is started or stopped
+        self._tools_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+    
+    @property
+    def openrouter_client(self) -> "OpenRouterClient":
+        """OpenRouter client, created on first access."""
+        if self._openrouter_client is None:
+            from .core.openrouter import OpenRouterClient
+            self._openrouter_client = OpenRouterClient(api_key=self._openrouter_api_key)
+        return self._openrouter_client
     
-    async def initialize(self, initialize_mcp_client: bool = True) -> None:
+    async def initialize(self, initialize_mcp_client: bool = True, warm_openrouter: bool = False) -> None:
         """
         Initialize all components of the MCP Router.
         
         Args:
             initialize_mcp_client: Whether to initialize the MCP client (required for server interactions).
-        """
-        # Only initialize the MCP client if needed and if it wasn't already initialized
+            warm_openrouter: Whether to open the OpenRouter connection and fetch the
+                model list now. Only the query path asks for this, so MCP- or
+                Playwright-only use never imports the OpenRouter client.
+        """
+        # Fast path for repeated calls, e.g. once per query
+        desired_level = 2 if initialize_mcp_client else 1
+        warm = warm_openrouter and not self._openrouter_warmed
+        if self._initialized_level >= desired_level and not warm:
+            return
+        
+        # Warm the OpenRouter connection (TLS handshake, model list) while the
+        # MCP client starts, so the first completion does not pay for it
+        tasks = []
+        if warm:
+            self._openrouter_warmed = True
+            tasks.append(self._warm_openrouter())
         if initialize_mcp_client and not self.mcp_client_initialized:
-            try:
-                await self.server_manager.initialize_client()
-                self.mcp_client_initialized = True
-                
-                # Initialize PlaywrightMCP if needed
-                if self.playwright_mcp is None:
-                    client = await self.server_manager.get_client()
-                    self.playwright_mcp = PlaywrightMCP(client)
-            except Exception as e:
-                logger.warning(f"Failed to initialize MCP client: {e}")
-                # Continue anyway, as we might just need OpenRouter functionality
+            tasks.append(self._initialize_mcp_client())
+        
+        await asyncio.gather(*tasks)
+        if self.idle_timeout is not None and (self._idle_task is None or self._idle_task.done()):
+            self._idle_task = asyncio.ensure_future(self._idle_reaper())
+        if initialize_mcp_client and not self.mcp_client_initialized:
+            # Client initialization failed; retry on the next call
+            desired_level = 1
+        
+        self._initialized_level = max(self._initialized_level, desired_level)
+    
+    async def _initialize_mcp_client(self) -> None:
+        """Initialize the MCP client, logging failures."""
+        try:
+            await self.server_manager.initialize_client()
+            self.mcp_client_initialized = True
+        except Exception as e:
+            logger.warning(f"Failed to initialize MCP client: {e}")
+            # Continue anyway, as we might just need OpenRouter functionality
+    
+    async def _warm_openrouter(self) -> None:
+        """Open the OpenRouter connection and cache the model list, if a key is configured."""
+        if not (self._openrouter_api_key or os.getenv("OPENROUTER_API_KEY")):
+            return
+        
+        try:
+            await self.openrouter_client.alist_models()
+        except Exception as e:
+            logger.debug(f"Failed to warm OpenRouter connection: {e}")
+    
+    async def _idle_reaper(self) -> None:
+        """Periodically stop servers that have not had a tool call for idle_timeout seconds."""
+        interval = min(30.0, self.idle_timeout)
+        while True:
+            await asyncio.sleep(interval)
+            
+            now = time.monotonic()
+            idle = [server_id for server_id, last_used in self._last_used.items() if now - last_used > self.idle_timeout]
+            for server_id in idle:
+                del self._last_used[server_id]
+                logger.info(f"Stopping idle server '{server_id}'")
+                try:
+                    success, error = await self.stop_server(server_id)
+                    if not success:
+                        logger.warning(f"Failed to stop idle server '{server_id}': {error}")
+                except Exception as e:
+                    logger.warning(f"Failed to stop idle server '{server_id}': {e}")
     
     async def list_available_servers(self) -> Dict[str, Any]:
         """
@@ -127,6 +269,7 @@ class MCPRouter:
         Returns:
             Tuple of (success, error_message).
         """
+        self._tools_cache.pop(server_id, None)
         return await self.server_manager.start_server(server_id)
     
     async def stop_server(self, server_id: str, force: bool = False) -> Tuple[bool, Optional[str]]:
@@ -140,6 +283,7 @@ class MCPRouter:
         Returns:
             Tuple of (success, error_message).
         """
+        self._tools_cache.pop(server_id, None)
         return await self.server_manager.stop_server(server_id, force=force)
     
     async def restart_server(self, server_id: str) -> Tuple[bool, Optional[str]]:
@@ -152,6 +296,7 @@ class MCPRouter:
         Returns:
             Tuple of (success, error_message).
         """
+        self._tools_cache.pop(server_id, None)
         return await self.server_manager.restart_server(server_id)
     
     async def get_server_status(self, server_id: str) -> Dict[str, Any]:
@@ -178,6 +323,25 @@ class MCPRouter:
         """
         return await self.server_manager.get_server_tools(server_id)
     
+    async def _cached_get_server_tools(self, server_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the tools provided by an MCP server, reusing a recent result.
+        
+        Args:
+            server_id: Identifier of the server.
+            
+        Returns:
+            List of tool definitions.
+        """
+        now = time.monotonic()
+        entry = self._tools_cache.get(server_id)
+        if entry is not None and now - entry[0] < self._TOOLS_TTL:
+            return entry[1]
+        
+        tools = await self.get_server_tools(server_id)
+        self._tools_cache[server_id] = (now, tools)
+        return tools
+    
     async def call_server_tool(self, server_id: str, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """
         Call a tool on an MCP server.
@@ -229,6 +393,15 @@ class MCPRouter:
         """
         return self.openrouter_client.list_models()
     
+    def refresh_models(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the OpenRouter model list again, bypassing the cache.
+        
+        Returns:
+            List of model information dictionaries.
+        """
+        return self.openrouter_client.refresh_models()
+    
     async def list_models(self) -> List[Dict[str, Any]]:
         """
         Async wrapper for list_openrouter_models.
@@ -264,9 +437,39 @@ class MCPRouter:
             stream=stream
         )
     
+    async def _start_missing_servers(self, servers: Optional[List[str]]) -> None:
+        """
+        Start, all at once, those of the given servers that are not already running.
+        
+        Args:
+            servers: List of MCP server IDs.
+        """
+        if not servers:
+            return
+        
+        # Check only the requested servers, concurrently; a failed check counts as not running
+        statuses = await asyncio.gather(*(self.get_server_status(server_id) for server_id in servers), return_exceptions=True)
+        to_start = [
+            server_id for server_id, status in zip(servers, statuses)
+            if isinstance(status, Exception) or not status.get("running", False)
+        ]
+        if not to_start:
+            return
+        
+        logger.info(f"Starting servers: {', '.join(to_start)}...")
+        for server_id in to_start:
+            self._tools_cache.pop(server_id, None)
+        start_results = await self.server_manager.start_servers(to_start)
+        for server_id, (success, error) in start_results.items():
+            if success:
+                self._last_used[server_id] = time.monotonic()
+            else:
+                logger.error(f"Failed to start server '{server_id}': {error}")
+                # Continue with other servers
+    
     async def query(self, user_query: str, servers: Optional[List[str]] = None, 
                    model: str = "anthropic/claude-3-5-sonnet", temperature: float = 0.7,
-                   max_tokens: Optional[int] = None) -> Dict[str, Any]:
+                   max_tokens: Optional[int] = None, history_window: Optional[int] = None) -> Dict[str, Any]:
         """
         Execute a query using OpenRouter LLM and available MCP tools.
         
@@ -276,16 +479,58 @@ class MCPRouter:
             model: OpenRouter model to use.
             temperature: Temperature for the LLM generation.
             max_tokens: Maximum tokens for the LLM response.
+            history_window: If set, send only the first message plus about this many
+                of the most recent messages to the model on each turn.
             
         Returns:
             Dictionary containing the conversation and other information.
         """
+        result = None
+        async for event in self.query_stream(user_query, servers=servers, model=model,
+                                             temperature=temperature, max_tokens=max_tokens,
+                                             history_window=history_window):
+            if event["type"] == "done":
+                result = event
+        
+        return {
+            "messages": result["messages"],
+            "response": result["response"],
+            "tool_calls": result["tool_calls"]
+        }
+    
+    async def query_stream(self, user_query: str, servers: Optional[List[str]] = None,
+                           model: str = "anthropic/claude-3-5-sonnet", temperature: float = 0.7,
+                           max_tokens: Optional[int] = None,
+                           history_window: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a query like query(), yielding progress events as they happen.
+        
+        Events are dictionaries with a "type" key:
+        
+        - "assistant": a piece of assistant text, in "content".
+        - "tool_start": a tool call was issued, with "id" and "name".
+        - "tool_result": a tool call finished, with "id" and "content".
+        - "done": the conversation is complete; carries the same "messages",
+          "response" and "tool_calls" keys that query() returns.
+        
+        Args:
+            user_query: User query to execute.
+            servers: List of MCP server IDs to use. If empty or None, will only use OpenRouter.
+            model: OpenRouter model to use.
+            temperature: Temperature for the LLM generation.
+            max_tokens: Maximum tokens for the LLM response.
+            history_window: If set, send only the first message plus about this many
+                of the most recent messages to the model on each turn.
+            
+        Yields:
+            Event dictionaries.
+        """
         # Initialize only if we need MCP servers
         if servers and len(servers) > 0:
-            await self.initialize(initialize_mcp_client=True)
+            await self.initialize(initialize_mcp_client=True, warm_openrouter=True)
         else:
             # Skip MCP client initialization if no servers are specified
-            await self.initialize(initialize_mcp_client=False)
+            await self.initialize(initialize_mcp_client=False, warm_openrouter=True)
         
         # Initial conversation
         conversation = {
@@ -296,28 +541,9 @@ class MCPRouter:
         }
         
         # Start servers if they're not already running
-        running_servers = await self.list_running_servers() if servers else {}
-        for server_id in servers or []:
-            status = running_servers.get(server_id, {})
-            if not status.get("running", False):
-                logger.info(f"Starting server '{server_id}'...")
-                success, error = await self.start_server(server_id)
-                if not success:
-                    logger.error(f"Failed to start server '{server_id}': {error}")
-                    # Continue with other servers
-        
-        # Get all available tools from the specified servers
-        all_tools = []
-        for server_id in servers or []:
-            try:
-                server_tools = await self.get_server_tools(server_id)
-                for tool in server_tools:
-                    # Add server_id to the tool for tracking
-                    tool["server_id"] = server_id
-                    all_tools.append(tool)
-            except Exception as e:
-                logger.error(f"Error getting tools from server '{server_id}': {e}")
-                # Continue with other servers
+        await self._start_missing_servers(servers)
+        
+        all_tools, tool_index = await self._collect_tools(servers)
         
         # Start conversation with the model
         conversation_complete = False
@@ -327,97 +553,273 @@ class MCPRouter:
         while not conversation_complete and turn < max_turns:
             turn += 1
             
-            # Get response from the model
-            response = self.openrouter_client.chat_completion(
-                messages=conversation["messages"],
+            # Stream the response from the model, forwarding text as it arrives
+            stream = await self.openrouter_client.achat_completion(
+                messages=_windowed_messages(conversation["messages"], history_window),
                 model=model,
                 tools=all_tools,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                stream=True
             )
             
-            # Extract the response message
-            assistant_message = response.choices[0].message
-            conversation["messages"].append(assistant_message.model_dump())
+            content_parts: List[str] = []
+            tool_calls: Dict[int, Dict[str, Any]] = {}
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield {"type": "assistant", "content": delta.content}
+                
+                # Tool calls arrive in fragments keyed by their index
+                for fragment in delta.tool_calls or []:
+                    call = tool_calls.setdefault(fragment.index, {
+                        "id": "",
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""}
+                    })
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    if fragment.function is not None:
+                        call["function"]["name"] += fragment.function.name or ""
+                        call["function"]["arguments"] += fragment.function.arguments or ""
+            
+            # Record the assistant message, without null fields so later turns resend fewer bytes
+            assistant_message: Dict[str, Any] = {"role": "assistant"}
+            if content_parts:
+                assistant_message["content"] = "".join(content_parts)
+            if tool_calls:
+                assistant_message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+            conversation["messages"].append(assistant_message)
             
             # Check if the model wants to call a tool
-            if hasattr(assistant_message, "tool_calls") and assistant_message.tool_calls:
-                for tool_call in assistant_message.tool_calls:
-                    # Find which server this tool belongs to
-                    tool_name = tool_call.function.name
-                    server_id = None
-                    
-                    for tool in all_tools:
-                        if tool["name"] == tool_name:
-                            server_id = tool.get("server_id")
-                            break
-                    
-                    if not server_id:
-                        # Tool not found, inform the model
-                        conversation["messages"].append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": f"Error: Tool '{tool_name}' not found in any available server."
-                        })
-                        continue
-                    
-                    # Parse arguments
-                    try:
-                        args = json.loads(tool_call.function.arguments)
-                    except json.JSONDecodeError:
-                        conversation["messages"].append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": f"Error: Invalid JSON arguments: {tool_call.function.arguments}"
-                        })
-                        continue
-                    
-                    # Call the tool
-                    try:
-                        result = await self.server_manager.call_tool(server_id, tool_name, args)
-                        
-                        # Add the result to the conversation
-                        conversation["messages"].append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": str(result)
-                        })
-                    except Exception as e:
-                        # If the tool call fails, inform the model
-                        conversation["messages"].append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": f"Error calling tool: {str(e)}"
-                        })
+            if tool_calls:
+                calls = assistant_message["tool_calls"]
+                for call in calls:
+                    yield {"type": "tool_start", "id": call["id"], "name": call["function"]["name"]}
+                
+                # Run all tool calls of this turn concurrently and report each as it
+                # finishes, but record the results in tool_call order
+                tasks = [
+                    asyncio.ensure_future(self._run_tool_call(tool_index, call["id"], call["function"]["name"], call["function"]["arguments"]))
+                    for call in calls
+                ]
+                try:
+                    for finished in asyncio.as_completed(tasks):
+                        tool_message = await finished
+                        yield {"type": "tool_result", "id": tool_message["tool_call_id"], "content": tool_message["content"]}
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                conversation["messages"].extend(task.result() for task in tasks)
             else:
                 # No tool calls, conversation is complete
                 conversation_complete = True
         
-        # Return the final conversation
-        return {
+        # Report the final conversation
+        yield {
+            "type": "done",
             "messages": conversation["messages"],
-            "response": conversation["messages"][-1]["content"] if conversation["messages"][-1]["role"] == "assistant" else None,
+            "response": conversation["messages"][-1].get("content") if conversation["messages"][-1]["role"] == "assistant" else None,
             "tool_calls": conversation["tool_calls"]
         }
     
-    async def get_playwright(self) -> PlaywrightMCP:
+    async def _collect_tools(self, servers: Optional[List[str]]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Gather the tools of the given servers.
+        
+        Args:
+            servers: List of MCP server IDs.
+            
+        Returns:
+            Tuple of (tool definitions tagged with their server_id, tool name to server_id index).
+        """
+        # Get all available tools from the specified servers concurrently
+        all_tools = []
+        tool_lists = await asyncio.gather(*(self._cached_get_server_tools(server_id) for server_id in servers or []), return_exceptions=True)
+        for server_id, server_tools in zip(servers or [], tool_lists):
+            if isinstance(server_tools, Exception):
+                logger.error(f"Error getting tools from server '{server_id}': {server_tools}")
+                # Continue with other servers
+                continue
+            for tool in server_tools:
+                # Add server_id to the tool for tracking
+                tool["server_id"] = server_id
+                all_tools.append(tool)
+        
+        # Index tools by name for O(1) routing of tool calls; the first server wins on collisions
+        tool_index: Dict[str, str] = {}
+        for tool in all_tools:
+            owner = tool_index.setdefault(tool["name"], tool["server_id"])
+            if owner != tool["server_id"]:
+                logger.warning(f"Tool '{tool['name']}' is provided by both '{owner}' and '{tool['server_id']}'; using '{owner}'")
+        
+        return all_tools, tool_index
+    
+    async def _run_tool_call(self, tool_index: Dict[str, str], tool_call_id: str,
+                             tool_name: str, arguments: str) -> Dict[str, Any]:
+        """
+        Run a single tool call and build its tool result message.
+        
+        Args:
+            tool_index: Tool name to server_id index.
+            tool_call_id: Identifier of the tool call.
+            tool_name: Name of the tool to call.
+            arguments: JSON-encoded tool arguments.
+            
+        Returns:
+            Tool result message for the conversation.
+        """
+        # Find which server this tool belongs to
+        server_id = tool_index.get(tool_name)
+        
+        if not server_id:
+            # Tool not found, inform the model
+            return {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "content": f"Error: Tool '{tool_name}' not found in any available server."
+            }
+        
+        # Parse arguments
+        try:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            args = _json_loads(arguments)
+        except json.JSONDecodeError:
+            return {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "content": f"Error: Invalid JSON arguments: {arguments}"
+            }
+        
+        # Call the tool, capping how many calls each server handles at once
+        semaphore = self._server_sems.get(server_id)
+        if semaphore is None:
+            semaphore = self._server_sems[server_id] = asyncio.Semaphore(self.tool_concurrency)
+        
+        try:
+            async with semaphore:
+                result = await self.server_manager.call_tool(server_id, tool_name, args)
+            self._last_used[server_id] = time.monotonic()
+            return {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "content": _tool_result_content(result)
+            }
+        except Exception as e:
+            # If the tool call fails, inform the model
+            return {
+                "role": "tool",
+                "tool_call_id": tool_call_id,
+                "content": f"Error calling tool: {str(e)}"
+            }
+    
+    async def query_batch(self, queries: List[str], servers: Optional[List[str]] = None,
+                          model: str = "anthropic/claude-3-5-sonnet", temperature: float = 0.7,
+                          max_tokens: Optional[int] = None, max_concurrency: int = 8,
+                          history_window: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute several queries concurrently.
+        
+        Args:
+            queries: User queries to execute.
+            servers: List of MCP server IDs to use for every query.
+            model: OpenRouter model to use.
+            temperature: Temperature for the LLM generation.
+            max_tokens: Maximum tokens for the LLM response.
+            max_concurrency: Maximum number of queries in flight at once, to stay
+                within OpenRouter rate limits.
+            history_window: If set, send only the first message plus about this many
+                of the most recent messages to the model on each turn.
+            
+        Returns:
+            List of query results, in the order of the queries.
+        """
+        # Initialize and start the servers once rather than in every query
+        await self.initialize(initialize_mcp_client=bool(servers), warm_openrouter=True)
+        await self._start_missing_servers(servers)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(user_query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.query(user_query, servers=servers, model=model,
+                                        temperature=temperature, max_tokens=max_tokens,
+                                        history_window=history_window)
+        
+        return await asyncio.gather(*(_one(user_query) for user_query in queries))
+    
+    async def get_playwright(self) -> "PlaywrightMCP":
         """
         Get the Playwright MCP utility.
         
         Returns:
-            Initialized PlaywrightMCP instance.
+            Initialized PlaywrightMCP instance, or None if the MCP client could not be initialized.
         """
         await self.initialize()
+        
+        # Created on first use, so queries never pay for it
+        if self.playwright_mcp is None and self.mcp_client_initialized:
+            from .utils.playwright_utils import PlaywrightMCP
+            # The session is shared through the manager's pool: used inside
+            # "async with", it is acquired and released there, never closed
+            client = await self.server_manager.get_client()
+            self.playwright_mcp = PlaywrightMCP(
+                client,
+                client_factory=self.server_manager.acquire_client,
+                client_release=self.server_manager.release_client,
+            )
         return self.playwright_mcp
     
     async def close(self) -> None:
         """Close the MCP Router and clean up resources."""
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            self._idle_task = None
+        
         await self.server_manager.close()
+        self.mcp_client_initialized = False
+        self._initialized_level = 0
 
 
 # Command-line interface
+def _fast_parse_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common listing/status invocations without building an argparse parser.
+    
+    Args:
+        argv: Command-line arguments, without the program name.
+        
+    Returns:
+        Parsed arguments, or None if argv needs the full parser.
+    """
+    if argv == ["--list-servers"]:
+        list_servers, status = True, None
+    elif len(argv) == 2 and argv[0] == "--status" and not argv[1].startswith("-"):
+        list_servers, status = False, argv[1]
+    else:
+        return None
+    
+    return SimpleNamespace(
+        config=None, registry=None, list_servers=list_servers, list_models=False,
+        install=None, uninstall=None, start=None, stop=None, status=status,
+        query=None, model="anthropic/claude-3-5-sonnet"
+    )
+
 async def main():
     """Command-line interface for MCP Router."""
+    # Common read-only commands skip argparse entirely
+    args = _fast_parse_args(sys.argv[1:])
+    if args is None:
+        args = _parse_args()
+    
+    await _run(args)
+
+def _parse_args():
+    """Parse the command line with the full argparse parser."""
     import argparse
     
     parser = argparse.ArgumentParser(description="MCP Router: Connect Dolphin MCP with OpenRouter")
@@ -433,114 +835,139 @@ async def main():
     parser.add_argument("--query", help="Execute a query using OpenRouter and MCP tools")
     parser.add_argument("--model", default="anthropic/claude-3-5-sonnet", help="Model to use for queries")
     
-    args = parser.parse_args()
-    
-    # Initialize the router
-    router = MCPRouter(config_path=args.config, registry_path=args.registry)
-    
-    if args.list_servers:
-        # List available servers
-        available_servers = await router.list_available_servers()
-        print(f"Available servers ({len(available_servers)}):")
-        for server_id, info in available_servers.items():
-            print(f"  - {server_id}: {info.get('description', 'No description')}")
-        
-        # List configured servers
-        configured_servers = await router.list_configured_servers()
-        print(f"\nConfigured servers ({len(configured_servers)}):")
-        for server_id, config in configured_servers.items():
-            print(f"  - {server_id}: {config['command']} {' '.join(config.get('args', []))}")
-        
-        # List running servers
-        running_servers = await router.list_running_servers()
-        print(f"\nRunning servers ({len(running_servers)}):")
-        for server_id, status in running_servers.items():
-            running = "RUNNING" if status["running"] else "STOPPED"
-            pid = status["pid"] or "N/A"
-            uptime = f"{status['uptime']:.2f}s" if status["uptime"] else "N/A"
-            print(f"  - {server_id}: {running} (PID: {pid}, Uptime: {uptime})")
-    
-    elif args.list_models:
-        # List available OpenRouter models
-        models = await router.list_models()
-        print(f"Available OpenRouter models ({len(models)}):")
-        for model in models:
-            print(f"  - {model.get('id')}: {model.get('context_length')} context length")
-    
-    elif args.install:
-        # Install a server
-        server_id = args.install
-        success, output, config = await router.install_server(server_id)
-        if success:
-            print(f"Successfully installed server '{server_id}'")
-        else:
-            print(f"Failed to install server '{server_id}': {output}")
-    
-    elif args.uninstall:
-        # Uninstall a server
-        server_id = args.uninstall
-        success, output = await router.uninstall_server(server_id)
-        if success:
-            print(f"Successfully uninstalled server '{server_id}'")
-        else:
-            print(f"Failed to uninstall server '{server_id}': {output}")
-    
-    elif args.start:
-        # Start a server
-        server_id = args.start
-        success, error = await router.start_server(server_id)
-        if success:
-            print(f"Successfully started server '{server_id}'")
-        else:
-            print(f"Failed to start server '{server_id}': {error}")
-    
-    elif args.stop:
-        # Stop a server
-        server_id = args.stop
-        success, error = await router.stop_server(server_id)
-        if success:
-            print(f"Successfully stopped server '{server_id}'")
-        else:
-            print(f"Failed to stop server '{server_id}': {error}")
-    
-    elif args.status:
-        # Get server status
-        server_id = args.status
-        status = await router.get_server_status(server_id)
+    return parser.parse_args()
+
+async def _handle_list_servers(router: MCPRouter, args) -> None:
+    """List available, configured and running servers."""
+    # Fetch the three lists concurrently
+    available_servers, configured_servers, running_servers = await asyncio.gather(
+        router.list_available_servers(),
+        router.list_configured_servers(),
+        router.list_running_servers()
+    )
+    
+    # List available servers
+    print(f"Available servers ({len(available_servers)}):")
+    for server_id, info in available_servers.items():
+        print(f"  - {server_id}: {info.get('description', 'No description')}")
+    
+    # List configured servers
+    print(f"\nConfigured servers ({len(configured_servers)}):")
+    for server_id, config in configured_servers.items():
+        print(f"  - {server_id}: {config['command']} {' '.join(config.get('args', []))}")
+    
+    # List running servers
+    print(f"\nRunning servers ({len(running_servers)}):")
+    for server_id, status in running_servers.items():
         running = "RUNNING" if status["running"] else "STOPPED"
         pid = status["pid"] or "N/A"
         uptime = f"{status['uptime']:.2f}s" if status["uptime"] else "N/A"
-        memory = f"{status['memory_usage']:.2f} MB" if status["memory_usage"] else "N/A"
-        print(f"Status of server '{server_id}':")
-        print(f"  Status: {running}")
-        print(f"  PID: {pid}")
-        print(f"  Uptime: {uptime}")
-        print(f"  Memory usage: {memory}")
-        
-        if status["running"]:
-            tools = await router.get_server_tools(server_id)
-            print(f"  Tools: {len(tools)}")
-            for tool in tools:
-                print(f"    - {tool['name']}: {tool.get('description', 'No description')}")
-    
-    elif args.query:
-        # Execute a query
-        result = await router.query(args.query, model=args.model)
-        
-        # Print the conversation
-        for message in result["messages"]:
-            role = message["role"]
-            if role == "user":
-                print(f"\nUser: {message['content']}")
-            elif role == "assistant":
-                print(f"\nAssistant: {message['content']}")
-            elif role == "tool":
-                print(f"\nTool result: {message['content']}")
-        
-        print(f"\nQuery completed with {result['tool_calls']} tool calls.")
-    
-    # Close the router
-    await router.close()
+        print(f"  - {server_id}: {running} (PID: {pid}, Uptime: {uptime})")
+
+async def _handle_list_models(router: MCPRouter, args) -> None:
+    """List available OpenRouter models."""
+    models = await router.list_models()
+    print(f"Available OpenRouter models ({len(models)}):")
+    for model in models:
+        print(f"  - {model.get('id')}: {model.get('context_length')} context length")
+
+async def _handle_install(router: MCPRouter, args) -> None:
+    """Install a server."""
+    server_id = args.install
+    success, output, config = await router.install_server(server_id)
+    if success:
+        print(f"Successfully installed server '{server_id}'")
+    else:
+        print(f"Failed to install server '{server_id}': {output}")
+
+async def _handle_uninstall(router: MCPRouter, args) -> None:
+    """Uninstall a server."""
+    server_id = args.uninstall
+    success, output = await router.uninstall_server(server_id)
+    if success:
+        print(f"Successfully uninstalled server '{server_id}'")
+    else:
+        print(f"Failed to uninstall server '{server_id}': {output}")
+
+async def _handle_start(router: MCPRouter, args) -> None:
+    """Start a server."""
+    server_id = args.start
+    success, error = await router.start_server(server_id)
+    if success:
+        print(f"Successfully started server '{server_id}'")
+    else:
+        print(f"Failed to start server '{server_id}': {error}")
+
+async def _handle_stop(router: MCPRouter, args) -> None:
+    """Stop a server."""
+    server_id = args.stop
+    success, error = await router.stop_server(server_id)
+    if success:
+        print(f"Successfully stopped server '{server_id}'")
+    else:
+        print(f"Failed to stop server '{server_id}': {error}")
+
+async def _handle_status(router: MCPRouter, args) -> None:
+    """Print the status and tools of a server."""
+    server_id = args.status
+    status = await router.get_server_status(server_id)
+    running = "RUNNING" if status["running"] else "STOPPED"
+    pid = status["pid"] or "N/A"
+    uptime = f"{status['uptime']:.2f}s" if status["uptime"] else "N/A"
+    memory = f"{status['memory_usage']:.2f} MB" if status["memory_usage"] else "N/A"
+    print(f"Status of server '{server_id}':")
+    print(f"  Status: {running}")
+    print(f"  PID: {pid}")
+    print(f"  Uptime: {uptime}")
+    print(f"  Memory usage: {memory}")
+    
+    if status["running"]:
+        tools = await router.get_server_tools(server_id)
+        print(f"  Tools: {len(tools)}")
+        for tool in tools:
+            print(f"    - {tool['name']}: {tool.get('description', 'No description')}")
+
+async def _handle_query(router: MCPRouter, args) -> None:
+    """Execute a query and print the conversation."""
+    result = await router.query(args.query, model=args.model)
+    
+    # Print the conversation
+    for message in result["messages"]:
+        role = message["role"]
+        if role == "user":
+            print(f"\nUser: {message['content']}")
+        elif role == "assistant":
+            print(f"\nAssistant: {message.get('content')}")
+        elif role == "tool":
+            print(f"\nTool result: {message['content']}")
+    
+    print(f"\nQuery completed with {result['tool_calls']} tool calls.")
+
+# Command handlers in order of precedence, keyed by the argument that selects them
+HANDLERS = {
+    "list_servers": _handle_list_servers,
+    "list_models": _handle_list_models,
+    "install": _handle_install,
+    "uninstall": _handle_uninstall,
+    "start": _handle_start,
+    "stop": _handle_stop,
+    "status": _handle_status,
+    "query": _handle_query,
+}
+
+async def _run(args) -> None:
+    """Run the command selected by the parsed arguments."""
+    handler = next((handler for name, handler in HANDLERS.items() if getattr(args, name)), None)
+    if handler is None:
+        return
+    
+    # Initialize the router
+    router = MCPRouter(config_path=args.config, registry_path=args.registry)
+    try:
+        await handler(router, args)
+    finally:
+        # Close the router
+        await router.close()
 
 
 if __name__ == "__main__":
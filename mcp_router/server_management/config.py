@@ -4,30 +4,249 @@ Handles reading, parsing, and updating MCP server configurations.
 """
 
 import os
+import io
+import copy
+import functools
+import hashlib
 import json
-import yaml
-import toml
-from typing import Dict, Any, List, Optional
+import logging
+import re
+import stat
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, Union
 from pathlib import Path
 
+from ..utils.file_utils import get_user_data_dir
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional; caches parsed YAML/TOML configs in a binary companion file
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Parsed YAML/TOML config files as path -> (st_mtime_ns, st_size, config), shared
+# by all MCPServerConfig instances so unchanged files are not parsed again. JSON
+# and msgpack re-parse faster than a cached config could be deep-copied.
+_PARSE_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+# Config file suffix -> format tag; anything else is treated as JSON
+_CONFIG_FORMATS = {
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".mpack": "msgpack",
+    ".msgpack": "msgpack",
+}
+
+# Valid server ids: a letter or underscore, then up to 63 letters, digits, "_", "." or "-"
+_SERVER_ID_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_.-]{0,63}$')
+
 DEFAULT_CONFIG_PATHS = [
     "~/.mcp/config.json",
     "~/.config/mcp/config.json",
     "./mcp_config.json"
 ]
 
+@functools.lru_cache(maxsize=64)
+def _expand(path: str) -> str:
+    """Expand ~ in a path, memoized for the life of the process."""
+    return os.path.expanduser(path)
+
+def _exists(path: str) -> bool:
+    """Check that a path exists with a single stat call."""
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def _resolve_default_config() -> str:
+    """
+    Find the first existing default config file, creating one if there is none.
+    
+    Memoized, since it always returns a path that exists.
+    
+    Returns:
+        Path to the config file.
+    """
+    for path in DEFAULT_CONFIG_PATHS:
+        expanded_path = _expand(path)
+        if _exists(expanded_path):
+            return expanded_path
+    
+    # If no config file found, create a new one in the first default location
+    default_path = _expand(DEFAULT_CONFIG_PATHS[0])
+    os.makedirs(os.path.dirname(default_path), exist_ok=True)
+    
+    with open(default_path, 'wb') as f:
+        f.write(_json_dumps({"mcpServers": {}}))
+    
+    return default_path
+
+# YAML and TOML parsers are imported on first use, so JSON configs (the common
+# case) never pay for them
+
+@functools.lru_cache(maxsize=1)
+def _yaml_codec() -> Tuple[Any, Any, Any]:
+    """
+    Import the YAML parser, preferring the libyaml C bindings.
+    
+    Returns:
+        Tuple of (yaml module, loader class, dumper class).
+    """
+    import yaml
+    
+    # The pure-Python loader is several times slower than libyaml
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+    logger.debug(f"YAML configs use {'libyaml' if loader.__name__.startswith('C') else 'the pure-Python YAML parser'}")
+    return yaml, loader, dumper
+
+@functools.lru_cache(maxsize=1)
+def _toml_codec() -> Tuple[Any, Optional[Any]]:
+    """
+    Import the TOML parser: rtoml (Rust) when installed, else tomllib/tomli and tomli_w.
+    
+    Returns:
+        Tuple of (reader module, writer module or None if none is installed).
+    """
+    try:
+        import rtoml
+        return rtoml, rtoml
+    except ImportError:
+        pass
+    
+    if sys.version_info >= (3, 11):
+        import tomllib as reader
+    else:
+        import tomli as reader
+    try:
+        import tomli_w as writer
+    except ImportError:  # only needed to save TOML configs
+        writer = None
+    return reader, writer
+
+def _validate_id(server_id: str) -> None:
+    """
+    Check a server id before it is stored.
+    
+    Args:
+        server_id: Server identifier.
+        
+    Raises:
+        ValueError: If the id is not a valid server id.
+    """
+    # Plain identifiers are the common case and need no regex match
+    if isinstance(server_id, str) and server_id.isascii() and server_id.isidentifier() and len(server_id) <= 64:
+        return
+    if not isinstance(server_id, str) or not _SERVER_ID_RE.match(server_id):
+        raise ValueError(f"Invalid server id {server_id!r}: use up to 64 letters, digits, '_', '.' or '-', "
+                         f"starting with a letter or '_'")
+
+def _detect_format(path: str) -> str:
+    """Map a config path to its format tag ('json', 'yaml', 'toml' or 'msgpack')."""
+    return _CONFIG_FORMATS.get(os.path.splitext(path)[1], "json")
+
+def _companion_path(path: str) -> str:
+    """
+    Path of the msgpack copy of a YAML/TOML config.
+    
+    Copies live in the application's data directory, keyed by a hash of the
+    config's absolute path, so nothing is written next to a user-managed file.
+    """
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(get_user_data_dir(), "config-cache", f"{digest}.mpack")
+
+def _write_atomic(path: str, data: Union[bytes, Iterable[str]]) -> None:
+    """
+    Write a file by swapping in a temporary sibling, keeping the original file mode.
+    
+    The data is flushed to disk before the swap, so neither a crash nor a
+    power loss leaves a truncated or empty file behind.
+    
+    Args:
+        path: File to write.
+        data: Complete file contents, or text chunks to stream out as UTF-8.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                text = io.TextIOWrapper(f, encoding="utf-8")
+                text.writelines(data)
+                text.flush()
+                text.detach()
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _json_loads(data: str) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Reused by the stdlib fallback, so each save skips building a new encoder
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, separators=(',', ': '))
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
 class MCPServerConfig:
-    """Manages configurations for MCP servers."""
+    """
+    Manages configurations for MCP servers.
     
-    def __init__(self, config_path: Optional[str] = None):
+    Every mutation rewrites the config file unless autosave is off. Callers
+    making many changes (e.g. bulk imports) should wrap them in
+    ``with config.batch():`` so the file is written once.
+    """
+    
+    def __init__(self, config_path: Optional[str] = None, autosave: bool = True):
         """
         Initialize the configuration manager.
         
         Args:
             config_path: Path to the config file. If None, searches DEFAULT_CONFIG_PATHS.
+            autosave: Whether mutations save the config file. If False, call
+                save_config() explicitly.
         """
         self.config_path = self._find_config_file(config_path)
+        self._fmt = _detect_format(self.config_path)
         self.config = self._load_config()
+        self.autosave = autosave
+        
+        # Bound reference to the server table, so lookups skip a dict get and a
+        # throwaway default on every call
+        self._servers: Dict[str, Any] = self.config.setdefault("mcpServers", {})
+        
+        # Nesting depth of batch() blocks, and whether a save was deferred by one
+        self._batch_depth = 0
+        self._batch_dirty = False
     
     def _find_config_file(self, config_path: Optional[str] = None) -> str:
         """
@@ -42,56 +261,183 @@ class MCPServerConfig:
         Raises:
             FileNotFoundError: If no config file is found.
         """
-        if config_path and os.path.exists(os.path.expanduser(config_path)):
-            return os.path.expanduser(config_path)
+        if config_path and _exists(_expand(config_path)):
+            return _expand(config_path)
         
-        for path in DEFAULT_CONFIG_PATHS:
-            expanded_path = os.path.expanduser(path)
-            if os.path.exists(expanded_path):
-                return expanded_path
+        default_path = _resolve_default_config()
+        if not _exists(default_path):
+            # Deleted since it was resolved; search again
+            _resolve_default_config.cache_clear()
+            default_path = _resolve_default_config()
+        return default_path
+    
+    @staticmethod
+    def invalidate_cache(path: Optional[str] = None) -> None:
+        """
+        Drop parsed configs from the shared parse cache.
         
-        # If no config file found, create a new one in the first default location
-        default_path = os.path.expanduser(DEFAULT_CONFIG_PATHS[0])
-        os.makedirs(os.path.dirname(default_path), exist_ok=True)
+        Args:
+            path: Config file to forget. If None, clears the whole cache.
+        """
+        if path is None:
+            _PARSE_CACHE.clear()
+        else:
+            _PARSE_CACHE.pop(_expand(path), None)
+    
+    def _load_config(self) -> Dict[str, Any]:
+        """
+        Load the configuration file, reusing an earlier YAML/TOML parse if the file is unchanged.
         
-        with open(default_path, 'w') as f:
-            json.dump({"mcpServers": {}}, f, indent=2)
+        Returns:
+            Parsed configuration dictionary.
+        """
+        if self._fmt not in ("yaml", "toml"):
+            return self._parse_config_file()
         
-        return default_path
+        st = os.stat(self.config_path)
+        entry = _PARSE_CACHE.get(self.config_path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            # Callers mutate their config in place, so never hand out the cached dict
+            return copy.deepcopy(entry[2])
+        
+        config = self._load_companion(st)
+        if config is None:
+            config = self._parse_config_file()
+            self._write_companion(config, st)
+        _PARSE_CACHE[self.config_path] = (st.st_mtime_ns, st.st_size, config)
+        return copy.deepcopy(config)
     
-    def _load_config(self) -> Dict[str, Any]:
+    def _parse_config_file(self) -> Dict[str, Any]:
         """
-        Load the configuration file.
+        Parse the configuration file according to its format.
         
         Returns:
             Parsed configuration dictionary.
         """
-        with open(self.config_path, 'r') as f:
-            if self.config_path.endswith('.json'):
-                return json.load(f)
-            elif self.config_path.endswith('.yaml') or self.config_path.endswith('.yml'):
-                return yaml.safe_load(f)
-            elif self.config_path.endswith('.toml'):
-                return toml.load(f)
-            else:
-                # Default to JSON
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return {"mcpServers": {}}
+        # Every format is read as bytes; JSON and msgpack skip the text decoding pass
+        with open(self.config_path, 'rb') as f:
+            data = f.read()
+        
+        if self._fmt == "yaml":
+            yaml, loader, _ = _yaml_codec()
+            return yaml.load(data, Loader=loader)
+        if self._fmt == "toml":
+            reader, _ = _toml_codec()
+            return reader.loads(data.decode("utf-8"))
+        if self._fmt == "msgpack":
+            if msgpack is None:
+                raise RuntimeError("Reading msgpack configs requires the msgpack package")
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        
+        try:
+            return _json_loads(data)
+        except json.JSONDecodeError:
+            if os.path.splitext(self.config_path)[1] == ".json":
+                raise
+            # Files without a known extension fall back to an empty config
+            return {"mcpServers": {}}
+    
+    def _load_companion(self, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        """
+        Load the msgpack copy of a YAML/TOML config, if it was taken from the current file.
+        
+        Args:
+            st: Current stat of the config file.
+            
+        Returns:
+            Configuration dictionary, or None if there is no usable copy.
+        """
+        if msgpack is None or self._fmt not in ("yaml", "toml"):
+            return None
+        
+        path = _companion_path(self.config_path)
+        try:
+            with open(path, 'rb') as f:
+                mtime_ns, size, config = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable config cache {path}: {e}")
+            return None
+        
+        # The copy records the mtime and size of the file it was taken from
+        if mtime_ns != st.st_mtime_ns or size != st.st_size:
+            return None
+        return config
+    
+    def _write_companion(self, config: Dict[str, Any], st: Optional[os.stat_result] = None) -> None:
+        """
+        Store a msgpack copy of a YAML/TOML config, so later loads skip parsing it.
+        
+        Args:
+            config: Configuration matching the file on disk.
+            st: Stat of the config file, if already known.
+        """
+        if msgpack is None or self._fmt not in ("yaml", "toml"):
+            return
+        
+        path = _companion_path(self.config_path)
+        try:
+            st = st or os.stat(self.config_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, msgpack.packb([st.st_mtime_ns, st.st_size, config], use_bin_type=True))
+        except Exception as e:
+            logger.debug(f"Could not write config cache {path}: {e}")
+    
+    @contextmanager
+    def batch(self) -> Iterator["MCPServerConfig"]:
+        """
+        Group several mutations into a single write of the config file.
+        
+        Saves requested inside the block are deferred and performed once when
+        the outermost batch exits.
+        
+        Yields:
+            This configuration manager.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self.save_config()
     
     def save_config(self) -> None:
         """Save the current configuration to the config file."""
-        with open(self.config_path, 'w') as f:
-            if self.config_path.endswith('.json'):
-                json.dump(self.config, f, indent=2)
-            elif self.config_path.endswith('.yaml') or self.config_path.endswith('.yml'):
-                yaml.safe_dump(self.config, f)
-            elif self.config_path.endswith('.toml'):
-                toml.dump(self.config, f)
-            else:
-                # Default to JSON
-                json.dump(self.config, f, indent=2)
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        
+        if self._fmt == "yaml":
+            yaml, _, dumper = _yaml_codec()
+            data = yaml.dump(self.config, Dumper=dumper).encode("utf-8")
+        elif self._fmt == "toml":
+            _, writer = _toml_codec()
+            if writer is None:
+                raise RuntimeError("Saving TOML configs requires the tomli-w package")
+            data = writer.dumps(self.config).encode("utf-8")
+        elif self._fmt == "msgpack":
+            if msgpack is None:
+                raise RuntimeError("Saving msgpack configs requires the msgpack package")
+            data = msgpack.packb(self.config, use_bin_type=True)
+        else:
+            # JSON, also the default
+            # Without orjson, stream the encoder's chunks instead of building one big string
+            data = _json_dumps(self.config) if orjson is not None else _JSON_ENCODER.iterencode(self.config)
+        
+        try:
+            _write_atomic(self.config_path, data)
+        finally:
+            self.invalidate_cache(self.config_path)
+        
+        self._write_companion(self.config)
+    
+    def _autosave(self) -> None:
+        """Save after a mutation, if autosave is on (deferred inside batch())."""
+        if self.autosave:
+            self.save_config()
     
     def get_server_config(self, server_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -103,7 +449,7 @@ class MCPServerConfig:
         Returns:
             Server configuration dictionary, or None if not found.
         """
-        return self.config.get("mcpServers", {}).get(server_id)
+        return self._servers.get(server_id)
     
     def get_all_servers(self) -> Dict[str, Any]:
         """
@@ -112,7 +458,7 @@ class MCPServerConfig:
         Returns:
             Dictionary of server configurations.
         """
-        return self.config.get("mcpServers", {})
+        return self._servers
     
     def add_server(self, server_id: str, command: str, args: List[str] = None, env: Dict[str, str] = None) -> None:
         """
@@ -123,17 +469,18 @@ class MCPServerConfig:
             command: Command to start the server.
             args: List of command arguments.
             env: Dictionary of environment variables.
+            
+        Raises:
+            ValueError: If the server id is invalid.
         """
-        if "mcpServers" not in self.config:
-            self.config["mcpServers"] = {}
-        
-        self.config["mcpServers"][server_id] = {
+        _validate_id(server_id)
+        self._servers[server_id] = {
             "command": command,
             "args": args or [],
             "env": env or {}
         }
         
-        self.save_config()
+        self._autosave()
     
     def update_server(self, server_id: str, command: Optional[str] = None, 
                       args: Optional[List[str]] = None, env: Optional[Dict[str, str]] = None) -> None:
@@ -149,10 +496,10 @@ class MCPServerConfig:
         Raises:
             KeyError: If the server does not exist.
         """
-        if "mcpServers" not in self.config or server_id not in self.config["mcpServers"]:
+        if server_id not in self._servers:
             raise KeyError(f"Server '{server_id}' does not exist in configuration")
         
-        server_config = self.config["mcpServers"][server_id]
+        server_config = self._servers[server_id]
         
         if command:
             server_config["command"] = command
@@ -163,7 +510,7 @@ class MCPServerConfig:
         if env is not None:
             server_config["env"] = env
         
-        self.save_config()
+        self._autosave()
     
     def remove_server(self, server_id: str) -> None:
         """
@@ -175,11 +522,11 @@ class MCPServerConfig:
         Raises:
             KeyError: If the server does not exist.
         """
-        if "mcpServers" not in self.config or server_id not in self.config["mcpServers"]:
+        if server_id not in self._servers:
             raise KeyError(f"Server '{server_id}' does not exist in configuration")
         
-        del self.config["mcpServers"][server_id]
-        self.save_config()
+        del self._servers[server_id]
+        self._autosave()
     
     def merge_config(self, new_config: Dict[str, Any]) -> None:
         """
@@ -189,13 +536,10 @@ class MCPServerConfig:
             new_config: New configuration to merge.
         """
         if "mcpServers" in new_config:
-            if "mcpServers" not in self.config:
-                self.config["mcpServers"] = {}
-            
-            for server_id, server_config in new_config["mcpServers"].items():
-                self.config["mcpServers"][server_id] = server_config
+            # Mutate in place and save once, however many servers are merged
+            self._servers.update(new_config["mcpServers"])
         
-        self.save_config()
+        self._autosave()
 
 
 # Example usage
@@ -3,17 +3,44 @@ MCP server installer.
 Handles downloading, installing, and configuring MCP servers.
 """
 
+import io
 import os
 import json
+import time
+import hashlib
+import functools
+import urllib.error
 import shutil
 import subprocess
-import tempfile
 import logging
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Tuple, Union
-import yaml
 from pathlib import Path
 
+from .config import _validate_id
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; used to stream registries when orjson is missing
+    ijson = None
+
+try:
+    import urllib3
+    from urllib3.util.retry import Retry
+except ImportError:  # optional; pooled connections for remote registries, else urllib
+    urllib3 = None
+
+try:
+    import xxhash
+except ImportError:  # optional; faster content hashing for the registry parse cache
+    xxhash = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -25,13 +52,80 @@ REGISTRY_URLS = [
     "https://raw.githubusercontent.com/BigSweetPotatoStudio/HyperChatMCP/main/registry.json"
 ]
 
+# Per-request timeout for remote registries, so one slow mirror cannot stall loading (seconds)
+REGISTRY_FETCH_TIMEOUT = 5.0
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Resolve an executable on PATH once per process; None if it is not found."""
+    return shutil.which(name)
+
+def _copy_entry(entry: Any) -> Any:
+    """Copy a registry entry for a caller, with its own args list and env dict."""
+    if not isinstance(entry, dict):
+        return entry
+    copy = dict(entry)
+    if isinstance(copy.get("args"), (list, tuple)):
+        copy["args"] = list(copy["args"])
+    if isinstance(copy.get("env"), dict):
+        copy["env"] = dict(copy["env"])
+    return copy
+
+def _content_hash(data: bytes) -> str:
+    """Hash raw registry bytes to detect unchanged content, using xxhash when available."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _local_config_servers(data: bytes) -> Dict[str, Any]:
+    """Convert the mcpServers section of a raw MCP config into registry entries."""
+    config = _json_loads(data)
+    # Build the whole mapping in one comprehension, converting to registry format
+    return {
+        server_id: {
+            "id": server_id,
+            "name": server_id,
+            "description": f"MCP server: {server_id}",
+            "command": server_config.get("command", ""),
+            "args": server_config.get("args", []),
+            "env": server_config.get("env", {}),
+            "source": "local_config"
+        }
+        for server_id, server_config in config.get("mcpServers", {}).items()
+    }
+
+def _registry_servers(data: bytes) -> Dict[str, Any]:
+    """
+    Extract the "servers" mapping from a raw registry document.
+    
+    orjson parses the bytes directly; otherwise ijson streams just the servers
+    object instead of decoding the whole body to a str first.
+    """
+    if orjson is None and ijson is not None:
+        return dict(ijson.kvitems(io.BytesIO(data), "servers", use_float=True))
+    return _json_loads(data).get("servers", {})
+
 class MCPServerInstaller:
     """Handles installation of MCP servers."""
     
     def __init__(self, install_dir: str = "~/.mcp/servers", 
                  registry_path: Optional[str] = None,
                  registry_urls: Optional[List[str]] = None,
-                 config_path: Optional[str] = "~/.mcp/config.json"):
+                 config_path: Optional[str] = "~/.mcp/config.json",
+                 cache_dir: str = "~/.mcp/cache",
+                 max_age: float = 0.0):
         """
         Initialize the installer.
         
@@ -40,6 +134,9 @@ class MCPServerInstaller:
             registry_path: Path to a local registry file.
             registry_urls: URLs to download registry files from.
             config_path: Path to the MCP config file.
+            cache_dir: Directory for cached copies of remote registries.
+            max_age: Age in seconds below which a cached remote registry is used
+                without contacting the server. 0 always revalidates.
         """
         self.install_dir = os.path.expanduser(install_dir)
         os.makedirs(self.install_dir, exist_ok=True)
@@ -47,6 +144,17 @@ class MCPServerInstaller:
         self.registry_path = registry_path
         self.registry_urls = registry_urls or REGISTRY_URLS
         self.config_path = os.path.expanduser(config_path) if config_path else None
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_age = max_age
+        
+        # Shared connection pool, so refreshes reuse TLS connections to registry hosts
+        self._http = None
+        if urllib3 is not None:
+            self._http = urllib3.PoolManager(num_pools=4, maxsize=4, retries=Retry(total=2, backoff_factor=0.2))
+        
+        # Parsed servers per registry source, as source -> (content hash, servers),
+        # so a refresh only re-parses sources whose bytes changed
+        self._registry_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
         self.registry: Dict[str, Any] = self._load_registry()
     
     def _load_registry(self) -> Dict[str, Any]:
@@ -58,62 +166,180 @@ class MCPServerInstaller:
         """
         registry = {"servers": {}}
         
-        # Load from local config file first if it exists
-        if self.config_path and os.path.exists(self.config_path):
+        # Load from local config file first if it exists (a missing file is not an error)
+        if self.config_path:
             try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    # Extract server definitions from mcpServers section
-                    if "mcpServers" in config:
-                        for server_id, server_config in config["mcpServers"].items():
-                            # Convert to registry format
-                            registry["servers"][server_id] = {
-                                "id": server_id,
-                                "name": server_id,
-                                "description": f"MCP server: {server_id}",
-                                "command": server_config.get("command", ""),
-                                "args": server_config.get("args", []),
-                                "env": server_config.get("env", {}),
-                                "source": "local_config"
-                            }
+                with open(self.config_path, 'rb') as f:
+                    registry["servers"].update(self._parse_cached(self.config_path, f.read(), _local_config_servers))
                 logger.info(f"Loaded server configurations from {self.config_path}")
+            except FileNotFoundError:
+                pass
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Error loading config from {self.config_path}: {e}")
         
         # Load local registry if specified
-        if self.registry_path and os.path.exists(self.registry_path):
+        if self.registry_path:
             try:
-                with open(self.registry_path, 'r') as f:
-                    local_registry = json.load(f)
-                    registry["servers"].update(local_registry.get("servers", {}))
+                with open(self.registry_path, 'rb') as f:
+                    registry["servers"].update(self._parse_cached(self.registry_path, f.read(), _registry_servers))
                 logger.info(f"Loaded server registry from {self.registry_path}")
+            except FileNotFoundError:
+                pass
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Error loading registry from {self.registry_path}: {e}")
         
-        # Load remote registries
-        for url in self.registry_urls:
-            try:
-                with urllib.request.urlopen(url) as response:
-                    remote_registry = json.loads(response.read().decode('utf-8'))
-                    registry["servers"].update(remote_registry.get("servers", {}))
-                logger.info(f"Loaded server registry from {url}")
-            except Exception as e:
-                logger.warning(f"Error loading registry from {url}: {e}")
+        # Load remote registries concurrently, merging them in URL order so later
+        # registries still take precedence
+        if self.registry_urls:
+            with ThreadPoolExecutor(max_workers=len(self.registry_urls)) as executor:
+                futures = [(url, executor.submit(self._fetch_registry, url)) for url in self.registry_urls]
+                for url, future in futures:
+                    try:
+                        registry["servers"].update(self._parse_cached(url, future.result(), _registry_servers))
+                        logger.info(f"Loaded server registry from {url}")
+                    except Exception as e:
+                        logger.warning(f"Error loading registry from {url}: {e}")
         
         return registry
     
+    def _parse_cached(self, source: str, data: bytes, parse) -> Dict[str, Any]:
+        """
+        Parse a registry source, reusing the previous result if its bytes are unchanged.
+        
+        Args:
+            source: Path or URL identifying the source.
+            data: Raw contents of the source.
+            parse: Function turning the raw contents into a servers mapping.
+            
+        Returns:
+            Servers mapping for the source.
+        """
+        digest = _content_hash(data)
+        cached = self._registry_cache.get(source)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+        
+        servers = parse(data)
+        self._registry_cache[source] = (digest, servers)
+        return servers
+    
+    def _fetch_registry(self, url: str) -> bytes:
+        """
+        Download a remote registry file, revalidating a cached copy with a conditional GET.
+        
+        Args:
+            url: URL of the registry.
+            
+        Returns:
+            Raw registry contents.
+        """
+        base = os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+        body_path, meta_path = f"{base}.json", f"{base}.meta"
+        
+        # Load the cached copy and its validators, if any
+        meta: Dict[str, Any] = {}
+        cached = None
+        try:
+            with open(meta_path, 'rb') as f:
+                meta = _json_loads(f.read())
+            with open(body_path, 'rb') as f:
+                cached = f.read()
+        except (OSError, ValueError):
+            meta, cached = {}, None
+        
+        if cached is not None and time.time() - meta.get("fetched_at", 0) < self.max_age:
+            return cached
+        
+        request_headers = {}
+        if cached is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+        
+        try:
+            status, body, headers = self._http_get(url, request_headers)
+            if status != 304 and status >= 400:
+                raise OSError(f"HTTP Error {status} fetching {url}")
+        except OSError as e:
+            if cached is None:
+                raise
+            logger.warning(f"Using cached registry for {url}: {e}")
+            return cached
+        
+        if status == 304 and cached is not None:
+            # Not modified: keep the cached copy and restart its max_age clock
+            meta["fetched_at"] = time.time()
+            self._write_cache_file(meta_path, _json_dumps(meta))
+            return cached
+        
+        self._write_cache_file(body_path, body)
+        self._write_cache_file(meta_path, _json_dumps({
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time()
+        }))
+        return body
+    
+    def _http_get(self, url: str, headers: Dict[str, str]) -> Tuple[int, bytes, Any]:
+        """
+        Perform a GET request, through the shared urllib3 pool when available.
+        
+        Args:
+            url: URL to fetch.
+            headers: Request headers.
+            
+        Returns:
+            Tuple of (status code, body, response headers).
+            
+        Raises:
+            OSError: If the request fails before a response arrives.
+        """
+        if self._http is not None:
+            try:
+                # urllib3 decodes compressed bodies, so let the server send them
+                response = self._http.request("GET", url, headers=dict(headers, **{"Accept-Encoding": "gzip, deflate"}),
+                                              timeout=REGISTRY_FETCH_TIMEOUT)
+            except urllib3.exceptions.HTTPError as e:
+                raise OSError(str(e)) from e
+            return response.status, response.data, response.headers
+        
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=REGISTRY_FETCH_TIMEOUT) as response:
+                return response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            return e.code, b"", e.headers
+    
+    def _write_cache_file(self, path: str, data: bytes) -> None:
+        """Atomically write a registry cache file, ignoring failures."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write registry cache {path}: {e}")
+    
     def refresh_registry(self) -> None:
         """Refresh the registry from remote sources."""
         self.registry = self._load_registry()
+        self.__dict__.pop("_server_index", None)
+    
+    @functools.cached_property
+    def _server_index(self) -> Dict[str, Any]:
+        """Server entries keyed by id, resolved once per registry load."""
+        return self.registry.get("servers", {})
     
     def get_available_servers(self) -> Dict[str, Any]:
         """
         Get the list of available servers in the registry.
         
         Returns:
-            Dictionary of available servers.
+            Dictionary of available servers; a copy the caller may modify.
         """
-        return self.registry.get("servers", {})
+        return {server_id: _copy_entry(entry) for server_id, entry in self._server_index.items()}
     
     def get_server_info(self, server_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -123,17 +349,21 @@ class MCPServerInstaller:
             server_id: Server identifier.
             
         Returns:
-            Server information dictionary, or None if not found.
+            Server information dictionary (a copy the caller may modify), or None if not found.
         """
-        return self.registry.get("servers", {}).get(server_id)
+        return _copy_entry(self._server_index.get(server_id))
     
-    def _execute_command(self, command: List[str], env: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
+    def _execute_command(self, command: List[str], env: Optional[Dict[str, str]] = None,
+                         capture: bool = True, stdin: Optional[str] = None) -> Tuple[bool, str]:
         """
         Execute a shell command.
         
         Args:
             command: Command and arguments.
             env: Environment variables.
+            capture: Whether to collect the command's output. When False, stdout is
+                discarded and only stderr is kept, to report failures.
+            stdin: Optional text to feed to the command's standard input.
             
         Returns:
             Tuple of (success, output).
@@ -143,17 +373,26 @@ class MCPServerInstaller:
             if env:
                 process_env.update(env)
             
+            # Resolve bare program names once instead of searching PATH on every call
+            if os.sep not in command[0]:
+                resolved = _which(command[0])
+                if resolved:
+                    command = [resolved] + list(command[1:])
+            
+            # Collect raw bytes and decode once at the end
             process = subprocess.run(
                 command,
+                input=stdin.encode("utf-8") if stdin is not None else None,
                 env=process_env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
+                stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                stderr=subprocess.STDOUT if capture else subprocess.PIPE,
+                bufsize=-1,
                 check=True
             )
-            return True, process.stdout
+            return True, (process.stdout or b"").decode("utf-8", errors="replace")
         except subprocess.CalledProcessError as e:
-            return False, e.stdout
+            output = e.stdout if capture else e.stderr
+            return False, (output or b"").decode("utf-8", errors="replace")
         except Exception as e:
             return False, str(e)
     
@@ -196,8 +435,14 @@ class MCPServerInstaller:
         Returns:
             Tuple of (success, output, server_config).
         """
-        # Get server information from registry
-        server_info = self.get_server_info(server_id)
+        # Reject ids the configuration would refuse before doing any installation work
+        try:
+            _validate_id(server_id)
+        except ValueError as e:
+            return False, str(e), None
+        
+        # Get server information from registry; only read here, so skip the copy
+        server_info = self._server_index.get(server_id)
         if not server_info:
             return False, f"Server '{server_id}' not found in registry", None
         
@@ -227,7 +472,8 @@ class MCPServerInstaller:
             if not image_name:
                 return False, f"No image name specified for server '{server_id}'", None
             
-            success, output = self._execute_command(["docker", "pull", image_name])
+            # Pull progress is noise; keep only stderr for error reporting
+            success, output = self._execute_command(["docker", "pull", image_name], capture=False)
         
         else:
             return False, f"Unsupported installation type '{install_type}' for server '{server_id}'", None
@@ -242,12 +488,8 @@ class MCPServerInstaller:
         # If there's a post-install script, run it
         if "post_install_script" in server_info:
             script = server_info["post_install_script"]
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-                f.write(script)
-            
-            os.chmod(f.name, 0o755)
-            post_success, post_output = self._execute_command([f.name])
-            os.unlink(f.name)
+            # Feed the script to bash on stdin rather than staging it in a temp file
+            post_success, post_output = self._execute_command(["bash", "-s"], stdin=script)
             
             if not post_success:
                 logger.warning(f"Post-install script failed for server '{server_id}': {post_output}")
@@ -268,11 +510,12 @@ class MCPServerInstaller:
         Returns:
             Server configuration dictionary.
         """
-        # Start with the base configuration from server_info
+        # Start with the base configuration from server_info. Registry args and env
+        # are shared with the registry, so take copies for the stored configuration
         config = {
             "command": server_info.get("command", ""),
-            "args": server_info.get("args", []),
-            "env": server_info.get("env", {})
+            "args": list(server_info.get("args", ())),
+            "env": dict(server_info.get("env", {}))
         }
         
         # Apply any config overrides
@@ -281,7 +524,7 @@ class MCPServerInstaller:
                 config["command"] = config_overrides["command"]
             
             if "args" in config_overrides:
-                config["args"] = config_overrides["args"]
+                config["args"] = list(config_overrides["args"])
             
             if "env" in config_overrides:
                 config["env"].update(config_overrides["env"])
@@ -298,8 +541,8 @@ class MCPServerInstaller:
         Returns:
             Tuple of (success, output).
         """
-        # Get server information from registry
-        server_info = self.get_server_info(server_id)
+        # Get server information from registry; only read here, so skip the copy
+        server_info = self._server_index.get(server_id)
         if not server_info:
             return False, f"Server '{server_id}' not found in registry"
         
@@ -335,12 +578,8 @@ class MCPServerInstaller:
         # If there's a post-uninstall script, run it
         if "post_uninstall_script" in server_info:
             script = server_info["post_uninstall_script"]
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-                f.write(script)
-            
-            os.chmod(f.name, 0o755)
-            post_success, post_output = self._execute_command([f.name])
-            os.unlink(f.name)
+            # Feed the script to bash on stdin rather than staging it in a temp file
+            post_success, post_output = self._execute_command(["bash", "-s"], stdin=script)
             
             if not post_success:
                 logger.warning(f"Post-uninstall script failed for server '{server_id}': {post_output}")
@@ -369,11 +608,15 @@ class MCPServerInstaller:
         save_path = save_path or os.path.expanduser("~/.mcp/custom_registry.json")
         
         try:
+            _validate_id(server_id)
+            
             # Load existing registry if it exists
             existing_registry = {"servers": {}}
-            if os.path.exists(save_path):
-                with open(save_path, 'r') as f:
-                    existing_registry = json.load(f)
+            try:
+                with open(save_path, 'rb') as f:
+                    existing_registry = _json_loads(f.read())
+            except FileNotFoundError:
+                pass
             
             # Add or update the server entry
             if "servers" not in existing_registry:
@@ -383,8 +626,8 @@ class MCPServerInstaller:
             
             # Save the registry
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            with open(save_path, 'w') as f:
-                json.dump(existing_registry, f, indent=2)
+            with open(save_path, 'wb') as f:
+                f.write(_json_dumps(existing_registry))
             
             # Update our registry
             if not self.registry_path:
@@ -4,31 +4,201 @@ Handles starting, stopping, and checking the status of MCP servers.
 """
 
 import os
+import asyncio
+import errno
+import re
+import selectors
+import shutil
 import signal
 import subprocess
+import threading
 import time
 import psutil
-from typing import Dict, Any, Optional, Tuple, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, List, Callable
 import json
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Library module: leave handler and level configuration to the application
 logger = logging.getLogger(__name__)
 
+# get_all_servers_status checks up to this many servers serially before using threads,
+# and uses at most STATUS_POOL_WORKERS threads for larger sets
+STATUS_SERIAL_LIMIT = 2
+STATUS_POOL_WORKERS = 8
+
+# Bytes moved per splice() call when copying server output into log files
+LOG_CHUNK_SIZE = 1 << 20
+
+# Seconds a stopping server may take in total, of which the last SIGKILL_WAIT
+# follow escalation to SIGKILL; exit waits wake as soon as the process is gone
+STOP_TIMEOUT = 5
+SIGKILL_WAIT = 1
+
+# Most recent stdout lines kept in memory per server
+STDOUT_TAIL_LINES = 200
+
+# A stdout line matching this means the server is ready
+_READY_RE = re.compile(r"Server started|Listening")
+
+class _JoinedArgs:
+    """Command-line arguments joined with spaces only when a log record is formatted."""
+    
+    __slots__ = ("args",)
+    
+    def __init__(self, args: Optional[List[str]]):
+        self.args = args
+    
+    def __str__(self) -> str:
+        return " ".join(self.args or [])
+
+def _pump_to_log(src_fd: int, log_path: str) -> None:
+    """
+    Copy everything written to a pipe into a log file until the writer closes it.
+    
+    Uses os.splice() where available so the data is moved between the pipe and
+    the page cache inside the kernel, falling back to os.read/os.write when the
+    platform or target file doesn't support it.
+    
+    Args:
+        src_fd: Read end of the pipe.
+        log_path: Path of the log file to append to.
+    """
+    # splice() rejects O_APPEND targets, so seek to the end instead
+    dst_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.lseek(dst_fd, 0, os.SEEK_END)
+        splice = getattr(os, "splice", None)
+        while True:
+            if splice is not None:
+                try:
+                    copied = splice(src_fd, dst_fd, LOG_CHUNK_SIZE,
+                                    flags=os.SPLICE_F_MOVE | os.SPLICE_F_MORE)
+                except OSError as e:
+                    if e.errno != errno.EINVAL:
+                        raise
+                    splice = None
+                    continue
+            else:
+                data = os.read(src_fd, 65536)
+                copied = len(data)
+                if copied:
+                    os.write(dst_fd, data)
+            
+            if copied == 0:
+                break
+    except OSError as e:
+        # The pipe is closed once the process handle is released
+        logger.debug("Stopped capturing output to %s: %s", log_path, e)
+    finally:
+        os.close(dst_fd)
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """
+    Open a pidfd for a process (Linux 5.3+, Python 3.9+).
+    
+    Args:
+        pid: Process ID.
+        
+    Returns:
+        File descriptor that becomes readable when the process exits, or None
+        if pidfds are not supported.
+        
+    Raises:
+        ProcessLookupError: If the process does not exist.
+    """
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return pidfd_open(pid)
+    except ProcessLookupError:
+        raise
+    except OSError:
+        return None
+
+def _send_signal(pid: int, pidfd: Optional[int], sig: int) -> None:
+    """Signal a process through its pidfd when there is one, else by PID."""
+    if pidfd is not None:
+        signal.pidfd_send_signal(pidfd, sig)
+    else:
+        os.kill(pid, sig)
+
+def _watch_ready(stream, started: threading.Event, on_done: Callable[[], None],
+                 tail: deque) -> None:
+    """
+    Drain a server's stdout into a buffer for as long as the stream stays open.
+    
+    Reading continues after the readiness line so a chatty server never blocks
+    on a full stdout pipe.
+    
+    Args:
+        stream: The server's stdout.
+        started: Set when a "Server started" or "Listening" line is seen.
+        on_done: Called once, on readiness or when the stream closes before it.
+        tail: Receives every line read; bounded, so only the latest are kept.
+    """
+    try:
+        for line in stream:
+            tail.append(line)
+            if not started.is_set() and _READY_RE.search(line):
+                started.set()
+                on_done()
+    except (OSError, ValueError):
+        pass
+    finally:
+        if not started.is_set():
+            on_done()
+
 class MCPServerLifecycle:
     """Manages the lifecycle of MCP servers."""
     
-    def __init__(self, pid_dir: str = "~/.mcp/pids"):
+    def __init__(self, pid_dir: str = "~/.mcp/pids", log_dir: str = "~/.mcp/logs"):
         """
         Initialize the lifecycle manager.
         
         Args:
             pid_dir: Directory to store PID files.
+            log_dir: Directory to store server log files.
         """
         self.pid_dir = os.path.expanduser(pid_dir)
         os.makedirs(self.pid_dir, exist_ok=True)
+        self.log_dir = os.path.expanduser(log_dir)
+        os.makedirs(self.log_dir, exist_ok=True)
+        
+        # Directory prefixes for PID and log paths, so building them is a plain f-string
+        self._pid_dir_prefix = os.path.join(self.pid_dir, "")
+        self._log_dir_prefix = os.path.join(self.log_dir, "")
         self.active_processes: Dict[str, subprocess.Popen] = {}
+        
+        # Latest stdout lines per server, filled by the reader started in _watch_start
+        self._stdout_tails: Dict[str, deque] = {}
+        
+        # psutil handles per server, reused until the server's PID changes; a
+        # handle's is_running() still detects PID reuse via the create time
+        self._psutil_cache: Dict[str, psutil.Process] = {}
+        
+        # Guards active_processes and _psutil_cache, which status threads update
+        # alongside the caller's thread
+        self._state_lock = threading.Lock()
+        
+        # Threads for get_all_servers_status, created on first use and reused
+        self._status_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Environment template shared by every server start; per-server variables are
+        # overlaid on it instead of copying os.environ for each spawn
+        self._base_env: Dict[str, str] = {}
+        self.refresh_environment()
+    
+    def refresh_environment(self) -> None:
+        """Re-read os.environ into the environment template used for new servers."""
+        self._base_env = dict(os.environ)
     
     def _get_pid_file(self, server_id: str) -> str:
         """
@@ -40,7 +210,49 @@ class MCPServerLifecycle:
         Returns:
             Path to the PID file.
         """
-        return os.path.join(self.pid_dir, f"{server_id}.pid")
+        return f"{self._pid_dir_prefix}{server_id}.pid"
+    
+    def _get_log_file(self, server_id: str) -> str:
+        """
+        Get the path to the log file for a server.
+        
+        Args:
+            server_id: Server identifier.
+            
+        Returns:
+            Path to the log file.
+        """
+        return f"{self._log_dir_prefix}{server_id}.log"
+    
+    def _capture_stderr(self, server_id: str, process: subprocess.Popen) -> None:
+        """
+        Drain a started server's stderr into its log file from a background thread.
+        
+        Keeps the server from blocking on a full stderr pipe once nobody reads it.
+        
+        Args:
+            server_id: Server identifier.
+            process: The server process.
+        """
+        if not process.stderr:
+            return
+        
+        stderr_fd = process.stderr.fileno()
+        
+        # Enlarge the pipe so chatty servers are moved in fewer, larger chunks (Linux only)
+        set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None) if fcntl is not None else None
+        if set_pipe_size is not None:
+            try:
+                fcntl.fcntl(stderr_fd, set_pipe_size, LOG_CHUNK_SIZE)
+            except OSError:
+                pass
+        
+        threading.Thread(
+            target=_pump_to_log,
+            args=(stderr_fd, self._get_log_file(server_id)),
+            name=f"mcp-log-{server_id}",
+            daemon=True
+        ).start()
     
     def _write_pid_file(self, server_id: str, pid: int) -> None:
         """
@@ -50,8 +262,13 @@ class MCPServerLifecycle:
             server_id: Server identifier.
             pid: Process ID.
         """
-        with open(self._get_pid_file(server_id), 'w') as f:
-            f.write(str(pid))
+        with self._state_lock:
+            self._psutil_cache.pop(server_id, None)
+        fd = os.open(self._get_pid_file(server_id), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, str(pid).encode("ascii"))
+        finally:
+            os.close(fd)
     
     def _read_pid_file(self, server_id: str) -> Optional[int]:
         """
@@ -63,15 +280,19 @@ class MCPServerLifecycle:
         Returns:
             Process ID, or None if the file doesn't exist.
         """
-        pid_file = self._get_pid_file(server_id)
-        if not os.path.exists(pid_file):
+        # Raw descriptor and bytes: int() parses (and strips) bytes directly,
+        # so no text wrapper or decode is needed; a missing file is an OSError
+        try:
+            fd = os.open(self._get_pid_file(server_id), os.O_RDONLY)
+        except OSError:
             return None
         
         try:
-            with open(pid_file, 'r') as f:
-                return int(f.read().strip())
-        except (IOError, ValueError):
+            return int(os.read(fd, 32))
+        except (OSError, ValueError):
             return None
+        finally:
+            os.close(fd)
     
     def _remove_pid_file(self, server_id: str) -> None:
         """
@@ -80,26 +301,184 @@ class MCPServerLifecycle:
         Args:
             server_id: Server identifier.
         """
+        with self._state_lock:
+            self._psutil_cache.pop(server_id, None)
         pid_file = self._get_pid_file(server_id)
         if os.path.exists(pid_file):
             os.remove(pid_file)
     
-    def _is_process_running(self, pid: int) -> bool:
+    def _get_proc(self, server_id: str, pid: int) -> psutil.Process:
+        """
+        Get the psutil handle for a server's process, creating it only when the PID changes.
+        
+        Args:
+            server_id: Server identifier.
+            pid: Process ID.
+            
+        Returns:
+            psutil process handle.
+            
+        Raises:
+            psutil.NoSuchProcess: If the process does not exist.
+        """
+        with self._state_lock:
+            proc = self._psutil_cache.get(server_id)
+        if proc is None or proc.pid != pid:
+            proc = psutil.Process(pid)
+            with self._state_lock:
+                self._psutil_cache[server_id] = proc
+        return proc
+    
+    def _is_process_running(self, pid: int, server_id: Optional[str] = None) -> bool:
         """
         Check if a process is running.
         
         Args:
             pid: Process ID.
+            server_id: Server the process belongs to, to reuse its cached handle.
             
         Returns:
             True if the process is running, False otherwise.
         """
         try:
             # Check if the process exists
-            process = psutil.Process(pid)
-            return process.is_running()
+            process = self._get_proc(server_id, pid) if server_id else psutil.Process(pid)
+            if process.is_running():
+                return True
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            return False
+            pass
+        if server_id:
+            with self._state_lock:
+                self._psutil_cache.pop(server_id, None)
+        return False
+    
+    def _wait_for_exit(self, server_id: str, pid: int, pidfd: Optional[int], timeout: float) -> bool:
+        """
+        Wait for a process to exit.
+        
+        Sleeps in the kernel on the process's pidfd when there is one, and polls
+        the process otherwise.
+        
+        Args:
+            server_id: Server identifier.
+            pid: Process ID.
+            pidfd: pidfd of the process, or None.
+            timeout: Maximum time to wait (seconds).
+            
+        Returns:
+            True if the process exited, False on timeout.
+        """
+        if pidfd is not None:
+            with selectors.DefaultSelector() as selector:
+                selector.register(pidfd, selectors.EVENT_READ)
+                return bool(selector.select(timeout))
+        
+        deadline = time.monotonic() + timeout
+        while self._is_process_running(pid, server_id):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def _spawn(self, server_id: str, command: str, args: Optional[List[str]],
+               env: Optional[Dict[str, str]]) -> subprocess.Popen:
+        """
+        Launch a server process and record it.
+        
+        Args:
+            server_id: Server identifier.
+            command: Command to start the server.
+            args: Command arguments.
+            env: Environment variables.
+            
+        Returns:
+            The server process.
+        """
+        # Set up the environment; the shared template is never mutated
+        process_env = {**self._base_env, **env} if env else self._base_env
+        
+        # Start the server
+        logger.info("Starting MCP server '%s': %s %s", server_id, command, _JoinedArgs(args))
+        # Resolving the executable up front and keeping close_fds off lets
+        # subprocess use posix_spawn (vfork) instead of fork+exec, avoiding a
+        # page-table copy of this process. Python-created fds are non-inheritable
+        # by default, so the child still only receives its stdio pipes.
+        executable = shutil.which(command, path=process_env.get("PATH")) or command
+        process = subprocess.Popen(
+            [executable] + (args or []),
+            env=process_env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False
+        )
+        
+        # Store the process
+        with self._state_lock:
+            self.active_processes[server_id] = process
+        
+        # Write the PID file
+        self._write_pid_file(server_id, process.pid)
+        return process
+    
+    def _watch_start(self, server_id: str, process: subprocess.Popen,
+                     on_done: Callable[[], None]) -> threading.Event:
+        """
+        Watch a starting server's stdout for its readiness line from a helper thread.
+        
+        The thread keeps draining stdout afterwards; see get_server_output().
+        
+        Args:
+            server_id: Server identifier.
+            process: The server process.
+            on_done: Called from the helper thread when it stops reading.
+            
+        Returns:
+            Event that is set once the server reports readiness.
+        """
+        started = threading.Event()
+        tail = self._stdout_tails[server_id] = deque(maxlen=STDOUT_TAIL_LINES)
+        if process.stdout:
+            threading.Thread(
+                target=_watch_ready,
+                args=(process.stdout, started, on_done, tail),
+                name=f"mcp-ready-{server_id}",
+                daemon=True
+            ).start()
+        return started
+    
+    def _finish_start(self, server_id: str, process: subprocess.Popen, started: bool) -> Tuple[bool, Optional[str]]:
+        """
+        Decide the outcome of a server start once waiting is over.
+        
+        Args:
+            server_id: Server identifier.
+            process: The server process.
+            started: Whether the server reported readiness.
+            
+        Returns:
+            Tuple of (success, error_message).
+        """
+        if started:
+            logger.info("MCP server '%s' started successfully", server_id)
+            self._capture_stderr(server_id, process)
+            return True, None
+        
+        if process.poll() is not None:
+            # Process has exited early, which likely indicates an error
+            try:
+                _, stderr = process.communicate(timeout=1)
+            except (subprocess.TimeoutExpired, ValueError):
+                stderr = ""
+            error_msg = f"Server failed to start: {stderr}"
+            logger.error(error_msg)
+            self._remove_pid_file(server_id)
+            return False, error_msg
+        
+        # We've waited long enough, assume the server is running
+        logger.info("MCP server '%s' start timeout exceeded, assuming it's running", server_id)
+        self._capture_stderr(server_id, process)
+        return True, None
     
     def start_server(self, server_id: str, command: str, args: List[str] = None, 
                      env: Dict[str, str] = None, wait_time: int = 5) -> Tuple[bool, Optional[str]]:
@@ -118,61 +497,84 @@ class MCPServerLifecycle:
         """
         # Check if the server is already running
         pid = self._read_pid_file(server_id)
-        if pid and self._is_process_running(pid):
+        if pid and self._is_process_running(pid, server_id):
             return True, None  # Server is already running
         
         # Remove stale PID file if it exists
         self._remove_pid_file(server_id)
         
         try:
-            # Set up the environment
-            process_env = os.environ.copy()
-            if env:
-                process_env.update(env)
-            
-            # Start the server
-            logger.info(f"Starting MCP server '{server_id}': {command} {' '.join(args or [])}")
-            process = subprocess.Popen(
-                [command] + (args or []),
-                env=process_env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Store the process
-            self.active_processes[server_id] = process
+            process = self._spawn(server_id, command, args, env)
             
-            # Write the PID file
-            self._write_pid_file(server_id, process.pid)
-            
-            # Wait for the server to start
-            start_time = time.time()
-            while time.time() - start_time < wait_time:
-                if not self._is_process_running(process.pid):
-                    # Process has exited early, which likely indicates an error
-                    stdout, stderr = process.communicate(timeout=1)
-                    error_msg = f"Server failed to start: {stderr}"
-                    logger.error(error_msg)
-                    self._remove_pid_file(server_id)
-                    return False, error_msg
-                
-                # Check if the process has output that we can read
+            # Wait for the server to report readiness, close its stdout or time out
+            done = threading.Event()
+            started = self._watch_start(server_id, process, done.set)
+            done.wait(wait_time)
+            
+            if done.is_set() and not started.is_set():
+                # stdout closed, so the process is most likely exiting
                 try:
-                    stdout = ""
-                    if process.stdout:
-                        stdout = process.stdout.readline()
-                    if "Server started" in stdout or "Listening" in stdout:
-                        logger.info(f"MCP server '{server_id}' started successfully")
-                        return True, None
-                except Exception:
+                    process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
                     pass
-                
-                time.sleep(0.1)
             
-            # We've waited long enough, assume the server is running
-            logger.info(f"MCP server '{server_id}' start timeout exceeded, assuming it's running")
-            return True, None
+            return self._finish_start(server_id, process, started.is_set())
+            
+        except Exception as e:
+            error_msg = f"Error starting server: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+    
+    async def astart_server(self, server_id: str, command: str, args: List[str] = None,
+                            env: Dict[str, str] = None, wait_time: int = 5) -> Tuple[bool, Optional[str]]:
+        """
+        Start an MCP server without blocking the event loop while it comes up.
+        
+        Concurrent calls overlap their wait_time windows on the loop instead of
+        each holding a thread.
+        
+        Args:
+            server_id: Server identifier.
+            command: Command to start the server.
+            args: Command arguments.
+            env: Environment variables.
+            wait_time: Time to wait for server to start (seconds).
+            
+        Returns:
+            Tuple of (success, error_message).
+        """
+        # Check if the server is already running
+        pid = self._read_pid_file(server_id)
+        if pid and self._is_process_running(pid, server_id):
+            return True, None  # Server is already running
+        
+        # Remove stale PID file if it exists
+        self._remove_pid_file(server_id)
+        
+        try:
+            process = self._spawn(server_id, command, args, env)
+            
+            loop = asyncio.get_running_loop()
+            done = asyncio.Event()
+            
+            def _on_done() -> None:
+                try:
+                    loop.call_soon_threadsafe(done.set)
+                except RuntimeError:
+                    pass  # Loop already closed
+            
+            # Wait for the server to report readiness, close its stdout or time out
+            started = self._watch_start(server_id, process, _on_done)
+            try:
+                await asyncio.wait_for(done.wait(), wait_time)
+            except asyncio.TimeoutError:
+                pass
+            
+            if done.is_set() and not started.is_set():
+                # stdout closed, so the process is most likely exiting
+                await self._await_exit(process.pid, None, 1, process=process)
+            
+            return self._finish_start(server_id, process, started.is_set())
             
         except Exception as e:
             error_msg = f"Error starting server: {str(e)}"
@@ -192,78 +594,316 @@ class MCPServerLifecycle:
         """
         # Check if we have an active process for this server
         if server_id in self.active_processes:
-            process = self.active_processes[server_id]
-            try:
-                if force:
-                    process.kill()
-                else:
-                    process.terminate()
-                
-                # Wait for the process to exit
-                process.wait(timeout=5)
-                
-                # Remove the process from active processes
-                del self.active_processes[server_id]
-                self._remove_pid_file(server_id)
-                
-                logger.info(f"MCP server '{server_id}' stopped successfully")
-                return True, None
+            return self._stop_active_process(server_id, force)
+        
+        # Check if we have a PID file for this server
+        pid = self._read_pid_file(server_id)
+        if pid:
+            return self._stop_pid(server_id, pid, force)
+        
+        # No process or PID file found
+        logger.warning("No running MCP server found for '%s'", server_id)
+        return False, "No running server found"
+    
+    def _stop_active_process(self, server_id: str, force: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Stop a server process started by this lifecycle manager.
+        
+        Args:
+            server_id: Server identifier.
+            force: Whether to forcefully terminate the process.
             
-            except subprocess.TimeoutExpired:
-                # Force kill if terminate times out
+        Returns:
+            Tuple of (success, error_message).
+        """
+        process = self.active_processes[server_id]
+        try:
+            if force:
                 process.kill()
-                process.wait()
-                del self.active_processes[server_id]
-                self._remove_pid_file(server_id)
+            else:
+                process.terminate()
+            
+            # Wait for the process to exit
+            process.wait(timeout=STOP_TIMEOUT)
+            
+            # Remove the process from active processes
+            with self._state_lock:
+                self.active_processes.pop(server_id, None)
+            self._remove_pid_file(server_id)
+            
+            logger.info("MCP server '%s' stopped successfully", server_id)
+            return True, None
+        
+        except subprocess.TimeoutExpired:
+            # Force kill if terminate times out
+            process.kill()
+            process.wait()
+            with self._state_lock:
+                self.active_processes.pop(server_id, None)
+            self._remove_pid_file(server_id)
+            
+            logger.warning("MCP server '%s' had to be forcefully terminated", server_id)
+            return True, "Server had to be forcefully terminated"
+        
+        except Exception as e:
+            error_msg = f"Error stopping server: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+    
+    def _stop_pid(self, server_id: str, pid: int, force: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Stop a server process known only through its PID file.
+        
+        Args:
+            server_id: Server identifier.
+            pid: Process ID read from the PID file.
+            force: Whether to forcefully terminate the process.
+            
+        Returns:
+            Tuple of (success, error_message).
+        """
+        pidfd = None
+        try:
+            # Try to terminate the process
+            if self._is_process_running(pid, server_id):
+                # A pidfd taken before signalling pins this exact process, so a
+                # recycled PID is never signalled and exit wakes us immediately
+                pidfd = _open_pidfd(pid)
+                _send_signal(pid, pidfd, signal.SIGKILL if force else signal.SIGTERM)
                 
-                logger.warning(f"MCP server '{server_id}' had to be forcefully terminated")
+                # Wait to see if the process exits, keeping SIGKILL_WAIT of the budget
+                if not self._wait_for_exit(server_id, pid, pidfd, STOP_TIMEOUT - SIGKILL_WAIT):
+                    # Force kill the process
+                    _send_signal(pid, pidfd, signal.SIGKILL)
+                    self._wait_for_exit(server_id, pid, pidfd, SIGKILL_WAIT)
+            
+            # Remove the PID file
+            self._remove_pid_file(server_id)
+            
+            logger.info("MCP server '%s' stopped successfully using PID file", server_id)
+            return True, None
+        
+        except ProcessLookupError:
+            # Process already gone, just remove the PID file
+            self._remove_pid_file(server_id)
+            logger.info("MCP server '%s' was already stopped", server_id)
+            return True, None
+        
+        except Exception as e:
+            error_msg = f"Error stopping server: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+        
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+    
+    async def _await_exit(self, pid: int, pidfd: Optional[int], timeout: float,
+                          process: Optional[subprocess.Popen] = None, server_id: Optional[str] = None) -> bool:
+        """
+        Wait for a process to exit without blocking the event loop.
+        
+        Watches the process's pidfd on the loop when there is one, and polls
+        the process otherwise.
+        
+        Args:
+            pid: Process ID.
+            pidfd: pidfd of the process, or None.
+            timeout: Maximum time to wait (seconds).
+            process: Process handle, if this manager started the process.
+            server_id: Server the process belongs to.
+            
+        Returns:
+            True if the process exited, False on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        if pidfd is not None:
+            exited = loop.create_future()
+            loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+            try:
+                await asyncio.wait_for(exited, timeout)
+                if process is not None:
+                    process.poll()  # Reap the exited child
+                return True
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                loop.remove_reader(pidfd)
+        
+        deadline = loop.time() + timeout
+        while True:
+            if process is not None:
+                exited = process.poll() is not None
+            else:
+                exited = not self._is_process_running(pid, server_id)
+            if exited:
+                return True
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+    
+    async def astop_server(self, server_id: str, force: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Stop an MCP server without blocking the event loop while it exits.
+        
+        Args:
+            server_id: Server identifier.
+            force: Whether to forcefully terminate the process.
+            
+        Returns:
+            Tuple of (success, error_message).
+        """
+        process = self.active_processes.get(server_id)
+        pid = process.pid if process is not None else self._read_pid_file(server_id)
+        if not pid:
+            # No process or PID file found
+            logger.warning("No running MCP server found for '%s'", server_id)
+            return False, "No running server found"
+        
+        pidfd = None
+        try:
+            if process is None and not self._is_process_running(pid, server_id):
+                raise ProcessLookupError(pid)
+            if process is not None and process.poll() is not None:
+                raise ProcessLookupError(pid)
+            
+            # Same grace periods as stop_server
+            pidfd = _open_pidfd(pid)
+            _send_signal(pid, pidfd, signal.SIGKILL if force else signal.SIGTERM)
+            
+            grace = STOP_TIMEOUT if process is not None else STOP_TIMEOUT - SIGKILL_WAIT
+            forced = False
+            if not await self._await_exit(pid, pidfd, grace, process, server_id):
+                # Force kill the process
+                _send_signal(pid, pidfd, signal.SIGKILL)
+                forced = True
+                await self._await_exit(pid, pidfd, STOP_TIMEOUT if process is not None else SIGKILL_WAIT,
+                                       process, server_id)
+            
+            with self._state_lock:
+                self.active_processes.pop(server_id, None)
+            self._remove_pid_file(server_id)
+            
+            if forced and process is not None:
+                logger.warning("MCP server '%s' had to be forcefully terminated", server_id)
                 return True, "Server had to be forcefully terminated"
+            logger.info("MCP server '%s' stopped successfully", server_id)
+            return True, None
+        
+        except ProcessLookupError:
+            # Process already gone, just clean up after it
+            with self._state_lock:
+                self.active_processes.pop(server_id, None)
+            self._remove_pid_file(server_id)
+            logger.info("MCP server '%s' was already stopped", server_id)
+            return True, None
+        
+        except Exception as e:
+            error_msg = f"Error stopping server: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+        
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+    
+    def ensure_stopped(self, server_id: str, force: bool = False) -> bool:
+        """
+        Stop a server if it is running, reading its process state only once.
+        
+        Args:
+            server_id: Server identifier.
+            force: Whether to forcefully terminate the process.
             
-            except Exception as e:
-                error_msg = f"Error stopping server: {str(e)}"
-                logger.error(error_msg)
-                return False, error_msg
+        Returns:
+            True if the server is not running afterwards, False otherwise.
+        """
+        if server_id in self.active_processes:
+            success, _ = self._stop_active_process(server_id, force)
+            return success
         
-        # Check if we have a PID file for this server
         pid = self._read_pid_file(server_id)
         if pid:
-            try:
-                # Try to terminate the process
-                if self._is_process_running(pid):
-                    if force:
-                        os.kill(pid, signal.SIGKILL)
-                    else:
-                        os.kill(pid, signal.SIGTERM)
-                    
-                    # Wait briefly to see if the process exits
-                    time.sleep(2)
-                    
-                    # Check if the process is still running
-                    if self._is_process_running(pid):
-                        # Force kill the process
-                        os.kill(pid, signal.SIGKILL)
-                        time.sleep(1)
-                
-                # Remove the PID file
-                self._remove_pid_file(server_id)
-                
-                logger.info(f"MCP server '{server_id}' stopped successfully using PID file")
-                return True, None
+            success, _ = self._stop_pid(server_id, pid, force)
+            return success
+        
+        return True
+    
+    def ensure_running(self, server_id: str, command: str, args: List[str] = None,
+                       env: Dict[str, str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Start a server unless it is already running.
+        
+        A server started by this lifecycle manager is checked with a non-blocking
+        poll of its process handle, skipping the PID file and /proc lookups.
+        
+        Args:
+            server_id: Server identifier.
+            command: Command to start the server.
+            args: Command arguments.
+            env: Environment variables.
             
-            except ProcessLookupError:
-                # Process already gone, just remove the PID file
-                self._remove_pid_file(server_id)
-                logger.info(f"MCP server '{server_id}' was already stopped")
-                return True, None
+        Returns:
+            Tuple of (success, error_message).
+        """
+        process = self.active_processes.get(server_id)
+        if process is not None and process.poll() is None:
+            return True, None
+        
+        # start_server() checks the PID file itself before spawning
+        return self.start_server(server_id, command, args, env)
+    
+    async def aensure_stopped(self, server_id: str, force: bool = False) -> bool:
+        """
+        Stop a server if it is running, without blocking the event loop while it exits.
+        
+        Args:
+            server_id: Server identifier.
+            force: Whether to forcefully terminate the process.
             
-            except Exception as e:
-                error_msg = f"Error stopping server: {str(e)}"
-                logger.error(error_msg)
-                return False, error_msg
+        Returns:
+            True if the server is not running afterwards, False otherwise.
+        """
+        if server_id not in self.active_processes and not self._read_pid_file(server_id):
+            return True
         
-        # No process or PID file found
-        logger.warning(f"No running MCP server found for '{server_id}'")
-        return False, "No running server found"
+        success, _ = await self.astop_server(server_id, force=force)
+        return success
+    
+    async def aensure_running(self, server_id: str, command: str, args: List[str] = None,
+                              env: Dict[str, str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Start a server unless it is already running, without blocking the event loop.
+        
+        Args:
+            server_id: Server identifier.
+            command: Command to start the server.
+            args: Command arguments.
+            env: Environment variables.
+            
+        Returns:
+            Tuple of (success, error_message).
+        """
+        process = self.active_processes.get(server_id)
+        if process is not None and process.poll() is None:
+            return True, None
+        
+        # astart_server() checks the PID file itself before spawning
+        return await self.astart_server(server_id, command, args, env)
+    
+    def get_server_output(self, server_id: str, lines: Optional[int] = None) -> List[str]:
+        """
+        Get the most recent stdout lines of a server started by this manager.
+        
+        Args:
+            server_id: Server identifier.
+            lines: Number of lines to return; all buffered lines if None.
+            
+        Returns:
+            Buffered lines, oldest first (empty if the server wasn't started here).
+        """
+        tail = list(self._stdout_tails.get(server_id, ()))
+        return tail[-lines:] if lines else tail
     
     def get_server_status(self, server_id: str) -> Dict[str, Any]:
         """
@@ -284,19 +924,25 @@ class MCPServerLifecycle:
         }
         
         # Check active processes first
-        if server_id in self.active_processes:
-            process = self.active_processes[server_id]
+        process = self.active_processes.get(server_id)
+        if process is not None:
             result["pid"] = process.pid
             
             try:
                 # Get process information using psutil
-                p = psutil.Process(process.pid)
-                result["running"] = p.is_running()
-                result["uptime"] = time.time() - p.create_time()
-                result["memory_usage"] = p.memory_info().rss / (1024 * 1024)  # MB
+                p = self._get_proc(server_id, process.pid)
+                # oneshot() reads /proc once for all three values
+                with p.oneshot():
+                    # A cached handle outlives its process, so treat "not running" as gone
+                    if not p.is_running():
+                        raise psutil.NoSuchProcess(process.pid)
+                    result["running"] = True
+                    result["uptime"] = time.time() - p.create_time()
+                    result["memory_usage"] = p.memory_info().rss / (1024 * 1024)  # MB
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 # Process has disappeared or can't be accessed
-                del self.active_processes[server_id]
+                with self._state_lock:
+                    self.active_processes.pop(server_id, None)
                 self._remove_pid_file(server_id)
                 return result
             
@@ -309,10 +955,15 @@ class MCPServerLifecycle:
             
             try:
                 # Get process information using psutil
-                p = psutil.Process(pid)
-                result["running"] = p.is_running()
-                result["uptime"] = time.time() - p.create_time()
-                result["memory_usage"] = p.memory_info().rss / (1024 * 1024)  # MB
+                p = self._get_proc(server_id, pid)
+                # oneshot() reads /proc once for all three values
+                with p.oneshot():
+                    # A cached handle outlives its process, so treat "not running" as gone
+                    if not p.is_running():
+                        raise psutil.NoSuchProcess(pid)
+                    result["running"] = True
+                    result["uptime"] = time.time() - p.create_time()
+                    result["memory_usage"] = p.memory_info().rss / (1024 * 1024)  # MB
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 # Process has disappeared or can't be accessed
                 self._remove_pid_file(server_id)
@@ -329,23 +980,41 @@ class MCPServerLifecycle:
             Dictionary mapping server IDs to status dictionaries.
         """
         # Get all PID files
-        servers = {}
-        pid_files = [f for f in os.listdir(self.pid_dir) if f.endswith('.pid')]
-        
-        for pid_file in pid_files:
-            server_id = pid_file[:-4]  # Remove .pid extension
-            servers[server_id] = self.get_server_status(server_id)
+        with os.scandir(self.pid_dir) as entries:
+            pid_files = [entry.name for entry in entries if entry.name.endswith('.pid') and entry.is_file()]
+        server_ids = [pid_file[:-4] for pid_file in pid_files]  # Remove .pid extension
         
         # Add any active processes that don't have PID files
-        for server_id in self.active_processes:
-            if server_id not in servers:
-                servers[server_id] = self.get_server_status(server_id)
+        known = set(server_ids)
+        with self._state_lock:
+            active = list(self.active_processes)
+        server_ids.extend(server_id for server_id in active if server_id not in known)
         
-        return servers
+        # Each status is a handful of /proc reads, so overlap them across threads
+        # once there are enough servers to pay for the pool
+        if len(server_ids) <= STATUS_SERIAL_LIMIT:
+            statuses = [self.get_server_status(server_id) for server_id in server_ids]
+        else:
+            with self._state_lock:
+                if self._status_pool is None:
+                    self._status_pool = ThreadPoolExecutor(max_workers=STATUS_POOL_WORKERS,
+                                                           thread_name_prefix="mcp-status")
+                pool = self._status_pool
+            statuses = list(pool.map(self.get_server_status, server_ids))
+        
+        return dict(zip(server_ids, statuses))
+    
+    def close(self) -> None:
+        """Shut down the status threads; running servers are left alone."""
+        with self._state_lock:
+            pool, self._status_pool = self._status_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     lifecycle = MCPServerLifecycle()
     
     # List all running servers
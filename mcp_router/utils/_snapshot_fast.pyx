@@ -0,0 +1,28 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled inner loops for snapshot lookups in playwright_utils.
+
+Optional: playwright_utils falls back to equivalent pure-Python functions when
+this extension has not been built.
+"""
+
+
+cpdef Py_ssize_t find_by_role(list rows, list names, str name_needle):
+    """
+    Find the first row whose name contains a case-folded needle.
+    
+    Args:
+        rows: Row numbers of the nodes with the wanted role, in document order.
+        names: Names column of a SnapshotIndex.
+        name_needle: Case-folded name to search for.
+        
+    Returns:
+        The first matching row number, or -1 if none matches.
+    """
+    cdef Py_ssize_t row
+    cdef str name
+    for row in rows:
+        name = names[row]
+        if name_needle in name.casefold():
+            return row
+    return -1
@@ -4,17 +4,71 @@ Provides functions for reading, writing, and managing files related to MCP serve
 """
 
 import os
+import sys
 import json
+import functools
 import shutil
 import tempfile
 import logging
-from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, TextIO
+from typing import Dict, Any, List, Optional, Set, Union, TextIO
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Linux ioctl that makes a file share another file's data blocks copy-on-write
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+# Library module: leave handler and level configuration to the application
 logger = logging.getLogger(__name__)
 
+# Home directory, resolved once at import instead of on every path expansion
+_HOME = os.path.expanduser("~")
+
+# Suffixes restore_backup() strips to find the original file
+BACKUP_SUFFIXES = (".bak", ".backup", ".old", ".prev")
+
+# Directories already created or found by this process, so repeated writes into
+# the same directory skip the makedirs stat. One removed behind our back is only
+# recreated by ensure_directory()
+_ensured_dirs: Set[str] = set()
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any, pretty: bool = True) -> bytes:
+    """Serialize an object to UTF-8 JSON, indented if pretty, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, separators=(',', ': ')).encode("utf-8")
+    # Compact output drops the default spaces after separators, like orjson
+    return json.dumps(obj, separators=(',', ':')).encode("utf-8")
+
+def _expand(path: str) -> str:
+    """Expand a leading ~ using the cached home directory."""
+    if path == "~" or path.startswith("~/") or path.startswith("~" + os.sep):
+        return _HOME + path[1:]
+    if path.startswith("~"):
+        # ~user forms still need a password-database lookup
+        return os.path.expanduser(path)
+    return path
+
+def _ensure_dir(path: str) -> None:
+    """Create a directory unless this process has already ensured it exists."""
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
 def ensure_directory(path: str) -> str:
     """
     Ensure a directory exists, creating it if necessary.
@@ -25,8 +79,10 @@ def ensure_directory(path: str) -> str:
     Returns:
         Absolute path to the directory.
     """
-    path = os.path.expanduser(path)
+    path = _expand(path)
+    # Always checked, since callers use this to recreate removed directories
     os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
     return path
 
 def read_json_file(file_path: str, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -40,14 +96,14 @@ def read_json_file(file_path: str, default: Optional[Dict[str, Any]] = None) ->
     Returns:
         Parsed JSON data.
     """
-    file_path = os.path.expanduser(file_path)
-    
-    if not os.path.exists(file_path):
-        return default or {}
+    file_path = _expand(file_path)
     
+    # Open directly instead of checking existence first: one syscall, no race
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return default or {}
     except (json.JSONDecodeError, IOError) as e:
         logger.error(f"Error reading JSON file {file_path}: {e}")
         return default or {}
@@ -64,19 +120,17 @@ def write_json_file(file_path: str, data: Dict[str, Any], pretty: bool = True) -
     Returns:
         True if successful, False otherwise.
     """
-    file_path = os.path.expanduser(file_path)
+    file_path = _expand(file_path)
     
     try:
         # Create parent directory if it doesn't exist
         parent_dir = os.path.dirname(file_path)
-        if parent_dir:
-            os.makedirs(parent_dir, exist_ok=True)
+        _ensure_dir(parent_dir)
         
-        with open(file_path, 'w') as f:
-            if pretty:
-                json.dump(data, f, indent=2)
-            else:
-                json.dump(data, f)
+        # Serialize first, then write the whole document with one call
+        data_bytes = _json_dumps(data, pretty)
+        with open(file_path, 'wb') as f:
+            f.write(data_bytes)
         
         return True
     except (IOError, TypeError) as e:
@@ -95,23 +149,33 @@ def atomic_write_json_file(file_path: str, data: Dict[str, Any], pretty: bool =
     Returns:
         True if successful, False otherwise.
     """
-    file_path = os.path.expanduser(file_path)
+    file_path = _expand(file_path)
     
     try:
         # Create parent directory if it doesn't exist
         parent_dir = os.path.dirname(file_path)
-        if parent_dir:
-            os.makedirs(parent_dir, exist_ok=True)
+        _ensure_dir(parent_dir)
         
-        # Write to a temporary file first
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, dir=parent_dir, suffix='.tmp') as temp_file:
-            if pretty:
-                json.dump(data, temp_file, indent=2)
-            else:
-                json.dump(data, temp_file)
+        # Write to a temporary file in the same directory first, and make sure its
+        # bytes are on disk before it replaces the target
+        data_bytes = _json_dumps(data, pretty)
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, dir=parent_dir or ".", suffix='.tmp') as temp_file:
+            tmp_name = temp_file.name
+            try:
+                temp_file.write(data_bytes)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            except BaseException:
+                temp_file.close()
+                os.unlink(tmp_name)
+                raise
         
-        # Rename the temporary file to the target file
-        shutil.move(temp_file.name, file_path)
+        # Atomically swap the temporary file in (a single rename on the same filesystem)
+        try:
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
         
         return True
     except (IOError, TypeError) as e:
@@ -128,14 +192,13 @@ def safe_delete_file(file_path: str) -> bool:
     Returns:
         True if the file was deleted or doesn't exist, False on error.
     """
-    file_path = os.path.expanduser(file_path)
-    
-    if not os.path.exists(file_path):
-        return True
+    file_path = _expand(file_path)
     
     try:
         os.remove(file_path)
         return True
+    except FileNotFoundError:
+        return True
     except IOError as e:
         logger.error(f"Error deleting file {file_path}: {e}")
         return False
@@ -151,48 +214,78 @@ def find_first_existing_file(file_paths: List[str], default: Optional[str] = Non
     Returns:
         Path to the first existing file, or default if none exist.
     """
-    for path in file_paths:
-        expanded_path = os.path.expanduser(path)
-        if os.path.exists(expanded_path):
-            return expanded_path
+    expanded = [_expand(path) for path in file_paths]
+    parents: Dict[str, int] = {}
+    for path in expanded:
+        parent = os.path.dirname(path)
+        parents[parent] = parents.get(parent, 0) + 1
+    
+    # Candidates sharing a directory are checked against one listing of it;
+    # a lone candidate costs a single stat either way
+    listings: Dict[str, set] = {}
+    for path in expanded:
+        parent, name = os.path.split(path)
+        if parents[parent] == 1:
+            if os.path.exists(path):
+                return path
+            continue
+        if parent not in listings:
+            try:
+                with os.scandir(parent or ".") as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+        if name in listings[parent]:
+            return path
     
     return default
 
-def get_user_data_dir(app_name: str = "mcp-router") -> str:
+@functools.lru_cache(maxsize=None)
+def _user_dir(kind: str, app_name: str) -> str:
     """
-    Get the user data directory for the application.
+    Resolve and create a per-user application directory, once per process.
     
     Args:
+        kind: "data" or "config".
         app_name: Name of the application.
         
     Returns:
-        Path to the user data directory.
+        Path to the directory.
     """
-    home = os.path.expanduser("~")
-    
+    # macOS reports os.name == "posix", so check it first
+    if sys.platform == "darwin":
+        base_dir = os.path.join(_HOME, "Library/Application Support")
     # Linux/Unix
-    if os.name == "posix":
-        # Use XDG_DATA_HOME if available, otherwise ~/.local/share
-        data_home = os.environ.get("XDG_DATA_HOME")
-        if data_home:
-            base_dir = data_home
+    elif os.name == "posix":
+        # Use XDG_DATA_HOME/XDG_CONFIG_HOME if available, otherwise ~/.local/share or ~/.config
+        if kind == "data":
+            base_dir = os.environ.get("XDG_DATA_HOME") or os.path.join(_HOME, ".local/share")
         else:
-            base_dir = os.path.join(home, ".local/share")
+            base_dir = os.environ.get("XDG_CONFIG_HOME") or os.path.join(_HOME, ".config")
     # Windows
     elif os.name == "nt":
-        base_dir = os.environ.get("APPDATA", os.path.join(home, "AppData/Roaming"))
-    # macOS
-    elif os.name == "darwin":
-        base_dir = os.path.join(home, "Library/Application Support")
+        base_dir = os.environ.get("APPDATA", os.path.join(_HOME, "AppData/Roaming"))
     # Fallback
     else:
-        base_dir = os.path.join(home, ".config")
+        base_dir = os.path.join(_HOME, ".config")
     
     app_dir = os.path.join(base_dir, app_name)
-    os.makedirs(app_dir, exist_ok=True)
+    _ensure_dir(app_dir)
     
     return app_dir
 
+def get_user_data_dir(app_name: str = "mcp-router") -> str:
+    """
+    Get the user data directory for the application.
+    
+    Args:
+        app_name: Name of the application.
+        
+    Returns:
+        Path to the user data directory.
+    """
+    return _user_dir("data", app_name)
+
 def get_user_config_dir(app_name: str = "mcp-router") -> str:
     """
     Get the user configuration directory for the application.
@@ -203,30 +296,7 @@ def get_user_config_dir(app_name: str = "mcp-router") -> str:
     Returns:
         Path to the user configuration directory.
     """
-    home = os.path.expanduser("~")
-    
-    # Linux/Unix
-    if os.name == "posix":
-        # Use XDG_CONFIG_HOME if available, otherwise ~/.config
-        config_home = os.environ.get("XDG_CONFIG_HOME")
-        if config_home:
-            base_dir = config_home
-        else:
-            base_dir = os.path.join(home, ".config")
-    # Windows
-    elif os.name == "nt":
-        base_dir = os.environ.get("APPDATA", os.path.join(home, "AppData/Roaming"))
-    # macOS
-    elif os.name == "darwin":
-        base_dir = os.path.join(home, "Library/Application Support")
-    # Fallback
-    else:
-        base_dir = os.path.join(home, ".config")
-    
-    app_dir = os.path.join(base_dir, app_name)
-    os.makedirs(app_dir, exist_ok=True)
-    
-    return app_dir
+    return _user_dir("config", app_name)
 
 def list_files_with_extension(directory: str, extension: str) -> List[str]:
     """
@@ -239,21 +309,18 @@ def list_files_with_extension(directory: str, extension: str) -> List[str]:
     Returns:
         List of matching file paths.
     """
-    directory = os.path.expanduser(directory)
-    
-    if not os.path.exists(directory) or not os.path.isdir(directory):
-        return []
+    directory = _expand(directory)
     
     # Ensure extension starts with a dot
     if not extension.startswith("."):
         extension = f".{extension}"
     
-    matching_files = []
-    for filename in os.listdir(directory):
-        if filename.endswith(extension):
-            matching_files.append(os.path.join(directory, filename))
-    
-    return matching_files
+    # scandir entries carry their own path and file type, so no extra stat or join
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.path for entry in entries if entry.name.endswith(extension) and entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
 def create_file_if_not_exists(file_path: str, default_content: str = "") -> bool:
     """
@@ -266,25 +333,62 @@ def create_file_if_not_exists(file_path: str, default_content: str = "") -> bool
     Returns:
         True if the file was created or already exists, False on error.
     """
-    file_path = os.path.expanduser(file_path)
-    
-    if os.path.exists(file_path):
-        return True
+    file_path = _expand(file_path)
     
     try:
         # Create parent directory if it doesn't exist
         parent_dir = os.path.dirname(file_path)
-        if parent_dir:
-            os.makedirs(parent_dir, exist_ok=True)
+        _ensure_dir(parent_dir)
         
-        with open(file_path, 'w') as f:
+        # O_EXCL creates the file only if it is missing, atomically
+        fd = os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        with os.fdopen(fd, 'w') as f:
             f.write(default_content)
         
+        return True
+    except FileExistsError:
         return True
     except IOError as e:
         logger.error(f"Error creating file {file_path}: {e}")
         return False
 
+def _copy_in_kernel(src: str, dst: str) -> bool:
+    """
+    Copy a file without passing its data through user space (Linux only).
+    
+    Makes a copy-on-write clone (reflink) where the filesystem supports it
+    (e.g. Btrfs, XFS), and otherwise copies page cache to page cache with
+    os.sendfile() on the same descriptors. Metadata is copied as with
+    shutil.copy2().
+    
+    Args:
+        src: File to copy.
+        dst: Destination path.
+        
+    Returns:
+        True if the file was copied, False if neither method works here.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            except OSError:
+                # No reflink support (or different filesystems)
+                size = os.fstat(src_fd).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+    except OSError:
+        return False
+    shutil.copystat(src, dst)
+    return True
+
 def backup_file(file_path: str, backup_suffix: str = ".bak") -> Optional[str]:
     """
     Create a backup of a file.
@@ -296,7 +400,7 @@ def backup_file(file_path: str, backup_suffix: str = ".bak") -> Optional[str]:
     Returns:
         Path to the backup file, or None if the backup failed.
     """
-    file_path = os.path.expanduser(file_path)
+    file_path = _expand(file_path)
     
     if not os.path.exists(file_path):
         return None
@@ -304,7 +408,10 @@ def backup_file(file_path: str, backup_suffix: str = ".bak") -> Optional[str]:
     backup_path = f"{file_path}{backup_suffix}"
     
     try:
-        shutil.copy2(file_path, backup_path)
+        # A reflink costs no data movement; the backup still gets its own inode, so
+        # later in-place writes to the original never show up in it
+        if not _copy_in_kernel(file_path, backup_path):
+            shutil.copy2(file_path, backup_path)
         return backup_path
     except IOError as e:
         logger.error(f"Error backing up file {file_path}: {e}")
@@ -321,23 +428,25 @@ def restore_backup(backup_path: str, original_path: Optional[str] = None) -> boo
     Returns:
         True if the backup was restored, False otherwise.
     """
-    backup_path = os.path.expanduser(backup_path)
+    backup_path = _expand(backup_path)
     
     if not os.path.exists(backup_path):
         return False
     
     if original_path is None:
-        # Attempt to derive original path by removing common backup suffixes
-        for suffix in [".bak", ".backup", ".old", ".prev"]:
-            if backup_path.endswith(suffix):
-                original_path = backup_path[:-len(suffix)]
-                break
+        # Attempt to derive original path by removing common backup suffixes;
+        # one tuple endswith() rules out the common non-matching case
+        if backup_path.endswith(BACKUP_SUFFIXES):
+            for suffix in BACKUP_SUFFIXES:
+                if backup_path.endswith(suffix):
+                    original_path = backup_path[:-len(suffix)]
+                    break
         
         if original_path is None:
             logger.error(f"Could not determine original path for backup {backup_path}")
             return False
     
-    original_path = os.path.expanduser(original_path)
+    original_path = _expand(original_path)
     
     try:
         shutil.copy2(backup_path, original_path)
@@ -5,41 +5,539 @@ Uses the Playwright MCP server to automate browser interactions.
 
 import json
 import logging
-import os
-import time
-from typing import Dict, Any, List, Optional, Union, Callable
+import sys
+import asyncio
+import io
+import warnings
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Union, Callable, AsyncIterator, Awaitable, Iterable, Iterator
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib json module
+    orjson = None
+
+try:
+    from anyio import BrokenResourceError, ClosedResourceError
+except ImportError:  # anyio comes with the MCP SDK; without it only builtin errors count
+    _TRANSPORT_ERRORS: Tuple[type, ...] = (ConnectionError, EOFError)
+else:
+    _TRANSPORT_ERRORS = (ConnectionError, EOFError, BrokenResourceError, ClosedResourceError)
+
+try:
+    import ijson
+except ImportError:  # optional; lets find_element_streaming() stop parsing at the first match
+    ijson = None
+
+# Library module: leave handler and level configuration to the application
 logger = logging.getLogger(__name__)
 
+# Prefix of the Playwright MCP server's tool names
+TOOL_PREFIX = "mcp_playwright_browser_"
+
+# Retries, with exponentially growing delays starting at TRANSPORT_RETRY_DELAY
+# seconds, when the connection to the server drops during a tool call
+TRANSPORT_RETRIES = 3
+TRANSPORT_RETRY_DELAY = 0.1
+
+# Largest snapshot, in characters, requested from the server by default
+DEFAULT_SNAPSHOT_MAX_CHARS = 50000
+
+# Role of the placeholder trim_snapshot() leaves in place of pruned children;
+# find_element(s) skip it, and it has no text, link or form role to extract
+TRIMMED_ROLE = "_trimmed"
+
+# Roles reported by extract_form_elements()
+FORM_ROLES = frozenset({"textbox", "button", "checkbox", "radio", "combobox", "listbox", "switch"})
+
+# Tools that leave the current page unchanged; any other call may change it and
+# invalidates the cached snapshot
+_READ_ONLY_TOOLS = frozenset({"snapshot", "snapshot_diff", "take_screenshot", "save_as_pdf", "new_context"})
+
+# Tools that are safe to send again after a dropped connection, since running
+# them twice has the same effect as running them once
+_RETRYABLE_TOOLS = frozenset({"snapshot", "snapshot_diff", "take_screenshot", "save_as_pdf", "navigate"})
+
+# Arguments of the tools that take none of their own. The server's schemas
+# require a placeholder random_string for these, so each call sends one of these
+# shared dicts; _call_tool() copies before adding keys, and nothing may mutate them.
+_SNAPSHOT_ARGS: Dict[str, Any] = {"random_string": "snapshot"}
+_BACK_ARGS: Dict[str, Any] = {"random_string": "back"}
+_FORWARD_ARGS: Dict[str, Any] = {"random_string": "forward"}
+_CLOSE_ARGS: Dict[str, Any] = {"random_string": "close"}
+_PDF_ARGS: Dict[str, Any] = {"random_string": "pdf"}
+_NO_ARGS: Dict[str, Any] = {}
+
+# Response content requested per tool when the caller passes no expectation.
+# Navigation returns the new page's snapshot; plain actions only report success,
+# which keeps the ~50k character accessibility tree off the wire. Edit this dict
+# to change the defaults for every PlaywrightMCP instance.
+DEFAULT_EXPECTATIONS: Dict[str, Dict[str, bool]] = {
+    "navigate": {"includeSnapshot": True},
+    "go_back": {"includeSnapshot": True},
+    "go_forward": {"includeSnapshot": True},
+    "click": {"includeSnapshot": False, "includeConsole": False, "includeTabs": False},
+    "type": {"includeSnapshot": False, "includeConsole": False, "includeTabs": False},
+    "select_option": {"includeSnapshot": False, "includeConsole": False, "includeTabs": False},
+    "press_key": {"includeSnapshot": False, "includeConsole": False, "includeTabs": False},
+    "wait": {"includeSnapshot": False, "includeConsole": False, "includeTabs": False},
+}
+
+def _json_loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Parse a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode("utf-8")
+
+def _stream_find(data: Union[bytes, bytearray, str], match: Callable[[Dict[str, Any]], bool],
+                 key_fields: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """
+    Find the first node of a serialized snapshot that matches, parsing no further.
+    
+    Nodes are tested with their scalar fields once the "children" key is reached,
+    or at the end of the node if it has no children or lists its key fields after
+    them. The matching node is then built in full, children included.
+    
+    A node tested only at its end is undecided until then: the events inside it
+    are recorded, and a match found within it is held back, since the node itself
+    comes first in document order if it matches. Snapshots that list scalar
+    fields before "children" never take this slower path.
+    
+    Args:
+        data: Snapshot as JSON text.
+        match: Test applied to a node's scalar fields.
+        key_fields: Fields match() looks at.
+        
+    Returns:
+        The matching node, or None if there is none.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    
+    # One frame per open container: [scalar fields seen so far (None for arrays),
+    # whether match() has been decided, whether it matched, start in recorded, undecided]
+    frames: List[List[Any]] = []
+    # Events recorded while an undecided node is open, and the earliest match
+    # within them as a (start, end) slice
+    recorded: Optional[List[Tuple[str, Any]]] = None
+    undecided = 0
+    candidate: Optional[Tuple[int, int]] = None
+    key = None
+    events = ijson.parse(io.BytesIO(data), use_float=True)
+    for _, event, value in events:
+        if recorded is not None:
+            recorded.append((event, value))
+        
+        if event == "start_map":
+            frames.append([{}, False, False, len(recorded) - 1 if recorded is not None else None, False])
+        elif event == "start_array":
+            frames.append([None, True, False, None, False])
+        elif event == "map_key":
+            key = value
+            frame = frames[-1]
+            if value != "children" or frame[1]:
+                continue
+            fields = frame[0]
+            if all(field_name in fields for field_name in key_fields):
+                frame[1] = True
+                frame[2] = match(fields)
+                if frame[2] and not undecided:
+                    return _build_rest(fields, events)
+            else:
+                # The key fields may still follow the children
+                frame[4] = True
+                undecided += 1
+                if recorded is None:
+                    recorded = _field_events(fields)
+                    recorded.append((event, value))
+                    frame[3] = 0
+        elif event == "end_map":
+            fields, decided, matched, node_start, node_undecided = frames.pop()
+            if not decided:
+                matched = match(fields)
+            if node_undecided:
+                undecided -= 1
+            if matched:
+                if recorded is None:
+                    # No children, so the scalar fields are the whole node
+                    return fields
+                if candidate is None or node_start < candidate[0]:
+                    candidate = (node_start, len(recorded))
+            if recorded is not None and not undecided:
+                if candidate is not None:
+                    return _replay(recorded[candidate[0]:candidate[1]])
+                recorded = None
+        elif event == "end_array":
+            frames.pop()
+        elif frames and frames[-1][0] is not None:
+            # Scalar field of the innermost node
+            frames[-1][0][key] = value
+    
+    return None
+
+def _field_events(fields: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Events opening a node whose scalar fields have been read already."""
+    recorded: List[Tuple[str, Any]] = [("start_map", None)]
+    for name, value in fields.items():
+        recorded.append(("map_key", name))
+        recorded.append(("string", value))
+    return recorded
+
+def _replay(recorded: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Build a node from its recorded parse events."""
+    builder = ijson.ObjectBuilder()
+    for event, value in recorded:
+        builder.event(event, value)
+    return builder.value
+
+def _build_rest(fields: Dict[str, Any], events: Iterator[Tuple[str, str, Any]]) -> Dict[str, Any]:
+    """Finish building a node whose scalar fields are known, from its "children" key on."""
+    builder = ijson.ObjectBuilder()
+    for event, value in _field_events(fields):
+        builder.event(event, value)
+    builder.event("map_key", "children")
+    
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+def _py_find_by_role(rows: List[int], names: List[str], name_needle: str) -> int:
+    """Pure-Python version of _snapshot_fast.find_by_role(): first row whose name contains the needle, or -1."""
+    for row in rows:
+        if name_needle in names[row].casefold():
+            return row
+    return -1
+
+try:
+    from ._snapshot_fast import find_by_role as _find_by_role
+except ImportError:  # the compiled extension is optional; it is only built when Cython is installed
+    _find_by_role = _py_find_by_role
+
+def _iter_nodes(root: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the nodes under root, root included, in document order.
+    
+    The walk is lazy, so a consumer that stops early leaves the rest of the
+    tree unvisited. Placeholders left by trim_snapshot() are skipped.
+    """
+    # Iterative depth-first walk: children are pushed in reverse so the first
+    # child is visited next
+    stack = [root]
+    pop, push = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        if node.get("role") == TRIMMED_ROLE:
+            continue
+        yield node
+        children = node.get("children")
+        if children:
+            push(reversed(children))
+
+def trim_snapshot(snapshot: Dict[str, Any], max_nodes: int) -> Dict[str, Any]:
+    """
+    Limit a snapshot tree to its first max_nodes nodes in breadth-first order.
+    
+    Children beyond the budget are replaced by one placeholder per parent,
+    {"role": TRIMMED_ROLE, "range": [first_ref, last_ref]}, naming the first
+    and last pruned child. Kept nodes are shallow copies, so the input is left
+    untouched and the work done is proportional to the budget, not the tree.
+    
+    Args:
+        snapshot: Snapshot data.
+        max_nodes: Maximum number of nodes to keep, including the root.
+        
+    Returns:
+        The trimmed snapshot.
+    """
+    tree = snapshot.get("tree")
+    if not tree:
+        return snapshot
+    
+    root = dict(tree)
+    kept = 1
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        children = node.get("children")
+        if not children:
+            continue
+        
+        room = max(max_nodes - kept, 0)
+        new_children = [dict(child) for child in children[:room]]
+        kept += len(new_children)
+        queue.extend(new_children)
+        if room < len(children):
+            new_children.append({
+                "role": TRIMMED_ROLE,
+                "range": [children[room].get("ref"), children[-1].get("ref")]
+            })
+        node["children"] = new_children
+    
+    return {**snapshot, "tree": root}
+
+def apply_diff(base: Dict[str, Any], patch: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply a snapshot_diff patch to a snapshot, returning the patched copy.
+    
+    Ops address nodes by element reference, the first match in document order:
+    {"op": "replace", "ref": ..., "node": ...} swaps a node and its subtree for
+    node, {"op": "remove", "ref": ...} drops it, and {"op": "add", "ref": ...,
+    "node": ...} adds node as a child of it, at position "index" if given and
+    last otherwise. Only the nodes on the paths from the root to the changes
+    are copied; base and patch are left unmodified.
+    
+    Args:
+        base: Snapshot the patch was computed against.
+        patch: Ops in the order they apply.
+        
+    Returns:
+        The patched snapshot.
+        
+    Raises:
+        KeyError: If an op names a reference that is not in the tree.
+        ValueError: If an op is unknown or removes the root.
+    """
+    root = base.get("tree", {})
+    by_ref: Dict[str, Dict[str, Any]] = {}
+    parents: Dict[int, Dict[str, Any]] = {}
+    
+    def attach(node: Dict[str, Any], parent: Optional[Dict[str, Any]]) -> None:
+        # Map the references and parents of a subtree entering the tree
+        if parent is not None:
+            parents[id(node)] = parent
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            ref = current.get("ref")
+            if ref is not None and ref not in by_ref:
+                by_ref[ref] = current
+            children = current.get("children")
+            if children:
+                for child in children:
+                    parents[id(child)] = current
+                stack.extend(reversed(children))
+    
+    def detach(node: Dict[str, Any]) -> None:
+        # Forget the references of a subtree leaving the tree
+        for current in _iter_nodes(node):
+            ref = current.get("ref")
+            if ref is not None and by_ref.get(ref) is current:
+                del by_ref[ref]
+    
+    def position(siblings: List[Dict[str, Any]], node: Dict[str, Any]) -> int:
+        return next(i for i, sibling in enumerate(siblings) if sibling is node)
+    
+    # Copies map to themselves, so a node is copied at most once
+    copies: Dict[int, Dict[str, Any]] = {}
+    
+    def writable(node: Dict[str, Any]) -> Dict[str, Any]:
+        # Copy a node and its children list, relinking copied ancestors up to the root
+        copy = copies.get(id(node))
+        if copy is not None:
+            return copy
+        copy = dict(node)
+        if "children" in copy:
+            copy["children"] = list(copy["children"])
+            for child in copy["children"]:
+                parents[id(child)] = copy
+        copies[id(node)] = copies[id(copy)] = copy
+        ref = copy.get("ref")
+        if ref is not None and by_ref.get(ref) is node:
+            by_ref[ref] = copy
+        parent = parents.get(id(node))
+        if parent is not None:
+            parent = writable(parent)
+            siblings = parent["children"]
+            siblings[position(siblings, node)] = copy
+            parents[id(copy)] = parent
+        return copy
+    
+    attach(root, None)
+    for op in patch:
+        kind = op.get("op")
+        target = by_ref[op["ref"]]
+        parent = parents.get(id(target))
+        if kind == "add":
+            node = op["node"]
+            children = writable(target).setdefault("children", [])
+            children.insert(op.get("index", len(children)), node)
+            attach(node, copies[id(target)])
+        elif kind == "remove":
+            if parent is None:
+                raise ValueError("A snapshot patch cannot remove the root node")
+            siblings = writable(parent)["children"]
+            del siblings[position(siblings, target)]
+            detach(target)
+        elif kind == "replace":
+            node = op["node"]
+            detach(target)
+            if parent is None:
+                root = node
+            else:
+                siblings = writable(parent)["children"]
+                siblings[position(siblings, target)] = node
+            attach(node, copies[id(parent)] if parent is not None else None)
+        else:
+            raise ValueError(f"Unknown snapshot patch op: {kind!r}")
+    
+    return {**base, "tree": copies.get(id(root), root)}
+
+@dataclass
+class SnapshotIndex:
+    """
+    One snapshot flattened into parallel arrays (struct-of-arrays), with lookup tables.
+    
+    Row i holds the i-th node in document order; placeholders left by
+    trim_snapshot() get no row. Missing roles, names and texts are stored as "".
+    The lookup tables map to row numbers in document order: by_ref keeps the
+    first row with a given reference, and by_text is keyed by case-folded text.
+    """
+    
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    roles: List[str] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    refs: List[Optional[str]] = field(default_factory=list)
+    by_role: Dict[str, List[int]] = field(default_factory=dict)
+    by_ref: Dict[str, int] = field(default_factory=dict)
+    by_text: Dict[str, List[int]] = field(default_factory=dict)
+
+class BatchStepError(RuntimeError):
+    """Raised when a step of a batched Playwright call fails."""
+    
+    def __init__(self, index: int, tool: str, error: str, results: Optional[List[Any]] = None):
+        """
+        Initialize the error.
+        
+        Args:
+            index: Position of the failed step in the batch.
+            tool: Tool name of the failed step.
+            error: Error reported for the step.
+            results: Per-step results returned for the whole batch.
+        """
+        super().__init__(f"Batch step {index} ({tool}) failed: {error}")
+        self.index = index
+        self.tool = tool
+        self.error = error
+        self.results = results or []
+
+class PlaywrightBatch(list):
+    """
+    Steps collected inside PlaywrightMCP.batched().
+    
+    Each step is a {"tool": ..., "args": ...} dict; results holds the
+    per-step results once the batch has been sent.
+    """
+    
+    results: Optional[List[Any]] = None
+
 class PlaywrightMCP:
     """
     Utility class for interacting with the Playwright MCP server.
     Uses the MCP Python SDK to communicate with the Playwright MCP server.
     """
     
-    def __init__(self, mcp_client=None):
+    def __init__(self, mcp_client=None, context_id: Optional[str] = None,
+                 client_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+                 client_release: Optional[Callable[[], Awaitable[None]]] = None):
         """
         Initialize the Playwright MCP utility.
         
         Args:
-            mcp_client: An initialized MCP client instance.
-                        If None, will attempt to use a default client.
+            mcp_client: An initialized MCP client instance. It belongs to the
+                        caller and is never connected or closed here.
+            context_id: Browser context to run every call in (see
+                        PlaywrightContextPool); the server's default if None.
+            client_factory: Coroutine function returning a connected client,
+                        called by __aenter__ to hold a client for the block.
+            client_release: Coroutine function giving that client back, e.g. to
+                        the pool it came from; without it the client is closed
+                        on exit, as this instance created it.
         """
         self.mcp_client = mcp_client
+        self._client_factory = client_factory
+        self._client_release = client_release
+        self.context_id = context_id
         self._last_snapshot = None
+        # Server-side id of _last_snapshot, the base for snapshot_diff()
+        self._last_snapshot_id: Optional[str] = None
+        
+        # Bumped by every call that may change the page; the cached snapshot is
+        # reused while its epoch is current
+        self._nav_epoch = 0
+        self._snapshot_cache: Optional[Tuple[int, Tuple[Any, ...], Any]] = None
+        
+        # Index of the most recently queried snapshot, matched by identity
+        self._index_cache: Optional[Tuple[Dict[str, Any], SnapshotIndex]] = None
+        
+        # Name of the Playwright server, looked up on the first tool call
+        self._playwright_server: Optional[str] = None
+        
+        # Client taken from client_factory by __aenter__, and the one it replaced
+        self._held_client = None
+        self._caller_client = None
     
-    async def _call_tool(self, tool_name: str, args: Dict[str, Any]) -> Any:
+    async def __aenter__(self) -> "PlaywrightMCP":
+        """
+        Hold a client from client_factory for the block, if one was given.
+        
+        Every call inside the block then reuses that one client. Without a
+        factory, mcp_client is used as is.
+        """
+        if self._client_factory is not None and self._held_client is None:
+            self._held_client = await self._client_factory()
+            self._caller_client = self.mcp_client
+            self.mcp_client = self._held_client
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Give back the client taken by __aenter__: released if it came from a pool, closed otherwise."""
+        client = self._held_client
+        if client is None:
+            return
+        
+        self._held_client = None
+        self.mcp_client = self._caller_client
+        self._caller_client = None
+        if self._client_release is not None:
+            await self._client_release()
+        else:
+            await client.close()
+    
+    def invalidate_server_cache(self) -> None:
+        """Look the Playwright server up again on the next call, e.g. after a reconnect."""
+        self._playwright_server = None
+    
+    async def _call_tool(self, tool_name: str, args: Dict[str, Any],
+                         expectation: Optional[Dict[str, Any]] = None, raw: bool = False) -> Any:
         """
         Call a tool on the Playwright MCP server.
         
         Args:
             tool_name: Name of the tool to call.
             args: Arguments for the tool.
+            expectation: What the server should include in its response (e.g.
+                {"includeSnapshot": False}); defaults to DEFAULT_EXPECTATIONS.
+            raw: Whether to return a JSON result the client left undecoded as is.
             
         Returns:
-            Result of the tool call.
+            Result of the tool call; JSON text or bytes from the client are
+            decoded unless raw is set.
             
         Raises:
             ValueError: If the MCP client is not initialized.
@@ -48,67 +546,364 @@ class PlaywrightMCP:
         if not self.mcp_client:
             raise ValueError("MCP client not initialized")
         
-        # Find the Playwright MCP server
-        servers = self.mcp_client.list_servers()
-        playwright_server = None
-        for server in servers:
-            if "playwright" in server.lower():
-                playwright_server = server
-                break
+        # Find the Playwright MCP server once; its name is stable for the session
+        playwright_server = self._playwright_server
+        if playwright_server is None:
+            for server in self.mcp_client.list_servers():
+                if "playwright" in server.lower():
+                    playwright_server = self._playwright_server = server
+                    break
+            
+            if not playwright_server:
+                raise RuntimeError("Playwright MCP server not found")
         
-        if not playwright_server:
-            raise RuntimeError("Playwright MCP server not found")
+        if expectation is None:
+            expectation = DEFAULT_EXPECTATIONS.get(tool_name)
+        if expectation is not None:
+            args = {**args, "expectation": expectation}
+        if self.context_id is not None and "contextId" not in args:
+            args = {**args, "contextId": self.context_id}
         
-        # Call the tool
-        tool_name_full = f"mcp_playwright_browser_{tool_name}"
+        # Call the tool; after a dropped connection, tools that can safely run
+        # twice are retried on the same client instead of failing the session
+        retries = TRANSPORT_RETRIES if tool_name in _RETRYABLE_TOOLS else 0
         try:
-            return await self.mcp_client.call_tool(playwright_server, tool_name_full, args)
+            for attempt in range(retries + 1):
+                try:
+                    result = await self.mcp_client.call_tool(playwright_server, TOOL_PREFIX + tool_name, args)
+                    break
+                except _TRANSPORT_ERRORS as e:
+                    if attempt == retries:
+                        raise
+                    delay = TRANSPORT_RETRY_DELAY * (2 ** attempt)
+                    logger.warning("Connection lost calling Playwright tool %s (%s), retrying in %.1fs",
+                                   tool_name, e, delay)
+                    await asyncio.sleep(delay)
         except Exception as e:
-            logger.error(f"Error calling Playwright tool {tool_name}: {str(e)}")
+            # The server may have gone away, so find it again next time
+            self._playwright_server = None
+            logger.error("Error calling Playwright tool %s: %s", tool_name, e)
             raise RuntimeError(f"Failed to call Playwright tool {tool_name}: {str(e)}")
+        finally:
+            # Even a failed action may have changed the page
+            if tool_name not in _READ_ONLY_TOOLS:
+                self._nav_epoch += 1
+        
+        # Some clients hand back the JSON document undecoded; snapshots can run to
+        # megabytes, so parse them with orjson when it is installed
+        if not raw and isinstance(result, (bytes, bytearray, str)):
+            try:
+                result = _json_loads(result)
+            except ValueError:
+                pass
+        return result
+    
+    async def _run(self, tool_name: str, args: Dict[str, Any],
+                   batch: Optional[List[Dict[str, Any]]] = None,
+                   expectation: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a tool now, or queue it as a step of a batch.
+        
+        Args:
+            tool_name: Name of the tool to call.
+            args: Arguments for the tool.
+            batch: Batch to append the step to instead of calling the tool.
+            expectation: What the server should include in its response; a
+                queued step uses the expectation of its batch instead.
+            
+        Returns:
+            Result of the tool call, or None if the step was queued.
+        """
+        if batch is not None:
+            batch.append({"tool": tool_name, "args": args})
+            return None
+        return await self._call_tool(tool_name, args, expectation)
     
-    async def navigate(self, url: str) -> Dict[str, Any]:
+    async def batch(self, steps: List[Dict[str, Any]], stop_on_error: bool = False,
+                    expectation: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """
+        Run several actions in a single round-trip to the Playwright MCP server.
+        
+        Only the state after the last step is reported back, instead of a
+        snapshot per action.
+        
+        Args:
+            steps: Ordered {"tool": ..., "args": ...} dicts, e.g.
+                {"tool": "click", "args": {"ref": "e12", "element": "Submit"}}.
+            stop_on_error: Whether the server should skip the remaining steps
+                after a failure.
+            expectation: What the server should include in its response.
+            
+        Returns:
+            Per-step results.
+            
+        Raises:
+            BatchStepError: If a step failed; identifies the first failed step.
+        """
+        if not steps:
+            return []
+        
+        logger.info("Running %d batched Playwright steps", len(steps))
+        args: Dict[str, Any] = {
+            "steps": [{"name": f"browser_{step['tool']}", "params": step.get("args", {})} for step in steps],
+            "stopOnError": stop_on_error,
+        }
+        result = await self._call_tool("batch_execute", args, expectation)
+        
+        results = result.get("results") if isinstance(result, dict) else None
+        if not isinstance(results, list):
+            return [result]
+        
+        for index, step_result in enumerate(results):
+            if not isinstance(step_result, dict):
+                continue
+            error = step_result.get("error")
+            if error or step_result.get("success") is False:
+                tool = steps[index]["tool"] if index < len(steps) else "unknown"
+                raise BatchStepError(index, tool, str(error or "step failed"), results)
+        return results
+    
+    @asynccontextmanager
+    async def batched(self, stop_on_error: bool = False,
+                      expectation: Optional[Dict[str, Any]] = None) -> AsyncIterator[PlaywrightBatch]:
+        """
+        Collect actions and send them as one batch when the block exits.
+        
+        Pass the yielded batch as _batch to click, type_text, select_option,
+        press_key or wait to queue the action instead of running it:
+        
+            async with pw.batched() as b:
+                await pw.type_text("e3", "Email", "me@example.com", _batch=b)
+                await pw.click("e7", "Sign in", _batch=b)
+        
+        Nothing is sent if the block raises.
+        
+        Args:
+            stop_on_error: Whether the server should skip the remaining steps
+                after a failure.
+            expectation: What the server should include in its response.
+            
+        Yields:
+            The batch being collected; its results are set once it is sent.
+        """
+        steps = PlaywrightBatch()
+        yield steps
+        steps.results = await self.batch(steps, stop_on_error, expectation)
+    
+    async def navigate(self, url: str, expectation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Navigate to a URL.
         
         Args:
             url: URL to navigate to.
+            expectation: What the server should include in its response.
             
         Returns:
             Result of the navigation.
         """
-        logger.info(f"Navigating to {url}")
-        return await self._call_tool("navigate", {"url": url})
+        logger.info("Navigating to %s", url)
+        return await self._call_tool("navigate", {"url": url}, expectation)
+    
+    @staticmethod
+    def _snapshot_args(max_chars: Optional[int], start_ref: Optional[str],
+                       end_ref: Optional[str]) -> Dict[str, Any]:
+        """Build the snapshot tool's arguments, leaving out unset limits."""
+        if max_chars is None and start_ref is None and end_ref is None:
+            return _SNAPSHOT_ARGS
+        args = dict(_SNAPSHOT_ARGS)
+        if max_chars is not None:
+            args["maxChars"] = max_chars
+        if start_ref is not None:
+            args["startRef"] = start_ref
+        if end_ref is not None:
+            args["endRef"] = end_ref
+        return args
+    
+    async def snapshot_bytes(self, max_chars: Optional[int] = DEFAULT_SNAPSHOT_MAX_CHARS,
+                             start_ref: Optional[str] = None, end_ref: Optional[str] = None) -> bytes:
+        """
+        Take an accessibility snapshot as serialized JSON, for passing on unparsed.
+        
+        A document the client returns undecoded is handed back without being
+        parsed and re-encoded. The snapshot cache and _last_snapshot are left alone.
+        
+        Args:
+            max_chars: Size limit passed to the server, or None for no limit.
+            start_ref: Element reference the snapshot should start at.
+            end_ref: Element reference the snapshot should end at.
+            
+        Returns:
+            The snapshot as UTF-8 JSON.
+        """
+        result = await self._call_tool("snapshot", self._snapshot_args(max_chars, start_ref, end_ref), raw=True)
+        if isinstance(result, str):
+            return result.encode("utf-8")
+        if isinstance(result, (bytes, bytearray)):
+            return bytes(result)
+        return _json_dumps(result)
+    
+    async def find_element_streaming(self, role: Optional[str] = None, ref: Optional[str] = None,
+                                     name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find an element on the current page, parsing a fresh snapshot only up to the match.
+        
+        An opt-in path for large pages: when the client hands back the snapshot
+        undecoded and ijson is installed, parsing stops at the first matching
+        node instead of building the whole tree. A current cached snapshot is
+        searched directly, and without ijson the snapshot is parsed in full.
+        
+        Args:
+            role: ARIA role to search for.
+            ref: Element reference to search for.
+            name: Optional accessible name, matched as a case-insensitive
+                substring; only used with role.
+            
+        Returns:
+            Element data or None if not found.
+            
+        Raises:
+            ValueError: If neither role nor ref is given.
+        """
+        if role is None and ref is None:
+            raise ValueError("find_element_streaming() needs a role or a ref")
+        
+        def _find(snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if ref is not None:
+                node = self.find_element_by_ref(snapshot, ref)
+                return node if node is not None and (role is None or node.get("role") == role) else None
+            return self.find_element_by_role(snapshot, role, name)
+        
+        cached = self._snapshot_cache
+        if cached is not None and cached[0] == self._nav_epoch:
+            return _find(cached[2])
+        
+        result = await self._call_tool("snapshot", self._snapshot_args(None, None, None), raw=True)
+        if ijson is None or not isinstance(result, (bytes, bytearray, str)):
+            if isinstance(result, (bytes, bytearray, str)):
+                result = _json_loads(result)
+            return _find(result)
+        
+        needle = name.casefold() if name is not None else None
+        
+        def match(node: Dict[str, Any]) -> bool:
+            if node.get("role") == TRIMMED_ROLE:
+                return False
+            if ref is not None and node.get("ref") != ref:
+                return False
+            if role is not None and node.get("role") != role:
+                return False
+            if ref is None and needle is not None:
+                return needle in (node.get("name") or "").casefold()
+            return "role" in node or "ref" in node
+        
+        key_fields = tuple(field_name for field_name, wanted in
+                           (("ref", ref), ("role", role), ("name", needle if ref is None else None))
+                           if wanted is not None)
+        return _stream_find(result, match, key_fields)
     
-    async def snapshot(self) -> Dict[str, Any]:
+    async def snapshot(self, force: bool = False, max_chars: Optional[int] = DEFAULT_SNAPSHOT_MAX_CHARS,
+                       start_ref: Optional[str] = None, end_ref: Optional[str] = None) -> Dict[str, Any]:
         """
         Take an accessibility snapshot of the current page.
         
+        The previous snapshot is returned without a server call if it was taken
+        with the same limits and nothing that may change the page (navigation or
+        an action) has run since. This is the only call that updates
+        _last_snapshot; snapshots included in action results (see
+        DEFAULT_EXPECTATIONS) are not stored.
+        
+        Args:
+            force: Whether to take a fresh snapshot even if the cached one is current.
+            max_chars: Size limit passed to the server, or None for no limit.
+            start_ref: Element reference the snapshot should start at.
+            end_ref: Element reference the snapshot should end at.
+            
         Returns:
             Snapshot data.
         """
-        result = await self._call_tool("snapshot", {"random_string": "snapshot"})
+        limits = (max_chars, start_ref, end_ref)
+        cached = self._snapshot_cache
+        if not force and cached is not None and cached[0] == self._nav_epoch and cached[1] == limits:
+            return cached[2]
+        
+        epoch = self._nav_epoch
+        result = await self._call_tool("snapshot", self._snapshot_args(max_chars, start_ref, end_ref))
         self._last_snapshot = result
+        self._last_snapshot_id = result.get("snapshotId") if isinstance(result, dict) else None
+        # Only cache it if no action ran while the snapshot was being taken
+        if epoch == self._nav_epoch:
+            self._snapshot_cache = (epoch, limits, result)
         return result
     
-    async def click(self, element_ref: str, element_description: str) -> Dict[str, Any]:
+    async def snapshot_diff(self) -> Dict[str, Any]:
+        """
+        Bring the last snapshot up to date by fetching only what changed since.
+        
+        Sends the last snapshot's server-side id to the snapshot_diff tool and
+        applies the returned patch with apply_diff(). The result replaces
+        _last_snapshot like a snapshot() would. Without a snapshot id to diff
+        against, or if the server answers with a full snapshot, this amounts to
+        a fresh snapshot(). So does a reply that is not a JSON object.
+        
+        Returns:
+            Snapshot data.
+        """
+        cached = self._snapshot_cache
+        if cached is not None and cached[0] == self._nav_epoch and cached[2] is self._last_snapshot:
+            return cached[2]
+        
+        base, base_id = self._last_snapshot, self._last_snapshot_id
+        if base is None or base_id is None:
+            return await self.snapshot(force=True)
+        
+        epoch = self._nav_epoch
+        result = await self._call_tool("snapshot_diff", {"baseSnapshotId": base_id})
+        if not isinstance(result, dict):
+            # Not a patch we can apply (e.g. an undecodable reply); start over
+            return await self.snapshot(force=True)
+        if "tree" in result:
+            # The server no longer has the base snapshot and sent a full one
+            snapshot = result
+        else:
+            try:
+                snapshot = apply_diff(base, result.get("patch", ()))
+            except (KeyError, ValueError) as e:
+                # The patch doesn't fit our base (e.g. a ref we don't have); start over
+                logger.warning("Could not apply snapshot diff (%s), taking a full snapshot", e)
+                return await self.snapshot(force=True)
+            snapshot["snapshotId"] = result.get("snapshotId")
+        
+        self._last_snapshot = snapshot
+        self._last_snapshot_id = snapshot.get("snapshotId")
+        # The patched tree has the limits the base was taken with
+        if epoch == self._nav_epoch and cached is not None and cached[2] is base:
+            self._snapshot_cache = (epoch, cached[1], snapshot)
+        return snapshot
+    
+    async def click(self, element_ref: str, element_description: str,
+                    expectation: Optional[Dict[str, Any]] = None,
+                    _batch: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Click on an element.
         
         Args:
             element_ref: Element reference from snapshot.
             element_description: Human-readable description of the element.
+            expectation: What the server should include in its response.
+            _batch: Batch from batched() to queue the click on instead.
             
         Returns:
-            Result of the click operation.
+            Result of the click operation, or None if queued.
         """
-        logger.info(f"Clicking on element: {element_description}")
-        return await self._call_tool("click", {
+        logger.info("Clicking on element: %s", element_description)
+        return await self._run("click", {
             "ref": element_ref,
             "element": element_description
-        })
+        }, _batch, expectation)
     
-    async def type_text(self, element_ref: str, element_description: str, text: str, submit: bool = False) -> Dict[str, Any]:
+    async def type_text(self, element_ref: str, element_description: str, text: str, submit: bool = False,
+                        expectation: Optional[Dict[str, Any]] = None,
+                        _batch: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Type text into an element.
         
@@ -117,19 +912,23 @@ class PlaywrightMCP:
             element_description: Human-readable description of the element.
             text: Text to type.
             submit: Whether to press Enter after typing.
+            expectation: What the server should include in its response.
+            _batch: Batch from batched() to queue the typing on instead.
             
         Returns:
-            Result of the type operation.
+            Result of the type operation, or None if queued.
         """
-        logger.info(f"Typing '{text}' into element: {element_description}")
-        return await self._call_tool("type", {
+        logger.info("Typing '%s' into element: %s", text, element_description)
+        return await self._run("type", {
             "ref": element_ref,
             "element": element_description,
             "text": text,
             "submit": submit
-        })
+        }, _batch, expectation)
     
-    async def select_option(self, element_ref: str, element_description: str, values: List[str]) -> Dict[str, Any]:
+    async def select_option(self, element_ref: str, element_description: str, values: List[str],
+                            expectation: Optional[Dict[str, Any]] = None,
+                            _batch: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Select options in a dropdown.
         
@@ -137,42 +936,50 @@ class PlaywrightMCP:
             element_ref: Element reference from snapshot.
             element_description: Human-readable description of the element.
             values: Values to select.
+            expectation: What the server should include in its response.
+            _batch: Batch from batched() to queue the selection on instead.
             
         Returns:
-            Result of the select operation.
+            Result of the select operation, or None if queued.
         """
-        logger.info(f"Selecting options {values} in element: {element_description}")
-        return await self._call_tool("select_option", {
+        logger.info("Selecting options %s in element: %s", values, element_description)
+        return await self._run("select_option", {
             "ref": element_ref,
             "element": element_description,
             "values": values
-        })
+        }, _batch, expectation)
     
-    async def press_key(self, key: str) -> Dict[str, Any]:
+    async def press_key(self, key: str, expectation: Optional[Dict[str, Any]] = None,
+                        _batch: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Press a key.
         
         Args:
             key: Key to press.
+            expectation: What the server should include in its response.
+            _batch: Batch from batched() to queue the key press on instead.
             
         Returns:
-            Result of the key press.
+            Result of the key press, or None if queued.
         """
-        logger.info(f"Pressing key: {key}")
-        return await self._call_tool("press_key", {"key": key})
+        logger.info("Pressing key: %s", key)
+        return await self._run("press_key", {"key": key}, _batch, expectation)
     
-    async def wait(self, seconds: float) -> Dict[str, Any]:
+    async def wait(self, seconds: float, expectation: Optional[Dict[str, Any]] = None,
+                   _batch: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Wait for a specified time.
         
         Args:
             seconds: Time to wait in seconds.
+            expectation: What the server should include in its response.
+            _batch: Batch from batched() to queue the wait on instead.
             
         Returns:
-            Result of the wait operation.
+            Result of the wait operation, or None if queued.
         """
-        logger.info(f"Waiting for {seconds} seconds")
-        return await self._call_tool("wait", {"time": seconds})
+        logger.info("Waiting for %s seconds", seconds)
+        return await self._run("wait", {"time": seconds}, _batch, expectation)
     
     async def take_screenshot(self, raw: bool = False) -> Dict[str, Any]:
         """
@@ -187,35 +994,91 @@ class PlaywrightMCP:
         logger.info("Taking screenshot")
         return await self._call_tool("take_screenshot", {"raw": raw})
     
-    async def go_back(self) -> Dict[str, Any]:
+    async def go_back(self, expectation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Go back to the previous page.
         
+        Args:
+            expectation: What the server should include in its response.
+            
         Returns:
             Result of the operation.
         """
         logger.info("Going back to previous page")
-        return await self._call_tool("go_back", {"random_string": "back"})
+        return await self._call_tool("go_back", _BACK_ARGS, expectation)
     
-    async def go_forward(self) -> Dict[str, Any]:
+    async def go_forward(self, expectation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Go forward to the next page.
         
+        Args:
+            expectation: What the server should include in its response.
+            
         Returns:
             Result of the operation.
         """
         logger.info("Going forward to next page")
-        return await self._call_tool("go_forward", {"random_string": "forward"})
+        return await self._call_tool("go_forward", _FORWARD_ARGS, expectation)
     
-    async def close(self) -> Dict[str, Any]:
+    async def new_context(self) -> str:
+        """
+        Open a new browser context in the shared browser.
+        
+        Contexts are isolated from each other (cookies, storage, pages) and much
+        cheaper to create than a browser.
+        
+        Returns:
+            Identifier of the new context.
         """
-        Close the browser.
+        logger.info("Opening browser context")
+        result = await self._call_tool("new_context", _NO_ARGS)
+        if isinstance(result, dict):
+            result = result.get("contextId", result.get("id"))
+        if not result:
+            raise RuntimeError("Playwright MCP server returned no context id")
+        return str(result)
+    
+    async def close_context(self, context_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Close a browser context, leaving the browser running.
+        
+        Args:
+            context_id: Context to close; this instance's context if None.
+            
+        Returns:
+            Result of the operation.
+        """
+        context_id = context_id or self.context_id
+        if context_id is None:
+            raise ValueError("No browser context to close")
+        
+        logger.info("Closing browser context %s", context_id)
+        return await self._call_tool("close_context", {"contextId": context_id})
+    
+    async def close_browser(self) -> Dict[str, Any]:
+        """
+        Close the browser, including every context in it.
         
         Returns:
             Result of the operation.
         """
         logger.info("Closing browser")
-        return await self._call_tool("close", {"random_string": "close"})
+        return await self._call_tool("close", _CLOSE_ARGS)
+    
+    async def close(self) -> Dict[str, Any]:
+        """
+        Close this instance's browser context, or the browser if it has none.
+        
+        Deprecated: call close_context() or close_browser() instead.
+        
+        Returns:
+            Result of the operation.
+        """
+        warnings.warn("PlaywrightMCP.close() is deprecated; use close_context() or close_browser()",
+                      DeprecationWarning, stacklevel=2)
+        if self.context_id is not None:
+            return await self.close_context()
+        return await self.close_browser()
     
     async def save_as_pdf(self) -> Dict[str, Any]:
         """
@@ -225,183 +1088,413 @@ class PlaywrightMCP:
             PDF data.
         """
         logger.info("Saving page as PDF")
-        return await self._call_tool("save_as_pdf", {"random_string": "pdf"})
+        return await self._call_tool("save_as_pdf", _PDF_ARGS)
     
-    def find_element(self, snapshot: Dict[str, Any], predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+    async def map_urls(self, urls: Iterable[str],
+                       fn: Callable[["PlaywrightMCP", str], Awaitable[Any]],
+                       concurrency: int = 8) -> List[Any]:
+        """
+        Visit URLs in parallel, each in its own browser context.
+        
+        Uses a temporary PlaywrightContextPool whose contexts are closed
+        afterwards; keep a pool around instead when doing this repeatedly.
+        
+        Args:
+            urls: URLs to visit.
+            fn: Called as fn(pw, url) with a PlaywrightMCP bound to the URL's
+                context, once it has navigated to url; its result is collected.
+            concurrency: Maximum number of URLs in flight.
+            
+        Returns:
+            fn's results in the order of urls; a URL that failed has its
+            exception in place of a result.
+        """
+        pool = PlaywrightContextPool(self.mcp_client, max_contexts=concurrency)
+        try:
+            return await pool.map_urls(urls, fn)
+        finally:
+            await pool.close()
+    
+    def _tree(self, snapshot: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Get the root node of a snapshot, or of the last snapshot() result if None."""
+        if snapshot is None:
+            snapshot = self._last_snapshot or {}
+        return snapshot.get("tree", {})
+    
+    def _index(self, snapshot: Optional[Dict[str, Any]]) -> SnapshotIndex:
+        """
+        Get the lookup index of a snapshot, building it on first use.
+        
+        Only the most recently indexed snapshot is kept, so a new snapshot
+        replaces the index; snapshots must not be modified once queried.
+        
+        Args:
+            snapshot: Snapshot data; the last snapshot() result if None.
+            
+        Returns:
+            The snapshot's index.
+        """
+        if snapshot is None:
+            snapshot = self._last_snapshot or {}
+        cached = self._index_cache
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+        
+        index = SnapshotIndex()
+        nodes, roles, names, texts, refs = index.nodes, index.roles, index.names, index.texts, index.refs
+        by_role, by_ref, by_text = index.by_role, index.by_ref, index.by_text
+        intern = sys.intern
+        
+        for node in _iter_nodes(self._tree(snapshot)):
+            row = len(nodes)
+            nodes.append(node)
+            # Roles come from a small vocabulary; interning shares one string per role
+            role = node.get("role") or ""
+            if role:
+                role = intern(role)
+                by_role.setdefault(role, []).append(row)
+            roles.append(role)
+            names.append(node.get("name") or "")
+            text = node.get("text") or ""
+            texts.append(text)
+            if text:
+                by_text.setdefault(text.casefold(), []).append(row)
+            ref = node.get("ref")
+            refs.append(ref)
+            if ref is not None and ref not in by_ref:
+                by_ref[ref] = row
+        
+        self._index_cache = (snapshot, index)
+        return index
+    
+    def find_element(self, snapshot: Optional[Dict[str, Any]], predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
         """
         Find an element in a snapshot using a predicate function.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
             predicate: Function that returns True for the desired element.
             
         Returns:
             Element data or None if not found.
         """
-        def _search_node(node):
-            if predicate(node):
-                return node
-            
-            for child in node.get("children", []):
-                result = _search_node(child)
-                if result:
-                    return result
-            
-            return None
+        if snapshot is None:
+            snapshot = self._last_snapshot or {}
         
-        root = snapshot.get("tree", {})
-        return _search_node(root)
+        # Scan the flattened rows if this snapshot is already indexed; otherwise
+        # walk lazily, so the first match ends the traversal
+        cached = self._index_cache
+        if cached is not None and cached[0] is snapshot:
+            nodes: Iterable[Dict[str, Any]] = cached[1].nodes
+        else:
+            nodes = _iter_nodes(snapshot.get("tree", {}))
+        return next((node for node in nodes if predicate(node)), None)
     
-    def find_elements(self, snapshot: Dict[str, Any], predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+    def find_elements(self, snapshot: Optional[Dict[str, Any]], predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
         """
         Find all elements in a snapshot that match a predicate function.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
             predicate: Function that returns True for matching elements.
             
         Returns:
             List of matching element data.
         """
-        results = []
-        
-        def _search_node(node):
-            if predicate(node):
-                results.append(node)
-            
-            for child in node.get("children", []):
-                _search_node(child)
-        
-        root = snapshot.get("tree", {})
-        _search_node(root)
-        return results
+        # Every node is visited anyway, so scan the flattened rows in order
+        return [node for node in self._index(snapshot).nodes if predicate(node)]
     
-    def find_element_by_text(self, snapshot: Dict[str, Any], text: str, exact: bool = False) -> Optional[Dict[str, Any]]:
+    def find_element_by_text(self, snapshot: Optional[Dict[str, Any]], text: str, exact: bool = False) -> Optional[Dict[str, Any]]:
         """
         Find an element in a snapshot by its text content.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
             text: Text to search for.
-            exact: Whether to match the exact text or a substring.
+            exact: Whether to match the exact text, or a case-insensitive substring.
             
         Returns:
             Element data or None if not found.
         """
-        def predicate(node):
-            node_text = node.get("text", "")
-            if exact:
-                return node_text == text
-            else:
-                return text.lower() in node_text.lower()
+        if not text:
+            # Empty text matches nodes without any text, which are not indexed
+            return self.find_element(snapshot, lambda node: not exact or node.get("text", "") == text)
+        
+        # Case-fold the query once; indexed texts are already folded
+        needle = text.casefold()
+        index = self._index(snapshot)
+        if exact:
+            texts = index.texts
+            for row in index.by_text.get(needle, ()):
+                if texts[row] == text:
+                    return index.nodes[row]
+            return None
         
-        return self.find_element(snapshot, predicate)
+        # Keys are in order of first appearance, so the first key that matches
+        # starts with the earliest matching node
+        for folded, rows in index.by_text.items():
+            if needle in folded:
+                return index.nodes[rows[0]]
+        return None
     
-    def find_element_by_role(self, snapshot: Dict[str, Any], role: str, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def find_element_by_role(self, snapshot: Optional[Dict[str, Any]], role: str, name: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Find an element in a snapshot by its role.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
             role: ARIA role to search for.
-            name: Optional name (accessible name) of the element.
+            name: Optional name (accessible name) of the element; matched as a
+                case-insensitive substring.
             
         Returns:
             Element data or None if not found.
         """
-        def predicate(node):
-            if node.get("role") != role:
-                return False
-            
-            if name is not None:
-                node_name = node.get("name", "")
-                return name.lower() in node_name.lower()
-            
-            return True
+        index = self._index(snapshot)
+        rows = index.by_role.get(role, ())
+        if name is None:
+            return index.nodes[rows[0]] if rows else None
         
-        return self.find_element(snapshot, predicate)
+        # Only nodes with the right role get their name case-folded
+        row = _find_by_role(rows, index.names, name.casefold())
+        return index.nodes[row] if row >= 0 else None
     
-    def extract_text_content(self, snapshot: Dict[str, Any]) -> str:
+    def find_element_by_ref(self, snapshot: Optional[Dict[str, Any]], ref: str) -> Optional[Dict[str, Any]]:
         """
-        Extract all text content from a snapshot.
+        Find an element in a snapshot by its reference.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
+            ref: Element reference, as passed to click() and the other actions.
             
         Returns:
-            Concatenated text content.
+            Element data or None if not found.
         """
-        text_content = []
-        
-        def _extract_text(node):
-            if "text" in node and node["text"].strip():
-                text_content.append(node["text"].strip())
-            
-            for child in node.get("children", []):
-                _extract_text(child)
-        
-        root = snapshot.get("tree", {})
-        _extract_text(root)
-        return "\n".join(text_content)
+        index = self._index(snapshot)
+        row = index.by_ref.get(ref)
+        return index.nodes[row] if row is not None else None
     
-    def extract_links(self, snapshot: Dict[str, Any]) -> List[Dict[str, str]]:
+    def _extract(self, snapshot: Optional[Dict[str, Any]], want_text: bool, want_links: bool,
+                 want_forms: bool) -> Tuple[List[str], List[Dict[str, str]], List[Dict[str, Any]]]:
         """
-        Extract all links from a snapshot.
+        Collect text, links and form elements from a snapshot's index.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
+            want_text: Whether to collect text content.
+            want_links: Whether to collect links.
+            want_forms: Whether to collect form elements.
             
         Returns:
-            List of dictionaries with link info.
+            Tuple of (text lines, links, form elements); unwanted lists stay empty.
         """
+        index = self._index(snapshot)
+        nodes = index.nodes
+        
+        # Strip each text once; rows without text hold ""
+        text_content = [text for text in (text.strip() for text in index.texts if text) if text] if want_text else []
+        
         links = []
+        if want_links:
+            for row in index.by_role.get("link", ()):
+                node = nodes[row]
+                if "url" in node:
+                    links.append({
+                        "text": node.get("text", ""),
+                        "url": node["url"],
+                        "ref": node.get("ref", "")
+                    })
         
-        def _find_links(node):
-            if node.get("role") == "link" and "url" in node:
-                links.append({
+        form_elements = []
+        if want_forms:
+            # Merge the form roles' buckets back into document order
+            by_role = index.by_role
+            for row in sorted(row for role in FORM_ROLES for row in by_role.get(role, ())):
+                node = nodes[row]
+                form_elements.append({
+                    "role": index.roles[row],
+                    "name": node.get("name", ""),
                     "text": node.get("text", ""),
-                    "url": node["url"],
-                    "ref": node.get("ref", "")
+                    "ref": node.get("ref", ""),
+                    "checked": node.get("checked", None),
+                    "value": node.get("value", None)
                 })
+        
+        return text_content, links, form_elements
+    
+    def extract_all(self, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Extract text content, links and form elements from a snapshot in a single pass.
+        
+        Equivalent to calling extract_text_content, extract_links and
+        extract_form_elements, which all read the same cached index.
+        
+        Args:
+            snapshot: Snapshot data; the last snapshot() result if None.
             
-            for child in node.get("children", []):
-                _find_links(child)
+        Returns:
+            Dictionary with "text" (as from extract_text_content), "links" (as
+            from extract_links) and "forms" (as from extract_form_elements).
+        """
+        text_content, links, form_elements = self._extract(snapshot, True, True, True)
+        return {"text": "\n".join(text_content), "links": links, "forms": form_elements}
+    
+    def extract_text_content(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Extract all text content from a snapshot.
+        
+        Args:
+            snapshot: Snapshot data; the last snapshot() result if None.
+            
+        Returns:
+            Concatenated text content.
+        """
+        return "\n".join(self._extract(snapshot, True, False, False)[0])
+    
+    def extract_links(self, snapshot: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """
+        Extract all links from a snapshot.
         
-        root = snapshot.get("tree", {})
-        _find_links(root)
-        return links
+        Args:
+            snapshot: Snapshot data; the last snapshot() result if None.
+            
+        Returns:
+            List of dictionaries with link info.
+        """
+        return self._extract(snapshot, False, True, False)[1]
     
-    def extract_form_elements(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def extract_form_elements(self, snapshot: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Extract all form elements from a snapshot.
         
         Args:
-            snapshot: Snapshot data.
+            snapshot: Snapshot data; the last snapshot() result if None.
             
         Returns:
             List of dictionaries with form element info.
         """
-        form_elements = []
-        form_roles = {"textbox", "button", "checkbox", "radio", "combobox", "listbox", "switch"}
+        return self._extract(snapshot, False, False, True)[2]
+
+class PlaywrightContextPool:
+    """
+    Pool of browser contexts in one shared Playwright browser.
+    
+    Starting a browser takes around a second while a context takes a few
+    milliseconds, so workloads over many pages should share the browser and
+    give each task its own context instead of opening and closing browsers.
+    Released contexts are reused as they are, cookies and storage included.
+    """
+    
+    def __init__(self, mcp_client, max_contexts: int = 8):
+        """
+        Initialize the pool.
         
-        def _find_form_elements(node):
-            role = node.get("role", "")
-            if role in form_roles:
-                form_elements.append({
-                    "role": role,
-                    "name": node.get("name", ""),
-                    "text": node.get("text", ""),
-                    "ref": node.get("ref", ""),
-                    "checked": node.get("checked", None),
-                    "value": node.get("value", None)
-                })
+        Args:
+            mcp_client: An initialized MCP client instance.
+            max_contexts: Maximum number of contexts in use at once.
+        """
+        self.max_contexts = max_contexts
+        self._browser = PlaywrightMCP(mcp_client)
+        self._idle: deque = deque()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def acquire(self) -> str:
+        """
+        Take a context from the pool, opening one if none is idle.
+        
+        Waits while max_contexts contexts are in use.
+        
+        Returns:
+            Identifier of the context.
+        """
+        # Created here so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+        
+        await self._semaphore.acquire()
+        try:
+            if self._idle:
+                return self._idle.popleft()
+            return await self._browser.new_context()
+        except BaseException:
+            self._semaphore.release()
+            raise
+    
+    async def release(self, context_id: str, reuse: bool = True) -> None:
+        """
+        Return a context to the pool.
+        
+        Args:
+            context_id: Context from acquire().
+            reuse: Whether to keep the context for later acquire() calls, or close it.
+        """
+        try:
+            if reuse:
+                self._idle.append(context_id)
+            else:
+                await self._browser.close_context(context_id)
+        finally:
+            self._semaphore.release()
+    
+    @asynccontextmanager
+    async def context(self, reuse: bool = True) -> AsyncIterator[PlaywrightMCP]:
+        """
+        Borrow a context for the duration of a block.
+        
+        Args:
+            reuse: Whether to return the context to the pool afterwards, or close it.
+            
+        Yields:
+            PlaywrightMCP instance whose calls all run in the borrowed context.
+        """
+        context_id = await self.acquire()
+        pw = PlaywrightMCP(self._browser.mcp_client, context_id=context_id)
+        # Share the server lookup instead of repeating it per context
+        pw._playwright_server = self._browser._playwright_server
+        try:
+            yield pw
+        finally:
+            await self.release(context_id, reuse)
+    
+    async def map_urls(self, urls: Iterable[str],
+                       fn: Callable[[PlaywrightMCP, str], Awaitable[Any]],
+                       concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Visit URLs in parallel, each in its own browser context.
+        
+        Args:
+            urls: URLs to visit.
+            fn: Called as fn(pw, url) once pw has navigated to url; its result is
+                collected.
+            concurrency: Maximum number of URLs in flight; max_contexts if None.
             
-            for child in node.get("children", []):
-                _find_form_elements(child)
+        Returns:
+            fn's results in the order of urls; a URL that failed has its
+            exception in place of a result.
+        """
+        limit = asyncio.Semaphore(concurrency or self.max_contexts)
+        
+        async def _one(url: str) -> Any:
+            async with limit, self.context() as pw:
+                await pw.navigate(url)
+                return await fn(pw, url)
         
-        root = snapshot.get("tree", {})
-        _find_form_elements(root)
-        return form_elements
+        return await asyncio.gather(*(_one(url) for url in urls), return_exceptions=True)
+    
+    async def close(self, close_browser: bool = False) -> None:
+        """
+        Close the idle contexts, and optionally the browser.
+        
+        Args:
+            close_browser: Whether to close the shared browser as well.
+        """
+        while self._idle:
+            try:
+                await self._browser.close_context(self._idle.popleft())
+            except RuntimeError as e:
+                logger.warning("Failed to close browser context: %s", e)
+        if close_browser:
+            await self._browser.close_browser()
 
 
 # Example usage (async context required)
@@ -433,5 +1526,5 @@ async def example():
         await pw.click(link["ref"], f"Link to {link['url']}")
     
     # Close the browser
-    await pw.close()
+    await pw.close_browser()
 """
@@ -5,7 +5,12 @@ Setup script for mcp-router.
 
 import os
 import re
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # Cython is optional; playwright_utils has a pure-Python fallback
+    cythonize = None
 
 # Extract version from package __init__.py
 def get_version():
@@ -26,6 +31,18 @@ def get_long_description():
             return f.read()
     return "MCP Router for Dolphin-MCP with OpenRouter integration"
 
+# Compile the snapshot lookup accelerator when Cython is available. The
+# extension is optional, so a missing C compiler does not fail the install.
+def get_ext_modules():
+    if cythonize is None:
+        return []
+    extension = Extension(
+        "mcp_router.utils._snapshot_fast",
+        ["mcp_router/utils/_snapshot_fast.pyx"],
+        optional=True,
+    )
+    return cythonize([extension], compiler_directives={"language_level": 3})
+
 setup(
     name="mcp-router",
     version=get_version(),
@@ -36,16 +53,28 @@ setup(
     author_email="kenzo@example.com",
     url="https://github.com/user/mcp-router",
     packages=find_packages(),
+    ext_modules=get_ext_modules(),
     install_requires=[
         "mcp>=1.6.0",
         "openai>=1.0.0",
         "python-dotenv>=1.0.0",
         "pyyaml>=6.0.0",
-        "toml>=0.10.2",
+        "tomli>=1.1.0; python_version < '3.11'",
+        "tomli-w>=1.0.0",
         "psutil>=5.9.0",
         "flask>=2.0.0",
     ],
     extras_require={
+        "speedups": [
+            "orjson>=3.9.0",
+            "rtoml>=0.9.0",
+            "msgpack>=1.0.0",
+            "xxhash>=3.0.0",
+            "urllib3>=1.26.0",
+            "ijson>=3.1",
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+            "inotify_simple>=1.3.5; sys_platform == 'linux'",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pylint>=2.13.0",